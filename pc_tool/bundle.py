@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
+
+from pc_tool.metadata import Bitfield, FrozenDict, MemorySegment, Register, RegisterGroup
+
+# Built by `mcu-mdt-db build` next to index.json; the ATDF/SVD files stay the source of truth
+BUNDLE_FILE    = "devices.mdtb"
+BUNDLE_MAGIC   = b"MDTBNDL\0"
+BUNDLE_VERSION = 1
+
+_NONE = 0xFFFFFFFF      # string reference to None
+_NO_INT = -1            # int field that is None (every real value is >= 0)
+
+_HEADER  = struct.Struct("<8sII")           # magic, version, section count
+_SECTION = struct.Struct("<QII")            # byte offset, record count, record size
+
+# Fixed-width records.  "I" fields are string references or table indexes,
+# (start, count) pairs are slices of the table the field names.
+_RECORDS: dict[str, struct.Struct] = {
+    #                                 source device arch family digest platform
+    #                                 modules(2) segments(2) interrupts(2) peripherals(2) variants(2)
+    "files":       struct.Struct("<6I10I"),
+    "modules":     struct.Struct("<6I"),     # name caption instances(2) groups(2)
+    "instances":   struct.Struct("<5I"),     # name register_group offset address_space has_group
+    "groups":      struct.Struct("<3Iq2I"),  # name name_in_module caption offset registers(2)
+    "registers":   struct.Struct("<3I3q2I"), # name caption rw offset size mask bitfields(2)
+    "bitfields":   struct.Struct("<2Iq2I"),  # name caption mask values(2)
+    "values":      struct.Struct("<3I"),     # name caption value
+    "segments":    struct.Struct("<3I2q"),   # name type pagesize start size
+    "interrupts":  struct.Struct("<4I"),     # name index caption module_instance
+    "peripherals": struct.Struct("<4I"),     # name caption instances(2)
+    "variants":    struct.Struct("<I3q"),    # part flash ram flash_page
+}
+_SECTIONS = ("string_offsets", "strings", *_RECORDS)
+
+
+class BundleSource(NamedTuple):
+    """One database file to compile: its metadata as the XML loader built it (eagerly)."""
+    source:   str            # path relative to the database root (posix)
+    platform: str
+    digest:   str            # freshness key of the source file(s)
+    meta:     object         # MCUMetadata with a plain ``modules`` dict
+    variants: dict           # SVD memory YAML variants; {} for ATDF
+
+
+class _Writer:
+    """Accumulates records and interned strings; ``write`` lays them out."""
+
+    def __init__(self) -> None:
+        self.strings: dict[str, int] = {}
+        self.tables:  dict[str, list[tuple]] = {name: [] for name in _RECORDS}
+        self._shared: dict[int, tuple[object, tuple[int, int]]] = {}   # id(table) -> (table, slice)
+
+    def s(self, value: object) -> int:
+        if value is None:
+            return _NONE
+        value = str(value)
+        ref = self.strings.get(value)
+        if ref is None:
+            ref = self.strings[value] = len(self.strings)
+        return ref
+
+    def add(self, table: str, rows: list[tuple]) -> tuple[int, int]:
+        start = len(self.tables[table])
+        self.tables[table].extend(rows)
+        return start, len(rows)
+
+    # Metadata -> rows
+    def file(self, src: BundleSource) -> None:
+        meta = src.meta
+        self._shared.clear()
+        modules = self.add("modules", [self._module(name, mod) for name, mod in meta.modules.items()])
+        segments = self.add("segments", [
+            (self.s(name), self.s(seg.mem_type), self.s(seg.pagesize), seg.start, seg.size)
+            for name, seg in meta.memories.items()
+        ])
+        interrupts = self.add("interrupts", [
+            (self.s(name), self.s(i["index"]), self.s(i["caption"]), self.s(i["module_instance"]))
+            for name, i in meta.interrupts.items()
+        ])
+        peripherals = self.add("peripherals", [
+            (self.s(name), self.s(p["caption"]), *self._instances(p["instances"]))
+            for name, p in meta.peripherals.items()
+        ])
+        variants = self.add("variants", [
+            (self.s(part), _int(info.get("flash")), _int(info.get("ram")), _int(info.get("flash_page")))
+            for part, info in ((part, info or {}) for part, info in src.variants.items())
+        ])
+        self.tables["files"].append((
+            self.s(src.source), self.s(meta.device), self.s(meta.architecture), self.s(meta.family),
+            self.s(src.digest), self.s(src.platform),
+            *modules, *segments, *interrupts, *peripherals, *variants,
+        ))
+
+    def _module(self, name: str, module: dict) -> tuple:
+        groups = self.add("groups", [
+            (self.s(g_name), self.s(g.name_in_module), self.s(g.caption), _int(g.offset),
+             *self._registers(g.registers))
+            for g_name, g in module["register_groups"].items()
+        ])
+        return (self.s(name), self.s(module["caption"]), *self._instances(module["instances"]), *groups)
+
+    def _instances(self, instances: list[dict]) -> tuple[int, int]:
+        return self.add("instances", [
+            (self.s(i["name"]), self.s(i.get("register_group")), self.s(i.get("offset")),
+             self.s(i.get("address_space")), int("register_group" in i))
+            for i in instances
+        ])
+
+    def _registers(self, registers: Mapping[str, Register]) -> tuple[int, int]:
+        # derivedFrom peripherals share one table object: store it once
+        shared = self._shared.get(id(registers))
+        if shared is not None:
+            return shared[1]
+        rows = []
+        for name, reg in registers.items():
+            bitfields = self.add("bitfields", [
+                (self.s(b_name), self.s(bf.caption), bf.mask, *self.add("values", [
+                    (self.s(v_name), self.s(v["caption"]), self.s(v["value"]))
+                    for v_name, v in bf.values.items()
+                ]))
+                for b_name, bf in reg.bitfields.items()
+            ])
+            rows.append((self.s(name), self.s(reg.caption), self.s(reg.rw),
+                         reg.offset, _int(reg.size), _int(reg.mask), *bitfields))
+        span = self.add("registers", rows)
+        self._shared[id(registers)] = (registers, span)
+        return span
+
+    # Layout
+    def write(self, path: Path) -> None:
+        blob, offsets = bytearray(), [0]
+        for value in self.strings:          # dicts keep insertion order = reference order
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+
+        sections: list[tuple[bytes, int, int]] = [
+            (struct.pack(f"<{len(offsets)}I", *offsets), len(offsets), 4),
+            (bytes(blob), len(blob), 1),
+        ]
+        for name, rec in _RECORDS.items():
+            rows = self.tables[name]
+            sections.append((b"".join(rec.pack(*row) for row in rows), len(rows), rec.size))
+
+        offset = _HEADER.size + _SECTION.size * len(sections)
+        header = [_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(sections))]
+        for data, count, size in sections:
+            offset = (offset + 7) & ~7      # 8-byte aligned sections
+            header.append(_SECTION.pack(offset, count, size))
+            offset += len(data)
+
+        tmp = path.with_name(f".{path.name}.tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(b"".join(header))
+            for (data, _, _), entry in zip(sections, header[1:], strict=True):
+                fh.write(b"\0" * (_SECTION.unpack(entry)[0] - fh.tell()))
+                fh.write(data)
+        os.replace(tmp, path)
+
+
+def write_bundle(path: str | Path, sources: Iterable[BundleSource]) -> Path:
+    """Compile *sources* into a bundle at *path* (written to a temp file, then renamed)."""
+    writer = _Writer()
+    for src in sorted(sources, key=lambda s: s.source):
+        writer.file(src)
+    path = Path(path)
+    writer.write(path)
+    return path
+
+
+def _int(value: object) -> int:
+    return _NO_INT if value is None else int(value)
+
+
+def _opt(value: int) -> int | None:
+    return None if value == _NO_INT else value
+
+
+class DeviceBundle:
+    """Read-only view of a compiled device bundle, mapped with ``mmap``.
+
+    Only the header and the file table are read on open; each record is
+    unpacked from the mapping when it is asked for, so the OS pages in
+    just the parts of the bundle a session touches.
+
+    Usage::
+
+        bundle = DeviceBundle.open(db_root / BUNDLE_FILE)
+        entry  = bundle.entry("avr/atmega/ATmega328P.atdf") if bundle else None
+        if entry is not None and entry.digest == expected:
+            modules = entry.modules()
+    """
+
+    def __init__(self, path: str | Path, mm: mmap.mmap) -> None:
+        self.path = str(path)
+        self._mm  = mm
+        magic, version, count = _HEADER.unpack_from(mm, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION or count != len(_SECTIONS):
+            raise ValueError(f"'{path}' is not a version {BUNDLE_VERSION} device bundle")
+        self._sections = {
+            name: _SECTION.unpack_from(mm, _HEADER.size + i * _SECTION.size)
+            for i, name in enumerate(_SECTIONS)
+        }
+        self._strings: dict[int, str] = {}
+        self._files = {self.string(row[0]): row for row in self.rows("files", 0, self._sections["files"][1])}
+
+    @classmethod
+    def open(cls, path: str | Path) -> DeviceBundle | None:
+        """Map the bundle at *path*; None if there is none.  A damaged bundle raises ValueError."""
+        try:
+            with open(path, "rb") as fh:
+                mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:     # empty file: mmap raises ValueError
+            raise ValueError(f"Cannot map device bundle '{path}': {exc}") from exc
+        try:
+            return cls(path, mm)
+        except struct.error as exc:
+            raise ValueError(f"Truncated device bundle '{path}': {exc}") from exc
+
+    def entry(self, source: str) -> BundleEntry | None:
+        """The compiled record of database file *source* (relative posix path), or None."""
+        row = self._files.get(source)
+        return BundleEntry(self, row) if row is not None else None
+
+    def sources(self) -> list[str]:
+        return list(self._files)
+
+    # Raw access
+    def string(self, ref: int) -> str | None:
+        if ref == _NONE:
+            return None
+        value = self._strings.get(ref)
+        if value is None:
+            table, _, _ = self._sections["string_offsets"]
+            blob, _, _  = self._sections["strings"]
+            start, end  = struct.unpack_from("<2I", self._mm, table + 4 * ref)
+            value = self._strings[ref] = str(self._mm[blob + start : blob + end], "utf-8")
+        return value
+
+    def rows(self, table: str, start: int, count: int) -> Iterator[tuple]:
+        offset, total, _ = self._sections[table]
+        if start + count > total:
+            raise ValueError(f"Device bundle '{self.path}': {table}[{start}:{start + count}] out of range")
+        rec = _RECORDS[table]
+        return rec.iter_unpack(self._mm[offset + start * rec.size : offset + (start + count) * rec.size])
+
+
+class BundleEntry:
+    """One compiled database file: device header fields plus decoders for its tables."""
+
+    def __init__(self, bundle: DeviceBundle, row: tuple) -> None:
+        self.bundle = bundle
+        s = bundle.string
+        self.source, self.device, self.architecture, self.family, self.digest, self.platform = (
+            s(ref) for ref in row[:6]
+        )
+        self._slices = dict(zip(("modules", "segments", "interrupts", "peripherals", "variants"),
+                                zip(row[6::2], row[7::2], strict=True), strict=True))
+
+    def _rows(self, table: str) -> Iterator[tuple]:
+        return self.bundle.rows(table, *self._slices[table])
+
+    def memories(self) -> dict[str, MemorySegment]:
+        s = self.bundle.string
+        return {
+            s(name): MemorySegment(s(name), start, size, s(mem_type), s(pagesize))
+            for name, mem_type, pagesize, start, size in self._rows("segments")
+        }
+
+    def interrupts(self) -> dict:
+        s = self.bundle.string
+        return {
+            s(name): {"index": s(index), "caption": s(caption), "module_instance": s(module)}
+            for name, index, caption, module in self._rows("interrupts")
+        }
+
+    def peripherals(self) -> dict:
+        s = self.bundle.string
+        return {
+            s(name): {"caption": s(caption), "instances": _instances(self.bundle, start, count)}
+            for name, caption, start, count in self._rows("peripherals")
+        }
+
+    def variants(self) -> dict:
+        return {
+            self.bundle.string(part): {"flash": _opt(flash), "ram": _opt(ram), "flash_page": _opt(page)}
+            for part, flash, ram, page in self._rows("variants")
+        }
+
+    def modules(self) -> BundleModules:
+        return BundleModules(self.bundle, self.source, *self._slices["modules"])
+
+
+def _instances(bundle: DeviceBundle, start: int, count: int) -> list[dict]:
+    s, out = bundle.string, []
+    for name, group, offset, space, has_group in bundle.rows("instances", start, count):
+        inst = {"name": s(name)}
+        if has_group:
+            inst.update(register_group=s(group), offset=s(offset), address_space=s(space))
+        out.append(inst)
+    return out
+
+
+class BundleModules(Mapping):
+    """``modules`` mapping decoded from a bundle on first access, like ``LazyModules``.
+
+    Register tables are read-only and shared by every module whose groups
+    point at the same slice (SVD ``derivedFrom``).  Pickles as the bundle
+    path and module slice.
+    """
+
+    def __init__(self, bundle: DeviceBundle, source: str, start: int, count: int) -> None:
+        self.bundle  = bundle
+        self.source  = source
+        self._slice  = (start, count)
+        self._rows   = {bundle.string(row[0]): row for row in bundle.rows("modules", start, count)}
+        self._loaded: dict[str, dict] = {}
+        self._tables: dict[tuple[int, int], FrozenDict] = {}
+        self._lock   = threading.Lock()
+
+    def __getitem__(self, name: str) -> dict:
+        module = self._loaded.get(name)
+        if module is not None:
+            return module
+        row = self._rows[name]
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = self._module(row)
+            return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    @property
+    def loaded(self) -> int:
+        return len(self._loaded)
+
+    def materialize(self) -> dict[str, dict]:
+        """Decode every module and return them as a plain dict."""
+        return {name: self[name] for name in self._rows}
+
+    def _module(self, row: tuple) -> dict:
+        s = self.bundle.string
+        _, caption, inst_start, inst_count, group_start, group_count = row
+        return {
+            "caption":   s(caption),
+            "instances": _instances(self.bundle, inst_start, inst_count),
+            "register_groups": {
+                s(name): RegisterGroup(s(in_module), s(g_caption), _opt(offset),
+                                       self._registers(reg_start, reg_count))
+                for name, in_module, g_caption, offset, reg_start, reg_count
+                in self.bundle.rows("groups", group_start, group_count)
+            },
+        }
+
+    def _registers(self, start: int, count: int) -> FrozenDict:
+        table = self._tables.get((start, count))
+        if table is None:
+            s, rows = self.bundle.string, self.bundle.rows
+            table = self._tables[(start, count)] = FrozenDict({
+                s(name): Register(s(caption), offset, _opt(size), _opt(mask), s(rw), FrozenDict({
+                    s(b_name): Bitfield(s(b_caption), b_mask, FrozenDict({
+                        s(v_name): FrozenDict(caption=s(v_caption), value=s(value))
+                        for v_name, v_caption, value in rows("values", v_start, v_count)
+                    }))
+                    for b_name, b_caption, b_mask, v_start, v_count in rows("bitfields", bf_start, bf_count)
+                }))
+                for name, caption, rw, offset, size, mask, bf_start, bf_count in rows("registers", start, count)
+            })
+        return table
+
+    def __getstate__(self) -> dict:
+        return {"path": self.bundle.path, "source": self.source, "slice": self._slice}
+
+    def __setstate__(self, state: dict) -> None:
+        bundle = DeviceBundle.open(state["path"])
+        if bundle is None:
+            raise ValueError(f"Device bundle '{state['path']}' is gone")
+        self.__init__(bundle, state["source"], *state["slice"])
+
+    def __repr__(self) -> str:
+        return f"BundleModules({self.bundle.path!r}, {self.source!r}, {len(self)} modules, {self.loaded} loaded)"
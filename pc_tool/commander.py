@@ -1,13 +1,28 @@
 import os
 import shutil
+from collections import deque
+from collections.abc import Mapping
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Callable, Iterable
 
 from pc_tool.common.dataclasses import Command
-from pc_tool.common.protocol import serialize_command_packet, validate_command_packet, is_nack_packet
+from pc_tool.common.protocol import serialize_command_packet, serialize_transfer, PacketView
 from pc_tool.common.uart_io import MCUSerialLink
-from pc_tool.common.enums import UtilEnum, MDTOffset
+from pc_tool.common.event_buffer import EVENT_BUFFER_CAPACITY
+from pc_tool.common.poll_scheduler import PollScheduler
+from pc_tool.common.enums import UtilEnum, CommandId, MemType, WatchpointControl, DEFAULT_TX_WINDOW
 from pc_tool.common.logger import MDTLogger
 from pc_tool.common.terminal import Terminal
-from pc_tool.parser import parse_packet
+from pc_tool.shadow import ShadowMemory
+from pc_tool.common.elf_image import FirmwareImage, DEFAULT_VERIFY_SAMPLES
+from pc_tool.common.elf_symbols import SymbolTable
+
+# Commands whose ACKs carry data back from the MCU
+_READ_COMMANDS = (CommandId.READ_MEM, CommandId.READ_REG)
+
+# on_ack(chunk_index, ack) -> False aborts the transfer
+AckHandler = Callable[[int, PacketView], bool]
 
 
 class Commander:
@@ -18,103 +33,571 @@ class Commander:
         commander = Commander(serial_link)
         commander.ping(ping_cmd)
         commander.execute(write_cmd)
-    """
+        data = commander.read(read_cmd)
+
+    ``window`` is the number of chunk packets ``execute`` keeps in flight
+    before waiting for an ACK.  The default of 1 is plain stop-and-wait,
+    which every firmware build handles.
+
+    ``shadow`` is an optional ``ShadowMemory``: READ_MEM on a cached memory
+    type is served from it while fresh, and only the missing blocks go
+    over the UART.  Writes, RESET and BREAKPOINT commands keep it coherent.
+
+    ``image`` is an optional ``FirmwareImage``: READ_MEM FLASH inside the
+    firmware range is answered from the ELF once ``image_samples`` sampled
+    words have matched the device (0 trusts the ELF without checking).
 
-    def __init__(self, serial_link: MCUSerialLink) -> None:
-        self._link = serial_link
+    ``symbols`` is the session's ELF ``SymbolTable``: RAM addresses in
+    printed packets and dumps are labelled with the symbol holding them.
+    ``watches`` maps each enabled watchpoint slot to the address it
+    watches, for the event listener to name.
 
-    def _send_with_retry(self, packet: bytes, seq: int) -> bytes | None:
+    ``poll`` is the event handler's ``PollScheduler``; UART-idle event polls
+    are held while a transfer is in flight so they do not take wire time
+    from it.
+    """
+
+    def __init__(self, serial_link: MCUSerialLink, window: int = DEFAULT_TX_WINDOW,
+                 shadow: ShadowMemory | None = None, image: FirmwareImage | None = None,
+                 image_samples: int = DEFAULT_VERIFY_SAMPLES,
+                 symbols: Mapping | None = None, poll: PollScheduler | None = None) -> None:
+        self._link   = serial_link
+        # SEQ wraps at 0xFF, so a window must never hold two chunks with the same SEQ.
+        self._window = max(1, min(int(window), 0xFE))
+        self._shadow = shadow
+        self._image  = image
+        self._image_samples = image_samples
+        self._symbols = symbols if isinstance(symbols, SymbolTable) else None
+        self.watches: dict[int, int] = {}
+        self._poll   = poll
+
+    @property
+    def shadow(self) -> ShadowMemory | None:
+        return self._shadow
+
+    @property
+    def window(self) -> int:
+        """Number of chunk packets kept in flight by ``execute``."""
+        return self._window
+
+    def _send_with_retry(self, packet: bytes, seq: int) -> PacketView | None:
         """Send a packet and retry up to MDT_MAX_RETRIES times.
 
-        Returns the ACK packet on success, or None if all attempts fail.
+        Returns a view of the ACK packet on success, or None if all attempts fail.
         """
         for attempt in range(1, UtilEnum.MDT_MAX_RETRIES + 1):
             self._link.send_packet(packet)
-            ack = self._link.get_response_packet()
+            view = self._response_for(seq)
 
-            if ack is None:
+            if view is None:
                 MDTLogger.warning(
                     f"No response from MCU for seq={seq} "
                     f"(attempt {attempt}/{UtilEnum.MDT_MAX_RETRIES})."
                 )
                 continue
 
-            if is_nack_packet(ack):
+            if view.is_nack:
                 MDTLogger.warning(
-                    f"NACK received for seq={ack[MDTOffset.SEQ]} "
+                    f"NACK received for seq={view.seq} "
                     f"(attempt {attempt}/{UtilEnum.MDT_MAX_RETRIES}), retrying..."
                 )
                 continue
 
-            return ack
+            return view
 
         return None
 
-    @staticmethod
-    def _log_ack(ack: bytes) -> None:
-        """Log the received ACK packet and validate it."""
-        MDTLogger.info(f"Received ACK: {ack.hex()}")
-        parse_packet(ack)
-        if validate_command_packet(ack):
+    def _response_for(self, seq: int) -> PacketView | None:
+        """Next response echoing *seq*, or None on timeout.
+
+        Responses for other SEQs are late ACKs of chunks a timed-out window
+        had in flight (or duplicates of ones already handled); they are
+        skipped rather than taken for this packet's answer.
+        """
+        while (raw := self._link.get_response_packet()) is not None:
+            view = PacketView(raw)
+            if view.seq == seq:
+                return view
+            MDTLogger.warning(f"Ignoring response for unexpected seq={view.seq} (waiting for seq={seq}).")
+        return None
+
+    def _log_ack(self, ack: PacketView) -> None:
+        """Log the received ACK packet, print it, and report its status."""
+        MDTLogger.info(f"Received ACK: {ack.raw.hex()}")
+        if not ack.valid:
+            MDTLogger.error(ack.error, code=3)
+            return
+        label = None
+        if ack.cmd_id in (CommandId.READ_MEM, CommandId.WRITE_MEM) and ack.mem_byte == MemType.RAM:
+            label = self._symbol_at(ack.address)
+        Terminal.packet(ack, label=label)
+        if ack.is_error:
+            MDTLogger.error("Command execution error indicated by status flag.", code=3)
+        else:
             MDTLogger.info("Command packet validation successful.")
 
+    @staticmethod
+    def _chunk_seq(index: int) -> int:
+        """SEQ byte carried by chunk *index*; wraps like the firmware counter."""
+        return index % 0xFF
+
     def ping(self, command: Command) -> None:
         """Send a ping command to the MCU."""
         packet = serialize_command_packet(command, seq=0, multi=False, last=False)
         MDTLogger.info(f"Serialized Ping Command Packet: {packet.hex()}")
 
-        ack = self._send_with_retry(packet, seq=0)
+        with self._in_flight():
+            ack = self._send_with_retry(packet, seq=0)
         if ack is None:
             MDTLogger.error(f"Ping failed after {UtilEnum.MDT_MAX_RETRIES} attempts.", code=4)
             return
 
         self._log_ack(ack)
 
-    def execute(self, command: Command) -> None:
-        """Send a command, splitting into word-sized chunks if needed."""
-        is_write = command.data is not None
-        length   = command.length if command.length is not None else UtilEnum.WORD_SIZE
-        seq      = 0
+    @staticmethod
+    def _build_chunks(command: Command) -> list[memoryview]:
+        """Split *command* into word-sized chunk packets, in SEQ order."""
+        packets = serialize_transfer(command)
+        if packets:
+            MDTLogger.info(
+                f"Serialized {len(packets)} Command Packet(s) for {command.name} "
+                f"at 0x{command.address:08X}: first={packets[0].hex()}"
+            )
+        return packets
 
-        for offset in range(0, length, UtilEnum.WORD_SIZE):
-            chunk_length = min(UtilEnum.WORD_SIZE, length - offset)
+    @staticmethod
+    def _read_length(command: Command) -> int:
+        """Number of bytes a READ_MEM/READ_REG returns (one word if no length given)."""
+        return command.length if command.length is not None else UtilEnum.WORD_SIZE
 
-            if is_write:
-                chunk = command.data[offset : offset + chunk_length]
-                if len(chunk) != UtilEnum.WORD_SIZE:
-                    chunk = chunk.ljust(UtilEnum.WORD_SIZE, b'\x00')
-            else:
-                chunk = None
-
-            chunk_cmd = Command(
-                name    = command.name,
-                id      = command.id,
-                mem     = command.mem,
-                address = command.address + offset,
-                length  = chunk_length,
-                data    = chunk,
-            )
+    @staticmethod
+    def _store_chunk(view: memoryview, index: int, ack: PacketView) -> None:
+        """Copy the DATA bytes of chunk *index* into *view* at their offset."""
+        offset = index * UtilEnum.WORD_SIZE
+        n      = min(UtilEnum.WORD_SIZE, len(view) - offset)
+        view[offset : offset + n] = ack.data[:n]
 
-            packet = serialize_command_packet(
-                chunk_cmd,
-                seq   = seq,
-                multi = length > UtilEnum.WORD_SIZE,
-                last  = offset + UtilEnum.WORD_SIZE >= length,
-            )
+    def execute(self, command: Command) -> bytearray | None:
+        """Send a command, splitting into word-sized chunks if needed.
+
+        Every ACK is logged and pretty-printed.  For READ_MEM/READ_REG the
+        returned data is also assembled in order and returned; other
+        commands (and failed transfers) return None.
+
+        A READ_MEM served by the firmware image or the shadow memory is
+        printed as one summary line instead of per-packet boxes.
+        """
+        local = self._read_local(command)
+        if local is not None:
+            data, source = local
+            if data is not None:
+                label = self._symbol_at(command.address) if command.mem == MemType.RAM else None
+                Terminal.info(
+                    f"{command.name} 0x{command.address:08X}"
+                    + (f" <{label}>" if label else "")
+                    + f" ({len(data)} B, {source}): "
+                    + " ".join(f"{b:02X}" for b in data)
+                )
+            return data
+
+        packets = self._build_chunks(command)
 
-            MDTLogger.info(f"Serialized Command Packet: {packet.hex()}")
+        is_read = command.id in _READ_COMMANDS
+        buf     = bytearray(self._read_length(command)) if is_read else None
+        view    = memoryview(buf) if is_read else None
+        errors  = 0
+
+        def on_ack(index: int, ack: PacketView) -> bool:
+            nonlocal errors
+            self._log_ack(ack)
+            errors += not ack.ok
+            if view is not None:
+                self._store_chunk(view, index, ack)
+            return True
+
+        ok = self._transfer(packets, on_ack)
+        if self._shadow is not None:
+            self._sync_shadow(command, ok and not errors)
+        if command.id in (CommandId.WATCHPOINT, CommandId.RESET) and ok and not errors:
+            self._track_watchpoint(command)
+        return buf if ok and is_read and not errors else None
+
+    def read(self, command: Command) -> bytearray | None:
+        """Run a READ_MEM/READ_REG and return its data, without per-chunk printing.
+
+        The result is written straight into a preallocated ``bytearray``
+        through a memoryview as ACKs arrive; no ``CommandPacket`` is built
+        per chunk.  Each ACK still has its framing, CRC and status flag
+        checked (once, by ``PacketView``).  Returns None if the transfer
+        fails or an ACK is invalid.
+        """
+        if command.id not in _READ_COMMANDS:
+            raise ValueError(f"read() expects READ_MEM or READ_REG, got {command.name}.")
+        local = self._read_local(command)
+        if local is not None:
+            return local[0]
+        return self._read_uart(command)
+
+    def _read_uart(self, command: Command) -> bytearray | None:
+        packets = self._build_chunks(command)
+        buf     = bytearray(self._read_length(command))
+        view    = memoryview(buf)
+
+        def on_ack(index: int, ack: PacketView) -> bool:
+            if not ack.ok:
+                MDTLogger.error(
+                    ack.error or "Command execution error indicated by status flag.", code=3
+                )
+                return False
+            self._store_chunk(view, index, ack)
+            return True
+
+        return buf if self._transfer(packets, on_ack) else None
+
+    def _read_local(self, command: Command) -> tuple[bytearray | None, str] | None:
+        """Answer a READ_MEM from a PC-side copy: ``(data, source)``, or None to go over UART."""
+        if command.id != CommandId.READ_MEM:
+            return None
+        if self._image_serves(command):
+            return bytearray(self._image.read(command.address, self._read_length(command))), "ELF image"
+        if self._shadowed(command):
+            return self._read_shadowed(command), "shadow"
+        return None
 
-            ack = self._send_with_retry(packet, seq=seq)
+    # Firmware image
+    def _image_serves(self, command: Command) -> bool:
+        image = self._image
+        if image is None or image.verified is False or command.mem != MemType.FLASH:
+            return False
+        if not image.covers(command.address, self._read_length(command)):
+            return False
+        if image.verified is None:
+            self._verify_image(command)
+        return bool(image.verified)
+
+    def _verify_image(self, command: Command) -> None:
+        """Compare sampled firmware words against the device; disables the image on mismatch.
+
+        A sample that cannot be read leaves the image unverified, so the
+        next FLASH read tries again.
+        """
+        image = self._image
+        for address in image.samples(self._image_samples):
+            got = self._read_uart(replace(command, address=address, length=UtilEnum.WORD_SIZE))
+            if got is None:
+                return
+            if bytes(got) != image.read(address, UtilEnum.WORD_SIZE):
+                image.verified = False
+                MDTLogger.warning(
+                    f"Flash at 0x{address:08X} does not match the ELF "
+                    f"(device {got.hex()}, ELF {image.read(address, UtilEnum.WORD_SIZE).hex()}): "
+                    f"the board runs a different build. FLASH reads go over UART."
+                )
+                return
+        image.verified = True
+        MDTLogger.info(f"Firmware image verified against the device ({self._image_samples} sample(s)).")
+
+    # Shadow memory
+    def _shadowed(self, command: Command) -> bool:
+        return (
+            self._shadow is not None
+            and command.id == CommandId.READ_MEM
+            and self._shadow.cacheable(command.mem, command.address, self._read_length(command))
+        )
+
+    def _read_shadowed(self, command: Command) -> bytearray | None:
+        """Serve a READ_MEM from the shadow, reading only missing or stale blocks."""
+        shadow  = self._shadow
+        mem     = command.mem
+        address = command.address
+        length  = self._read_length(command)
+
+        data = shadow.lookup(mem, address, length)
+        if data is not None:
+            return data
+
+        for start, n in shadow.missing(mem, address, length):
+            block = self._read_uart(replace(command, address=start, length=n))
+            if block is None:
+                return None
+            shadow.store(mem, start, block)
+
+        data = shadow.lookup(mem, address, length, record=False)
+        if data is None:
+            # Every block was just read, so this only happens with max_age 0
+            return self._read_uart(command)
+        return data
+
+    # Symbols
+    def _symbol_at(self, address: int) -> str | None:
+        return self._symbols.describe(address) if self._symbols is not None else None
+
+    def _track_watchpoint(self, command: Command) -> None:
+        """Record which address each watchpoint slot watches (RESET clears them all)."""
+        if command.id == CommandId.RESET:
+            self.watches.clear()
+        elif command.mem == WatchpointControl.ENABLED and command.data and len(command.data) >= 4:
+            self.watches[command.address] = int.from_bytes(command.data[:4], "little")
+        elif command.mem == WatchpointControl.DISABLED:
+            self.watches.pop(command.address, None)
+
+    def _sync_shadow(self, command: Command, ok: bool) -> None:
+        """Keep the shadow coherent with a command that just ran."""
+        shadow = self._shadow
+        if command.id == CommandId.WRITE_MEM:
+            if command.mem == MemType.ERASE:
+                shadow.invalidate(MemType.FLASH)
+            elif ok:
+                shadow.update(command.mem, command.address, command.data[: command.length])
+            else:
+                shadow.invalidate(command.mem, command.address, command.length)
+        elif command.id in (CommandId.RESET, CommandId.BREAKPOINT):
+            # The core was reset or resumed: nothing read before is trustworthy
+            shadow.invalidate()
+
+    def _in_flight(self):
+        """Context in which event polls are held (no-op without a scheduler)."""
+        return self._poll.transfer() if self._poll is not None else nullcontext()
+
+    def _transfer(self, packets: list[memoryview], on_ack: AckHandler) -> bool:
+        """Send *packets*, calling ``on_ack(index, ack)`` for each ACK received."""
+        with self._in_flight():
+            if self._window > 1 and len(packets) > 1:
+                return self._transfer_windowed(packets, on_ack)
+            return self._transfer_serial(packets, range(len(packets)), on_ack)
+
+    def _transfer_serial(self, packets: list[memoryview], indices: Iterable[int],
+                         on_ack: AckHandler) -> bool:
+        """Stop-and-wait: send each chunk in *indices* and wait for its ACK."""
+        for index in indices:
+            seq = self._chunk_seq(index)
+            ack = self._send_with_retry(packets[index], seq=seq)
             if ack is None:
                 MDTLogger.error(
                     f"Command failed after {UtilEnum.MDT_MAX_RETRIES} attempts "
                     f"(seq={seq}). Aborting.",
                     code=4,
                 )
-                return
+                return False
 
-            self._log_ack(ack)
-            seq = (seq + 1) % 0xFF
+            if not on_ack(index, ack):
+                return False
+
+        return True
+
+    def _transfer_windowed(self, packets: list[memoryview], on_ack: AckHandler) -> bool:
+        """Sliding window: keep up to ``window`` chunks in flight.
+
+        ACKs are matched to chunks by their SEQ byte, so a stale or
+        duplicate ACK is ignored.  A NACK retransmits only the chunk whose
+        SEQ it echoes.  Chunks are only sent up to ``window`` past the
+        oldest one not yet ACKed, so a chunk held up by NACKs can never
+        share its SEQ with a newer one.
+
+        A timeout means the firmware could not buffer the window (its RX
+        ring overflowed and frames were dropped); the Commander then falls
+        back to ``window=1`` for the rest of this and every later transfer,
+        resending only the chunks not yet ACKed.  The drop is permanent:
+        the firmware's ring does not grow between commands, so retrying the
+        window would cost another timeout on every transfer.
+        """
+        in_flight: dict[int, int] = {}   # seq -> chunk index
+        attempts:  dict[int, int] = {}   # chunk index -> sends so far
+        next_idx  = 0
+        oldest    = 0                    # lowest chunk index not yet ACKed
+        acked     = 0
+        done      = [False] * len(packets)
+
+        while acked < len(packets):
+            # window <= 0xFE (see __init__), so SEQs in [oldest, next_idx) are distinct
+            while next_idx < len(packets) and next_idx < oldest + self._window:
+                in_flight[self._chunk_seq(next_idx)] = next_idx
+                attempts[next_idx] = 1
+                self._link.send_packet(packets[next_idx])
+                next_idx += 1
+
+            raw = self._link.get_response_packet()
+
+            if raw is None:
+                MDTLogger.warning(
+                    f"No response from MCU with {len(in_flight)} chunk(s) in flight "
+                    f"(window={self._window}); falling back to window=1."
+                )
+                self._window = 1
+                return self._transfer_serial(
+                    packets, (i for i in range(len(packets)) if not done[i]), on_ack
+                )
+
+            ack   = PacketView(raw)
+            index = in_flight.get(ack.seq)
+            if index is None:
+                MDTLogger.warning(f"Ignoring response for unexpected seq={ack.seq}.")
+                continue
+
+            if ack.is_nack:
+                if attempts[index] >= UtilEnum.MDT_MAX_RETRIES:
+                    MDTLogger.error(
+                        f"Command failed after {UtilEnum.MDT_MAX_RETRIES} attempts "
+                        f"(seq={ack.seq}). Aborting.",
+                        code=4,
+                    )
+                    return False
+                attempts[index] += 1
+                MDTLogger.warning(
+                    f"NACK received for seq={ack.seq} "
+                    f"(attempt {attempts[index]}/{UtilEnum.MDT_MAX_RETRIES}), retransmitting..."
+                )
+                self._link.send_packet(packets[index])
+                continue
+
+            del in_flight[ack.seq]
+            done[index] = True
+            acked      += 1
+            while oldest < len(packets) and done[oldest]:
+                oldest += 1
+
+            if not on_ack(index, ack):
+                return False
+
+        return True
+
+
+class AsyncCommander:
+    """asyncio counterpart of ``Commander`` for an ``AsyncMCUSerialLink``.
+
+    Chunking, SEQ numbering and ACK validation are shared with
+    ``Commander``; only the waiting is different.  Nothing is printed to
+    the terminal: results are returned and problems go to the log, so one
+    event loop can drive many boards side by side.
+
+    Usage::
+
+        commander = AsyncCommander(link, window=4)
+        await commander.ping(ping_cmd)
+        await commander.write(write_cmd)
+        data = await commander.read(read_cmd)
+    """
+
+    def __init__(self, serial_link, window: int = DEFAULT_TX_WINDOW,
+                 timeout: float = 1.0) -> None:
+        import asyncio  # only fleet sessions run an event loop; keep it off the CLI's startup path
+
+        self._link    = serial_link
+        self._window  = max(1, min(int(window), 0xFE))
+        self._timeout = timeout
+        # One transfer at a time per link: ACKs are matched by SEQ only.
+        self._lock    = asyncio.Lock()
+
+    @property
+    def window(self) -> int:
+        """Number of chunk packets kept in flight per transfer."""
+        return self._window
+
+    async def ping(self, command: Command) -> bool:
+        """Send a ping; True once it is ACKed."""
+        packet = serialize_command_packet(command, seq=0, multi=False, last=False)
+        ok = await self._run([memoryview(packet)], lambda index, ack: ack.ok)
+        if not ok:
+            MDTLogger.error(f"Ping to {self._link.port} failed.", code=4)
+        return ok
+
+    async def write(self, command: Command) -> bool:
+        """Run a write-type command; True once every chunk is ACKed without error."""
+        def on_ack(index: int, ack: PacketView) -> bool:
+            if not ack.ok:
+                MDTLogger.error(ack.error or "Command execution error indicated by status flag.", code=3)
+            return ack.ok
+
+        return await self._run(Commander._build_chunks(command), on_ack)
+
+    async def read(self, command: Command) -> bytearray | None:
+        """Run a READ_MEM/READ_REG and return its data, or None on failure."""
+        if command.id not in _READ_COMMANDS:
+            raise ValueError(f"read() expects READ_MEM or READ_REG, got {command.name}.")
+
+        buf  = bytearray(Commander._read_length(command))
+        view = memoryview(buf)
+
+        def on_ack(index: int, ack: PacketView) -> bool:
+            if not ack.ok:
+                MDTLogger.error(ack.error or "Command execution error indicated by status flag.", code=3)
+                return False
+            Commander._store_chunk(view, index, ack)
+            return True
+
+        return buf if await self._run(Commander._build_chunks(command), on_ack) else None
+
+    async def _run(self, packets: list[memoryview], on_ack: AckHandler) -> bool:
+        async with self._lock:
+            return await self._transfer(packets, on_ack)
+
+    async def _transfer(self, packets: list[memoryview], on_ack: AckHandler) -> bool:
+        """Sliding window over *packets*; ``window=1`` is plain stop-and-wait.
+
+        Same policy as ``Commander``: ACKs are matched by SEQ, a NACK resends
+        just that chunk, and a timeout with several chunks in flight drops
+        the window to 1 for good.  Chunks are only sent up to ``window`` past
+        the oldest one not yet ACKed.  Every chunk gets at most
+        ``MDT_MAX_RETRIES`` sends.
+        """
+        pending   = deque(range(len(packets)))
+        in_flight: dict[int, int] = {}   # seq -> chunk index
+        attempts:  dict[int, int] = {}   # chunk index -> sends so far
+
+        async def send(index: int) -> bool:
+            attempts[index] = attempts.get(index, 0) + 1
+            if attempts[index] > UtilEnum.MDT_MAX_RETRIES:
+                MDTLogger.error(
+                    f"Command failed after {UtilEnum.MDT_MAX_RETRIES} attempts "
+                    f"(seq={Commander._chunk_seq(index)}). Aborting.",
+                    code=4,
+                )
+                return False
+            await self._link.send_packet(packets[index])
+            return True
+
+        while pending or in_flight:
+            # pending is ascending, so the oldest unACKed chunk is in_flight's lowest or pending[0]
+            while pending and pending[0] < min(in_flight.values(), default=pending[0]) + self._window:
+                index = pending.popleft()
+                in_flight[Commander._chunk_seq(index)] = index
+                if not await send(index):
+                    return False
+
+            raw = await self._link.get_response_packet(timeout=self._timeout)
+
+            if raw is None:
+                MDTLogger.warning(
+                    f"No response from {self._link.port} with {len(in_flight)} chunk(s) "
+                    f"in flight (window={self._window})."
+                )
+                if self._window > 1:
+                    MDTLogger.warning("Falling back to window=1.")
+                    self._window = 1
+                pending.extendleft(sorted(in_flight.values(), reverse=True))
+                in_flight.clear()
+                continue
+
+            ack   = PacketView(raw)
+            index = in_flight.get(ack.seq)
+            if index is None:
+                MDTLogger.warning(f"Ignoring response for unexpected seq={ack.seq}.")
+                continue
+
+            if ack.is_nack:
+                MDTLogger.warning(
+                    f"NACK received for seq={ack.seq} "
+                    f"(attempt {attempts[index]}/{UtilEnum.MDT_MAX_RETRIES}), retransmitting..."
+                )
+                if not await send(index):
+                    return False
+                continue
+
+            del in_flight[ack.seq]
+            if not on_ack(index, ack):
+                return False
+
+        return True
 
 
 # UI helpers + CLI commands — stateless, no class needed
@@ -173,13 +656,15 @@ def clear_command() -> None:
 
 
 # Lifecycle helpers — used by main.py
-def serial_link_command(port: str, baudrate: int = 19200, ping_command_id: int = 0x05) -> MCUSerialLink:
+def serial_link_command(port: str, baudrate: int = 19200, ping_command_id: int = 0x05,
+                        event_capacity: int = EVENT_BUFFER_CAPACITY) -> MCUSerialLink:
     """Initialize the serial link and perform a startup ping to verify connectivity."""
     startup_ping = serialize_command_packet(
         Command(name="PING", id=ping_command_id, mem=None, address=0, data=None),
         seq=0, multi=False, last=False,
     )
-    return MCUSerialLink(port=port, baudrate=baudrate, startup_ping=startup_ping)
+    return MCUSerialLink(port=port, baudrate=baudrate, startup_ping=startup_ping,
+                         event_capacity=event_capacity)
 
 
 def exit_command(serial_link: MCUSerialLink, threads: list) -> None:
@@ -188,6 +673,9 @@ def exit_command(serial_link: MCUSerialLink, threads: list) -> None:
     serial_link.close()
     for t in threads:
         t.join(timeout=2.0)
+    events = serial_link.event_queue.stats()
+    if events["received"]:
+        MDTLogger.info("Events: {received} received, {coalesced} coalesced, {dropped} dropped.".format(**events))
     Terminal.success("Debugger closed.")
 
 
@@ -197,6 +685,6 @@ def ping_command(command: Command, yaml_build_data=None, serial_link: MCUSerialL
     Commander(serial_link).ping(command)
 
 
-def execute_command(command: Command, serial_link: MCUSerialLink = None) -> None:
-    """Execute a command on the MCU."""
-    Commander(serial_link).execute(command)
\ No newline at end of file
+def execute_command(command: Command, serial_link: MCUSerialLink = None) -> bytearray | None:
+    """Execute a command on the MCU, returning read data for READ_MEM/READ_REG."""
+    return Commander(serial_link).execute(command)
\ No newline at end of file
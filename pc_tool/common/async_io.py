@@ -0,0 +1,257 @@
+import asyncio
+import os
+import time
+from typing import AsyncIterator
+
+import serial
+
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.enums import MDT_PACKET_SIZE, FenceType
+from pc_tool.common.logger import MDTLogger
+from pc_tool.common.protocol import PacketView, serialize_command_packet
+from pc_tool.common.ring_buffer import RxRingBuffer
+from pc_tool.common.uart_io import _RESET_PROBE, _RX_CAPACITY, _SYNC_TIMEOUT, MCUSerialLink
+
+# Same CMD_ID=0 poll the threaded EventHandler sends in UART-idle mode
+_POLL_PACKET = serialize_command_packet(
+    Command(name="POLL", id=0x00, mem=None, address=0, data=None),
+    seq=0, multi=False, last=False,
+)
+
+
+class AsyncMCUSerialLink:
+    """asyncio counterpart of ``MCUSerialLink``.
+
+    The port's file descriptor is registered with the running event loop
+    (``loop.add_reader``), so receiving needs no thread: whenever bytes
+    arrive they are drained into an ``RxRingBuffer``, cut into frames and
+    routed the way ``EventHandler.rx_worker`` does it: events to the event
+    queue, clean poll ACKs dropped, everything else to the response queue.
+    Works for ``socket://`` URLs and POSIX ttys/ptys, which both expose a
+    pollable ``fileno()``.
+
+    ``poll_interval`` (seconds) starts a task that sends the CMD_ID=0 event
+    poll, for firmware built in UART-idle mode.  None disables it.
+
+    Usage::
+
+        async with AsyncMCUSerialLink("socket://localhost:3333", reset_delay=0) as link:
+            await link.send_packet(pkt)
+            ack = await link.get_response_packet()
+            async for event in link.events():
+                ...
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudrate: int = 19200,
+        reset_delay: float = 2.0,
+        startup_ping: bytes | None = None,
+        poll_interval: float | None = None,
+    ) -> None:
+        self.port           = port
+        self.baudrate       = baudrate
+        self.reset_delay    = reset_delay
+        self.startup_ping   = startup_ping
+        self.poll_interval  = poll_interval
+        self.running        = False
+        self.response_queue: asyncio.Queue[bytes]        = asyncio.Queue()
+        self.event_queue:    asyncio.Queue[bytes | None] = asyncio.Queue()
+        self._rx_buf        = RxRingBuffer(_RX_CAPACITY)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._fd:   int | None                       = None
+        self._echo: asyncio.Future | None            = None
+        self._poll_task: asyncio.Task | None         = None
+        self.ser            = None
+
+    # Lifecycle
+    async def open(self) -> None:
+        if self.ser is not None and self.ser.is_open:
+            return
+
+        port = self.port
+        if not port.startswith("socket://") and not os.path.exists(port):
+            # Only a port that is still appearing (simavr) is worth a worker thread
+            port = await asyncio.to_thread(MCUSerialLink._resolve_port, port)
+
+        serial_kwargs = dict(
+            baudrate=self.baudrate,
+            timeout=0,          # the event loop does the waiting
+            xonxoff=False,
+            rtscts=False,
+            dsrdtr=False,
+        )
+        # Opening a tty can block (driver, USB enumeration); keep it off the loop
+        self.ser = await asyncio.to_thread(
+            serial.serial_for_url if port.startswith("socket://") else serial.Serial,
+            port, **serial_kwargs,
+        )
+
+        try:
+            self._fd = self.ser.fileno()
+        except Exception as exc:
+            self.ser.close()
+            self.ser = None
+            raise serial.SerialException(
+                f"Port '{port}' cannot be polled by asyncio ({exc}); use MCUSerialLink instead."
+            ) from exc
+
+        self._loop   = asyncio.get_running_loop()
+        self._loop.add_reader(self._fd, self._on_readable)
+        self.running = True
+
+        await self.sync()
+
+        if self.poll_interval:
+            self._poll_task = asyncio.create_task(self._poll_loop())
+
+    async def close(self) -> None:
+        self.running = False
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        self._detach()
+        if self.ser:
+            try:
+                self.ser.reset_input_buffer()
+                self.ser.reset_output_buffer()
+            except Exception:
+                pass
+            # pyserial's socket:// close() sleeps 0.3 s; keep that off the loop
+            ser, self.ser = self.ser, None
+            await asyncio.to_thread(ser.close)
+        self.event_queue.put_nowait(None)  # ends any events() iterator
+
+    async def __aenter__(self) -> "AsyncMCUSerialLink":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _detach(self) -> None:
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+        self._fd = None
+
+    async def sync(self) -> None:
+        """Wait until the MCU is up; same policy as ``MCUSerialLink.sync``.
+
+        The startup ping is tried for ``_RESET_PROBE`` seconds first and
+        ``reset_delay`` is only served if it goes unanswered.  Without a
+        startup ping the delay is always served, except on ``socket://``
+        URLs, which have no reset line.
+        """
+        if not self.startup_ping:
+            if self.reset_delay > 0 and not self.port.startswith("socket://"):
+                await asyncio.sleep(self.reset_delay)
+            return
+
+        start = time.monotonic()
+        if not await self._synch_with_mcu(timeout=_RESET_PROBE, quiet=True):
+            remaining = self.reset_delay - (time.monotonic() - start)
+            if remaining > 0:
+                MDTLogger.info(f"No answer from the MCU; waiting {remaining:.1f}s for it to come out of reset.")
+                await asyncio.sleep(remaining)
+            await self._synch_with_mcu()
+
+        # A probe echo arriving late was routed as a response; nothing has been sent yet
+        while not self.response_queue.empty():
+            self.response_queue.get_nowait()
+
+    async def _synch_with_mcu(self, timeout: float = _SYNC_TIMEOUT, quiet: bool = False) -> bool:
+        """Send the startup ping and wait for its echo, like ``MCUSerialLink``."""
+        self._rx_buf.clear()
+        self._echo = self._loop.create_future()
+        self.ser.write(self.startup_ping)
+        try:
+            await asyncio.wait_for(self._echo, timeout)
+        except asyncio.TimeoutError:
+            if not quiet:
+                MDTLogger.warning(
+                    f"Startup ping echo mismatch: expected {MDT_PACKET_SIZE}, got {len(self._rx_buf)}."
+                )
+            return False
+        finally:
+            self._echo = None
+            self._rx_buf.clear()  # the echo is not a response anyone waits for
+        MDTLogger.info("Startup ping successful — MCU is connected.")
+        return True
+
+    async def _poll_loop(self) -> None:
+        while self.running:
+            try:
+                await self.send_packet(_POLL_PACKET)
+            except Exception as exc:
+                if self.running:
+                    MDTLogger.error(f"[Poll Task] {exc}", code=5)
+            await asyncio.sleep(self.poll_interval)
+
+    # Receive path (runs as an event loop callback)
+    def _on_readable(self) -> None:
+        try:
+            self._rx_buf.fill(self.ser.readinto)
+        except Exception as exc:
+            MDTLogger.error(f"[Async RX] {exc}: closing link {self.port}.", code=5)
+            self.running = False
+            self._detach()
+            self.event_queue.put_nowait(None)
+            return
+
+        if self._echo is not None:
+            if len(self._rx_buf) >= MDT_PACKET_SIZE and not self._echo.done():
+                self._echo.set_result(None)
+            return
+
+        self._route_frames()
+
+    def _route_frames(self) -> None:
+        """Cut every complete frame out of the ring buffer and queue it."""
+        rx = self._rx_buf
+        while True:
+            idx = rx.find(FenceType.START_BYTE)
+            if idx == -1:
+                rx.clear()
+                return
+            if idx > 0:
+                rx.consume(idx)
+            if len(rx) < MDT_PACKET_SIZE:
+                return
+
+            pkt = bytes(rx.frame(MDT_PACKET_SIZE))
+            rx.consume(MDT_PACKET_SIZE)
+
+            view = PacketView(pkt)
+            if view.is_event:
+                self.event_queue.put_nowait(pkt)
+            elif view.cmd_id == 0 and view.is_ack and not view.is_error:
+                pass  # clean poll ACK
+            else:
+                self.response_queue.put_nowait(pkt)
+
+    # I/O
+    async def send_packet(self, packet: bytes) -> None:
+        if self.ser is None or not self.ser.is_open:
+            raise RuntimeError("Serial port is not open.")
+        self.ser.write(packet)
+
+    async def get_response_packet(self, timeout: float = 1.0) -> bytes | None:
+        try:
+            return await asyncio.wait_for(self.response_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def get_event_packet(self, timeout: float = 1.0) -> bytes | None:
+        try:
+            return await asyncio.wait_for(self.event_queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def events(self) -> AsyncIterator[PacketView]:
+        """Yield event packets as they arrive, until the link is closed."""
+        while True:
+            pkt = await self.event_queue.get()
+            if pkt is None:
+                return
+            yield PacketView(pkt)
@@ -0,0 +1,90 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+from pc_tool.common.logger import MDTLogger
+
+# Set to a directory to relocate the cache, or to an empty string to disable it
+CACHE_DIR_ENV = "MCU_MDT_CACHE_DIR"
+
+
+def cache_dir() -> Path | None:
+    """Directory holding MCU-MDT's derived-data caches, or None if caching is disabled.
+
+    ``$MCU_MDT_CACHE_DIR`` wins; otherwise ``$XDG_CACHE_HOME/mcu-mdt``
+    (``~/.cache/mcu-mdt``).
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override is not None:
+        return Path(override) if override else None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "mcu-mdt"
+
+
+def cache_key(*parts: object, files: tuple[str, ...] = ()) -> str:
+    """Hex digest over *parts* and the contents of *files*.
+
+    Hashing contents (not mtimes) keeps the key valid across checkouts and
+    copies, and changes it whenever a source file changes.
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(repr(part).encode())
+        h.update(b"\0")
+    for path in files:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        h.update(b"\0")
+    return h.hexdigest()[:32]
+
+
+def _entry(kind: str, key: str) -> Path | None:
+    root = cache_dir()
+    return root / f"{kind}-{key}.pickle" if root is not None else None
+
+
+def load(kind: str, key: str) -> object | None:
+    """Return the object cached under (*kind*, *key*), or None on a miss.
+
+    An unreadable entry (truncated write, class that no longer unpickles)
+    counts as a miss and is removed.
+    """
+    path = _entry(kind, key)
+    if path is None or not path.is_file():
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as exc:
+        MDTLogger.info(f"Discarding unreadable cache entry {path}: {exc}")
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+
+
+def store(kind: str, key: str, obj: object) -> None:
+    """Cache *obj* under (*kind*, *key*).  Failures are logged and ignored.
+
+    The entry is written to a temporary file and renamed into place, so a
+    concurrent reader sees either the old state or the complete entry.
+    """
+    path = _entry(kind, key)
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{kind}-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except Exception as exc:
+        MDTLogger.info(f"Could not write cache entry {path}: {exc}")
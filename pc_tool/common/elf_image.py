@@ -0,0 +1,124 @@
+from bisect import bisect_right
+from contextlib import nullcontext
+
+from pc_tool.common.logger import MDTLogger
+from pc_tool.common.enums import MCUPlatforms
+from pc_tool.common.elf_symbols import AVR_SRAM_OFFSET, ELFSource
+
+# Words compared against the device before the image is trusted
+DEFAULT_VERIFY_SAMPLES = 4
+
+
+class FirmwareImage:
+    """Address-indexed copy of the bytes the ELF puts in flash.
+
+    Built from the ELF's loadable segments at their load (physical)
+    address, so ``.data`` initialisers sit where the MCU copies them from.
+    Only the ``[start, end)`` firmware range from build_info.yaml is
+    served: that range is write-protected by the validator, so while the
+    board runs this build it cannot differ from the ELF.
+
+    ``verified`` is None until ``Commander`` has compared a few sampled
+    words against the device; False disables the image for the session.
+    """
+
+    def __init__(self, segments: list[tuple[int, bytes]], start: int, end: int) -> None:
+        # Merge touching segments so a read spanning .text/.rodata/.data is one slice
+        merged: list[list] = []
+        for addr, data in sorted(segments, key=lambda s: s[0]):
+            if not data:
+                continue
+            if merged and merged[-1][0] + len(merged[-1][1]) == addr:
+                merged[-1][1] += data
+            else:
+                merged.append([addr, bytearray(data)])
+
+        self._starts   = [addr for addr, _ in merged]
+        self._data     = [bytes(data) for _, data in merged]
+        self.start     = start
+        self.end       = end
+        self.verified: bool | None = None
+
+    @property
+    def size(self) -> int:
+        return sum(len(d) for d in self._data)
+
+    def covers(self, address: int, length: int) -> bool:
+        """True if every byte of the range is in the firmware range and the image."""
+        return self._locate(address, length) is not None
+
+    def read(self, address: int, length: int) -> bytes | None:
+        """Return the image bytes for the range, or None if it is not fully covered."""
+        hit = self._locate(address, length)
+        if hit is None:
+            return None
+        idx, off = hit
+        return self._data[idx][off : off + length]
+
+    def samples(self, count: int, width: int = 4) -> list[int]:
+        """Addresses of *count* ``width``-byte words spread evenly over the image."""
+        words = [
+            (base + off)
+            for base, data in zip(self._starts, self._data, strict=True)
+            for off in range(0, len(data) - width + 1, width)
+            if self.covers(base + off, width)
+        ]
+        if count <= 0 or not words:
+            return []
+        if count >= len(words):
+            return words
+        step = (len(words) - 1) / max(1, count - 1)
+        return sorted({words[round(i * step)] for i in range(count)})
+
+    def _locate(self, address: int, length: int) -> tuple[int, int] | None:
+        if length <= 0 or address < self.start or address + length > self.end:
+            return None
+        idx = bisect_right(self._starts, address) - 1
+        if idx < 0:
+            return None
+        off = address - self._starts[idx]
+        if off + length > len(self._data[idx]):
+            return None
+        return idx, off
+
+
+def load_firmware_image(elf_path: str, platform: str, start: int, end: int,
+                        source: ELFSource | None = None) -> FirmwareImage | None:
+    """
+    Read the PT_LOAD segments of an ELF into a FirmwareImage bounded by
+    ``[start, end)``.  AVR segments in the 0x800000 data space are skipped;
+    only flash-resident bytes are kept.  Returns None if the ELF cannot be
+    read, has nothing in the range, or pyelftools is missing.  *source*
+    reuses an ELF already parsed for its symbols.
+    """
+    plat = platform.lower()
+    segments: list[tuple[int, bytes]] = []
+
+    try:
+        with ELFSource(elf_path) if source is None else nullcontext(source) as src:
+            elf = src.elf()
+            if elf is None:
+                return None
+            for seg in elf.iter_segments():
+                if seg["p_type"] != "PT_LOAD" or seg["p_filesz"] == 0:
+                    continue
+                addr = seg["p_paddr"]
+                if plat == MCUPlatforms.AVR and addr >= AVR_SRAM_OFFSET:
+                    continue
+                segments.append((addr, seg.data()))
+
+    except FileNotFoundError:
+        MDTLogger.warning(f"ELF file not found: {elf_path}")
+        return None
+    except Exception as exc:
+        MDTLogger.warning(f"Failed to read ELF image: {exc}")
+        return None
+
+    image = FirmwareImage(segments, start, end)
+    if not image.covers(start, 1):
+        MDTLogger.warning(
+            f"ELF {elf_path} has no loadable bytes at the firmware start 0x{start:08X}; "
+            f"FLASH reads will go over UART."
+        )
+        return None
+    return image
@@ -1,13 +1,13 @@
+from bisect import bisect_right
+from collections.abc import Mapping
+from contextlib import nullcontext
 from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from pc_tool.common import disk_cache
 from pc_tool.common.logger import MDTLogger
 from pc_tool.common.enums import MCUPlatforms, STM32Type
 
-try:
-    from elftools.elf.elffile import ELFFile
-    _ELFTOOLS_AVAILABLE = True
-except ImportError:
-    _ELFTOOLS_AVAILABLE = False
-
 # AVR ELF encodes SRAM addresses with this offset — strip it before sending
 AVR_SRAM_OFFSET = 0x800000
 
@@ -19,6 +19,65 @@ AVR_SRAM_MIN = 0x60
 STM32_RAM_BASE  = STM32Type.RAM_BASE   # 0x20000000
 STM32_RAM_END   = 0x2FFFFFFF
 
+# Bump when SymbolTable or the symbol filter changes; invalidates cached tables
+SYMBOL_CACHE_VERSION = 1
+
+
+def elffile_class():
+    """pyelftools' ``ELFFile``, or None if it is not installed.
+
+    Imported on first use: pyelftools takes longer to import than a cached
+    symbol table takes to load.
+    """
+    try:
+        from elftools.elf.elffile import ELFFile
+    except ImportError:
+        return None
+    return ELFFile
+
+
+class ELFSource:
+    """An ELF file opened and parsed at most once, shared by the ELF loaders.
+
+    ``elf()`` opens the file and builds pyelftools' ``ELFFile`` on the
+    first call and hands the same object out afterwards (None without
+    pyelftools); opening or parsing errors propagate to the caller.  The
+    parsed file reads through one handle, so a source must not be shared
+    between threads.
+
+    Usage::
+
+        with ELFSource(elf_path) as source:
+            symbols = load_elf_symbols(elf_path, platform, source)
+            image   = load_firmware_image(elf_path, platform, start, end, source)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path  = path
+        self._file = None
+        self._elf  = None
+
+    def elf(self):
+        if self._elf is None:
+            elf_file = elffile_class()
+            if elf_file is None:
+                return None
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            self._elf = elf_file(self._file)
+        return self._elf
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = self._elf = None
+
+    def __enter__(self) -> "ELFSource":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
 
 @dataclass
 class SymbolInfo:
@@ -28,6 +87,69 @@ class SymbolInfo:
     mask:    int   # suggested 32-bit watch mask based on size
 
 
+class SymbolTable(Mapping):
+    """Name -> ``SymbolInfo`` map of an ELF's RAM data symbols, with reverse lookup.
+
+    Reads like the dict ``load_elf_symbols`` used to return.  On top of
+    that it keeps the symbols sorted by address, so ``at`` / ``describe``
+    find the symbol holding an address with ``bisect``, and a prefix index
+    of compiler-mangled local statics (``counter.0``, ``counter.1``), so
+    ``statics`` does not scan every name.  Built once per ELF and cached
+    on disk.
+    """
+
+    def __init__(self, symbols: Iterable[SymbolInfo] = ()) -> None:
+        self._by_name: dict[str, SymbolInfo] = {sym.name: sym for sym in symbols}
+        # Largest symbol last among equal addresses: bisect lands on it
+        self._sorted  = sorted(self._by_name.values(), key=lambda sym: (sym.address, sym.size))
+        self._addrs   = [sym.address for sym in self._sorted]
+        # "a.b.1" is indexed under "a" and "a.b", matching startswith(name + ".")
+        self._statics: dict[str, list[SymbolInfo]] = {}
+        for name, sym in self._by_name.items():
+            dot = name.find(".")
+            while dot > 0:
+                self._statics.setdefault(name[:dot], []).append(sym)
+                dot = name.find(".", dot + 1)
+
+    def __getitem__(self, name: str) -> SymbolInfo:
+        return self._by_name[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_name)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def at(self, address: int) -> tuple[SymbolInfo, int] | None:
+        """``(symbol, offset)`` for the symbol containing *address*, or None."""
+        i = bisect_right(self._addrs, address) - 1
+        if i < 0:
+            return None
+        sym    = self._sorted[i]
+        offset = address - sym.address
+        return (sym, offset) if offset < max(sym.size, 1) else None
+
+    def describe(self, address: int) -> str | None:
+        """``name`` or ``name+0xN`` for *address*, or None if no symbol holds it."""
+        hit = self.at(address)
+        if hit is None:
+            return None
+        sym, offset = hit
+        return f"{sym.name}+0x{offset:X}" if offset else sym.name
+
+    def statics(self, name: str) -> list[SymbolInfo]:
+        """*name* itself plus every mangled local static ``name.N``."""
+        exact = self._by_name.get(name)
+        return ([exact] if exact is not None else []) + self._statics.get(name, [])
+
+
+def find_local_statics(name: str, symbols: Mapping[str, SymbolInfo]) -> list[SymbolInfo]:
+    """Symbols named *name* or ``name.<suffix>`` (compiler-mangled local statics)."""
+    if isinstance(symbols, SymbolTable):
+        return symbols.statics(name)
+    return [s for k, s in symbols.items() if k == name or k.startswith(name + ".")]
+
+
 def _is_ram_symbol_avr(raw_addr: int) -> bool:
     """AVR: RAM symbols have the 0x800000 offset applied in the ELF."""
     return raw_addr >= AVR_SRAM_OFFSET
@@ -38,33 +160,59 @@ def _is_ram_symbol_stm32(addr: int) -> bool:
     return STM32_RAM_BASE <= addr <= STM32_RAM_END
 
 
-def load_elf_symbols(elf_path: str, platform: str) -> dict[str, SymbolInfo]:
+def load_elf_symbols(elf_path: str, platform: str, source: ELFSource | None = None) -> SymbolTable:
     """
-    Parse the .symtab of an ELF file and return a dict of symbol name -> SymbolInfo.
+    Parse the .symtab of an ELF file and return a SymbolTable of symbol name -> SymbolInfo.
     Only data symbols (STT_OBJECT) that live in RAM are included — flash/const
     symbols are silently skipped since they cannot change and cannot be watched.
-    Returns empty dict if ELF has no symbol table or pyelftools is missing.
-    """
-    if not _ELFTOOLS_AVAILABLE:
-        MDTLogger.warning(
-            "pyelftools not installed — symbol resolution unavailable. "
-            "Install with: pip install pyelftools"
-        )
-        return {}
+    Returns an empty table if ELF has no symbol table or pyelftools is missing.
 
+    The table is cached on disk under a hash of the ELF's contents, so a
+    rebuilt firmware is re-read and an unchanged one is not parsed again.
+    On a miss the ELF is parsed through *source* when one is given.
+    """
     plat = platform.lower()
-    symbols: dict[str, SymbolInfo] = {}
+    try:
+        key = disk_cache.cache_key(SYMBOL_CACHE_VERSION, plat, files=(elf_path,))
+    except FileNotFoundError:
+        MDTLogger.warning(f"ELF file not found: {elf_path}")
+        return SymbolTable()
+    except OSError as exc:
+        MDTLogger.warning(f"Failed to read ELF file: {exc}")
+        return SymbolTable()
+
+    table = disk_cache.load("symbols", key)
+    if isinstance(table, SymbolTable):
+        return table
+
+    symbols = _read_symbols(elf_path, plat, source)
+    if symbols is None:
+        return SymbolTable()
+    table = SymbolTable(symbols)
+    disk_cache.store("symbols", key, table)
+    return table
+
+
+def _read_symbols(elf_path: str, plat: str, source: ELFSource | None = None) -> list[SymbolInfo] | None:
+    """Walk .symtab with pyelftools; None if the ELF could not be read."""
+    symbols: list[SymbolInfo] = []
 
     try:
-        with open(elf_path, "rb") as f:
-            elf = ELFFile(f)
+        with ELFSource(elf_path) if source is None else nullcontext(source) as src:
+            elf = src.elf()
+            if elf is None:
+                MDTLogger.warning(
+                    "pyelftools not installed — symbol resolution unavailable. "
+                    "Install with: pip install pyelftools"
+                )
+                return None
             symtab = elf.get_section_by_name(".symtab")
             if symtab is None:
                 MDTLogger.warning(
                     f"No .symtab in {elf_path} — compile without -s "
                     f"(or add -g) to keep the symbol table."
                 )
-                return {}
+                return []
 
             for sym in symtab.iter_symbols():
                 if sym.entry.st_info.type != "STT_OBJECT":
@@ -91,22 +239,24 @@ def load_elf_symbols(elf_path: str, platform: str) -> dict[str, SymbolInfo]:
                     # Unknown platform — include everything, let the user decide
                     addr = raw_addr
 
-                symbols[sym.name] = SymbolInfo(
+                symbols.append(SymbolInfo(
                     name=sym.name,
                     address=addr,
                     size=size,
                     mask=_size_to_mask(size),
-                )
+                ))
 
     except FileNotFoundError:
         MDTLogger.warning(f"ELF file not found: {elf_path}")
+        return None
     except Exception as exc:
         MDTLogger.warning(f"Failed to parse ELF symbols: {exc}")
+        return None
 
     return symbols
 
 
-def resolve_symbol(name: str, symbols: dict[str, SymbolInfo]) -> SymbolInfo | None:
+def resolve_symbol(name: str, symbols: Mapping[str, SymbolInfo]) -> SymbolInfo | None:
     """Look up a symbol by name. Returns None if not found."""
     return symbols.get(name)
 
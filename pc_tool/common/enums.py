@@ -6,6 +6,7 @@ MDT_MAX_WATCHPOINTS = 4
 
 DEFAULT_BAUDRATE: int   = 19_200
 COMMUNICATION_TIMEOUT: float = 5.0  # seconds — used by uart_io and serial link
+DEFAULT_TX_WINDOW: int  = 1      # chunk packets in flight per transfer (1 = stop-and-wait)
 
 
 class CommandId(IntEnum):
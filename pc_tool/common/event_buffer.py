@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+from pc_tool.common.enums import MDTOffset
+
+EVENT_BUFFER_CAPACITY = 64  # distinct (type, slot) entries waiting to be shown
+
+
+class CoalescedEvent:
+    """One or more event packets of the same type from the same slot.
+
+    ``first`` and ``last`` are the raw packets of the run (the same object
+    for a single event); ``count`` is how many were folded together and
+    ``first_time`` / ``last_time`` are ``time.monotonic()`` arrival times.
+    """
+
+    __slots__ = ("key", "first", "last", "count", "first_time", "last_time")
+
+    def __init__(self, key, pkt: bytes, now: float) -> None:
+        self.key        = key
+        self.first      = self.last      = pkt
+        self.first_time = self.last_time = now
+        self.count      = 1
+
+    @property
+    def span(self) -> float:
+        """Seconds between the first and the last folded event."""
+        return self.last_time - self.first_time
+
+    def __repr__(self) -> str:
+        return f"CoalescedEvent(key={self.key!r}, count={self.count}, span={self.span:.3f})"
+
+
+class EventBuffer:
+    """Bounded, thread-safe event queue that folds repeats of a pending event.
+
+    An event packet whose (type, slot) already waits in the buffer is
+    merged into that entry (``coalesced`` counts these), so a watchpoint
+    toggling thousands of times a second costs one entry until the
+    listener catches up.  A new (type, slot) arriving while ``capacity``
+    entries are pending is dropped (``dropped``).  Entries come out in the
+    order their first event arrived.
+
+    Usage::
+
+        events = EventBuffer(capacity=64)
+        events.put(pkt)                     # rx_worker
+        for entry in events.drain(timeout=1.0):
+            ...                             # listener
+    """
+
+    def __init__(self, capacity: int = EVENT_BUFFER_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError(f"event buffer capacity must be >= 1, got {capacity}")
+        self.capacity  = capacity
+        self.received  = 0
+        self.coalesced = 0
+        self.dropped   = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._ready    = threading.Condition()
+        self._serial   = 0      # keys for packets that must not be coalesced
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key_of(pkt: bytes) -> tuple[int, int]:
+        """(event type, slot): the MEM_ID and SEQ bytes of an event packet."""
+        return pkt[MDTOffset.MEM_ID], pkt[MDTOffset.SEQ]
+
+    def put(self, pkt: bytes, coalesce: bool = True) -> bool:
+        """Queue *pkt*; return False if it was dropped.
+
+        Pass ``coalesce=False`` for packets that must stay separate (corrupt
+        ones, whose type and slot bytes cannot be trusted).
+        """
+        now = time.monotonic()
+        with self._ready:
+            self.received += 1
+            if coalesce:
+                key = self.key_of(pkt)
+            else:
+                self._serial += 1
+                key = ("raw", self._serial)
+
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last, entry.last_time = pkt, now
+                entry.count    += 1
+                self.coalesced += 1
+                return True
+            if len(self._entries) >= self.capacity:
+                self.dropped += 1
+                return False
+
+            self._entries[key] = CoalescedEvent(key, pkt, now)
+            self._ready.notify()
+            return True
+
+    def get(self, timeout: float | None = None) -> CoalescedEvent | None:
+        """Remove and return the oldest entry, waiting up to *timeout* seconds."""
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._entries, timeout):
+                return None
+            return self._entries.popitem(last=False)[1]
+
+    def drain(self, timeout: float | None = None) -> list[CoalescedEvent]:
+        """Wait up to *timeout* for an entry, then remove and return all of them."""
+        with self._ready:
+            if not self._ready.wait_for(lambda: self._entries, timeout):
+                return []
+            entries = list(self._entries.values())
+            self._entries.clear()
+            return entries
+
+    def stats(self) -> dict[str, int]:
+        return {"received": self.received, "coalesced": self.coalesced,
+                "dropped": self.dropped, "pending": len(self._entries)}
@@ -0,0 +1,92 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+EVENT_POLL_FLOOR   = 0.02  # seconds between polls right after an event
+EVENT_POLL_CEILING = 0.5   # seconds between polls on an idle target
+_POLL_BACKOFF      = 2.0   # interval growth per poll that brought no event
+
+
+class PollScheduler:
+    """Decides when the UART-idle event poll is sent next.
+
+    The interval starts at ``floor`` and doubles after every poll, up to
+    ``ceiling``.  An event (``on_event``) snaps it back to ``floor`` and
+    pulls the next poll in, because the MCU returns one event per poll
+    and may hold more.  While a command transfer is in flight
+    (``transfer()``) no poll is sent at all; the first one after it
+    goes out ``floor`` seconds later.
+
+    Usage::
+
+        poll = PollScheduler(floor=0.02, ceiling=0.5)
+        with poll.transfer():               # Commander
+            ...
+        poll.on_event()                     # rx_worker
+        while running:                      # poll worker
+            if poll.wait(max_block=1.0):
+                send_poll()
+    """
+
+    def __init__(self, floor: float = EVENT_POLL_FLOOR, ceiling: float = EVENT_POLL_CEILING,
+                 backoff: float = _POLL_BACKOFF) -> None:
+        if not 0 < floor <= ceiling:
+            raise ValueError(f"event poll bounds need 0 < floor <= ceiling, got {floor} and {ceiling}")
+        self.floor     = floor
+        self.ceiling   = ceiling
+        self.backoff   = backoff
+        self.interval  = floor
+        self.polls     = 0
+        self._busy     = 0
+        self._deadline = time.monotonic()
+        self._cond     = threading.Condition()
+
+    @property
+    def busy(self) -> bool:
+        """True while a transfer is in flight."""
+        return self._busy > 0
+
+    @contextmanager
+    def transfer(self) -> Iterator[None]:
+        """Hold the poll for the duration of the block (nests)."""
+        with self._cond:
+            self._busy += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._busy -= 1
+                if not self._busy:
+                    # A full floor from now, even if the idle deadline already passed
+                    self.interval  = self.floor
+                    self._deadline = time.monotonic() + self.floor
+                    self._cond.notify_all()
+
+    def on_event(self) -> None:
+        """An event arrived: poll again soon."""
+        with self._cond:
+            self.interval  = self.floor
+            self._deadline = min(self._deadline, time.monotonic() + self.floor)
+            self._cond.notify_all()
+
+    def wait(self, max_block: float = 1.0) -> bool:
+        """Sleep until the next poll is due; True if it is, False after *max_block* seconds.
+
+        A False return lets the caller re-check whether it should keep
+        running.  On True the following poll is scheduled one (grown)
+        interval later.
+        """
+        give_up = time.monotonic() + max_block
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                due = self._deadline if not self._busy else give_up
+                if not self._busy and now >= due:
+                    self.polls    += 1
+                    self._deadline = now + self.interval
+                    self.interval  = min(self.interval * self.backoff, self.ceiling)
+                    return True
+                if now >= give_up:
+                    return False
+                self._cond.wait(min(due, give_up) - now)
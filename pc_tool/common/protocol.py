@@ -1,3 +1,7 @@
+import binascii
+import struct
+from typing import Callable, Iterable
+
 from pc_tool.common.dataclasses import Command, CommandPacket
 from pc_tool.common.enums import MDT_PACKET_SIZE, MDTOffset, MDTFlags, UtilEnum
 from pc_tool.common.logger import MDTLogger
@@ -5,8 +9,13 @@ from pc_tool.common.logger import MDTLogger
 _LE = "little"  # all multi-byte fields are little-endian
 
 
-def calculate_crc16(data: bytes) -> int:
-    """CRC-CCITT (poly 0x1021, init 0xFFFF)."""
+# CRC16 backends
+# All three compute CRC-CCITT (poly 0x1021, init 0xFFFF, no final XOR), the
+# same function as mdt_crc16() in the firmware.  The fastest one that agrees
+# with the reference is picked at import; set_crc_backend() overrides it.
+
+def _crc16_reference(data: bytes) -> int:
+    """Bit-twiddling form, a line-for-line port of mdt_crc16()."""
     crc = 0xFFFF
     for b in data:
         x = ((crc >> 8) ^ b) & 0xFF
@@ -19,9 +28,115 @@ def calculate_crc16(data: bytes) -> int:
         )
     return crc & 0xFFFF
 
+
+def _build_crc16_table() -> tuple[int, ...]:
+    """CRC of every single byte value with a zero register, for _crc16_table."""
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+_CRC16_TABLE = _build_crc16_table()
+
+
+def _crc16_table(data: bytes) -> int:
+    """One table lookup per byte instead of the shift/mask chain."""
+    crc   = 0xFFFF
+    table = _CRC16_TABLE
+    for b in data:
+        crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ b]
+    return crc
+
+
+def _crc16_binascii(data: bytes) -> int:
+    """C implementation from the standard library (same CCITT polynomial)."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+CRC16_BACKENDS: dict[str, Callable[[bytes], int]] = {
+    "binascii":  _crc16_binascii,
+    "table":     _crc16_table,
+    "reference": _crc16_reference,
+}
+
+# Self-test vectors: the standard check value, empty input, and one full
+# 14-byte packet payload so every backend is exercised at protocol size.
+_CRC16_SELF_TEST = (b"123456789", b"", bytes(range(0xF0, 0xFE)))
+
+
+def _crc16_backend_ok(fn: Callable[[bytes], int]) -> bool:
+    try:
+        return (
+            fn(b"123456789") == 0x29B1
+            and all(fn(v) == _crc16_reference(v) for v in _CRC16_SELF_TEST)
+        )
+    except Exception:
+        return False
+
+
+def _select_crc_backend() -> str:
+    for name, fn in CRC16_BACKENDS.items():
+        if _crc16_backend_ok(fn):
+            return name
+    return "reference"
+
+
+CRC16_BACKEND: str = _select_crc_backend()
+_crc16 = CRC16_BACKENDS[CRC16_BACKEND]
+
+
+def set_crc_backend(name: str) -> None:
+    """Switch the CRC16 implementation used by this module.
+
+    Raises ``ValueError`` for an unknown name or a backend that fails the
+    self-test.
+    """
+    global CRC16_BACKEND, _crc16
+    fn = CRC16_BACKENDS.get(name)
+    if fn is None:
+        raise ValueError(
+            f"Unknown CRC backend '{name}'. Expected one of: {', '.join(CRC16_BACKENDS)}"
+        )
+    if not _crc16_backend_ok(fn):
+        raise ValueError(f"CRC backend '{name}' failed its self-test.")
+    CRC16_BACKEND, _crc16 = name, fn
+
+
+def calculate_crc16(data: bytes) -> int:
+    """CRC-CCITT (poly 0x1021, init 0xFFFF)."""
+    return _crc16(data)
+
+
+def verify_crc16_batch(frames: bytes | Iterable[bytes]) -> list[bool]:
+    """Check the CRC of many packets at once.
+
+    *frames* is either one contiguous buffer of back-to-back 18-byte
+    packets or an iterable of individual packets.  Returns one bool per
+    packet.  Framing (START/END) is not checked here.
+    """
+    crc = _crc16
+    if isinstance(frames, (bytes, bytearray, memoryview)):
+        view   = memoryview(frames)
+        frames = (
+            view[off : off + MDT_PACKET_SIZE]
+            for off in range(0, len(view) - MDT_PACKET_SIZE + 1, MDT_PACKET_SIZE)
+        )
+
+    return [
+        len(pkt) == MDT_PACKET_SIZE
+        and crc(pkt[MDTOffset.CMD_ID : MDTOffset.CRC])
+            == (pkt[MDTOffset.CRC] | pkt[MDTOffset.CRC + 1] << 8)
+        for pkt in frames
+    ]
+
+
 def _crc_of(packet: bytes) -> int:
     """Compute the CRC over the packet payload (CMD_ID through end of DATA)."""
-    return calculate_crc16(packet[MDTOffset.CMD_ID : MDTOffset.CRC])
+    return _crc16(packet[MDTOffset.CMD_ID : MDTOffset.CRC])
 
 
 def _crc_from(packet: bytes) -> int:
@@ -29,15 +144,21 @@ def _crc_from(packet: bytes) -> int:
     return int.from_bytes(packet[MDTOffset.CRC : MDTOffset.CRC + 2], _LE)
 
 
-def serialize_command_packet(command: Command, seq: int, multi: bool, last: bool) -> bytes:
-    """Serialize a Command into a bytes packet according to the MDT protocol."""
-    data   = command.data if command.data is not None else b'\x00\x00\x00\x00'
-    length = min(command.length if command.length is not None else 0, UtilEnum.WORD_SIZE)
+# Precompiled frame layout, field for field in MDTOffset order:
+# START, CMD_ID, FLAGS, SEQ, MEM_ID, ADDRESS, LENGTH, DATA, CRC, END
+_FRAME   = struct.Struct("<BBBBBIH4sHB")
+_U16     = struct.Struct("<H")
+_U32     = struct.Struct("<I")
+_PAYLOAD = slice(MDTOffset.CMD_ID, MDTOffset.CRC)
 
-    if len(data) != UtilEnum.WORD_SIZE:
-        raise ValueError("Data must be exactly 4 bytes.")
+# SEQ wraps at 0xFF, like the firmware counter
+_SEQ_CYCLE = bytes(range(0xFF))
+
+if _FRAME.size != MDT_PACKET_SIZE:
+    raise ImportError(f"MDT frame layout is {_FRAME.size} bytes, expected {MDT_PACKET_SIZE}")
 
-    # Flags
+
+def _frame_flags(command: Command, multi: bool, last: bool) -> int:
     flags = MDTFlags.LENGTH_PRESENT
     if command.mem is not None:
         flags |= MDTFlags.MEM_ID_PRESENT
@@ -45,22 +166,106 @@ def serialize_command_packet(command: Command, seq: int, multi: bool, last: bool
         flags |= MDTFlags.SEQ_PRESENT
         if last:
             flags |= MDTFlags.LAST_PACKET
+    return flags
+
+
+def serialize_command_packet(command: Command, seq: int, multi: bool, last: bool) -> bytes:
+    """Serialize a Command into a bytes packet according to the MDT protocol."""
+    data   = command.data if command.data is not None else b'\x00\x00\x00\x00'
+    length = min(command.length if command.length is not None else 0, UtilEnum.WORD_SIZE)
 
-    buf = bytearray()
-    buf.append(CommandPacket.START_BYTE)
-    buf.append(command.id)
-    buf.append(flags)
-    buf.append(seq)
-    buf.append(command.mem if command.mem is not None else 0x00)
-    buf += command.address.to_bytes(UtilEnum.WORD_SIZE, _LE)
-    buf += length.to_bytes(UtilEnum.HALF_WORD_SIZE,  _LE)
-    buf += data
-    buf += calculate_crc16(buf[1:]).to_bytes(UtilEnum.HALF_WORD_SIZE, _LE)
-    buf.append(CommandPacket.END_BYTE)
+    if len(data) != UtilEnum.WORD_SIZE:
+        raise ValueError("Data must be exactly 4 bytes.")
+
+    buf = bytearray(MDT_PACKET_SIZE)
+    _FRAME.pack_into(
+        buf, 0,
+        CommandPacket.START_BYTE,
+        command.id,
+        _frame_flags(command, multi, last),
+        seq,
+        command.mem if command.mem is not None else 0x00,
+        command.address,
+        length,
+        data,
+        0,
+        CommandPacket.END_BYTE,
+    )
+    _U16.pack_into(buf, MDTOffset.CRC, _crc16(buf[_PAYLOAD]))
 
     return bytes(buf)
 
 
+def serialize_transfer(command: Command) -> list[memoryview]:
+    """Serialize a whole (possibly multi-chunk) transfer into one buffer.
+
+    Produces the same packets as calling ``serialize_command_packet`` once
+    per word-sized chunk with ``seq = index % 0xFF``, but without building a
+    ``Command`` per chunk: a template frame is packed once, repeated, and
+    only ADDRESS, SEQ, DATA and CRC are patched per frame (plus FLAGS and
+    LENGTH on the last one).  Returns one read-only ``memoryview`` per
+    packet, all slices of a single contiguous buffer.
+    """
+    word   = UtilEnum.WORD_SIZE
+    length = command.length if command.length is not None else word
+    count  = -(-length // word)
+    if count <= 0:
+        return []
+
+    multi = length > word
+    end   = command.address + (count - 1) * word
+    if not 0 <= command.address <= end <= 0xFFFFFFFF:
+        raise ValueError(f"Transfer of {length} bytes at 0x{command.address:08X} exceeds the 32-bit address space.")
+
+    data = None
+    if command.data is not None:
+        data = bytes(command.data[:length]).ljust(count * word, b'\x00')
+
+    template = _FRAME.pack(
+        CommandPacket.START_BYTE,
+        command.id,
+        _frame_flags(command, multi, last=False),
+        0,
+        command.mem if command.mem is not None else 0x00,
+        0,
+        min(length, word),
+        bytes(word),
+        0,
+        CommandPacket.END_BYTE,
+    )
+    buf  = bytearray(template * count)
+    view = memoryview(buf)
+    step = MDT_PACKET_SIZE
+
+    # The last frame may carry a short LENGTH and the LAST_PACKET flag
+    last_off = (count - 1) * step
+    buf[last_off + MDTOffset.FLAGS] = _frame_flags(command, multi, last=True)
+    _U16.pack_into(buf, last_off + MDTOffset.LENGTH, min(word, length - (count - 1) * word))
+
+    # Patch SEQ, ADDRESS and DATA column-wise: one strided slice assignment
+    # per byte position instead of one pack per frame.
+    buf[MDTOffset.SEQ :: step] = (_SEQ_CYCLE * (count // 0xFF + 1))[:count]
+    addresses = struct.pack(f"<{count}I", *range(command.address, end + 1, word))
+    for k in range(word):
+        buf[MDTOffset.ADDRESS + k :: step] = addresses[k :: word]
+        if data is not None:
+            buf[MDTOffset.DATA + k :: step] = data[k :: word]
+
+    # CRC is the only field that has to be computed frame by frame
+    crc   = _crc16
+    start = int(MDTOffset.CMD_ID)
+    stop  = int(MDTOffset.CRC)
+    crcs  = struct.pack(
+        f"<{count}H",
+        *[crc(view[off + start : off + stop]) for off in range(0, len(buf), step)],
+    )
+    buf[MDTOffset.CRC     :: step] = crcs[0::2]
+    buf[MDTOffset.CRC + 1 :: step] = crcs[1::2]
+
+    view = view.toreadonly()
+    return [view[off : off + step] for off in range(0, len(buf), step)]
+
+
 def deserialize_command_packet(packet: bytes) -> CommandPacket:
     """Deserialize a bytes packet from the MCU into a CommandPacket, validating framing and CRC."""
     if len(packet) != MDT_PACKET_SIZE:
@@ -72,10 +277,10 @@ def deserialize_command_packet(packet: bytes) -> CommandPacket:
     if packet[MDTOffset.END] != CommandPacket.END_BYTE:
         raise ValueError(f"Bad end byte: 0x{packet[MDTOffset.END]:02X}.")
 
-    if _crc_from(packet) != _crc_of(packet):
+    received, calculated = _crc_from(packet), _crc_of(packet)
+    if received != calculated:
         raise ValueError(
-            f"CRC mismatch: received 0x{_crc_from(packet):04X}, "
-            f"calculated 0x{_crc_of(packet):04X}."
+            f"CRC mismatch: received 0x{received:04X}, calculated 0x{calculated:04X}."
         )
 
     flags  = packet[MDTOffset.FLAGS]
@@ -89,7 +294,7 @@ def deserialize_command_packet(packet: bytes) -> CommandPacket:
         address = int.from_bytes(packet[MDTOffset.ADDRESS : MDTOffset.ADDRESS + UtilEnum.WORD_SIZE],     _LE),
         length  = int.from_bytes(packet[MDTOffset.LENGTH  : MDTOffset.LENGTH  + UtilEnum.HALF_WORD_SIZE], _LE),
         data    = packet[MDTOffset.DATA : MDTOffset.DATA + UtilEnum.WORD_SIZE],
-        crc     = _crc_from(packet),
+        crc     = received,
     )
 
 
@@ -121,10 +326,10 @@ def validate_command_packet(packet: bytes) -> bool:
         MDTLogger.error(f"Bad end byte: 0x{packet[MDTOffset.END]:02X}.", code=3)
         return False
 
-    if _crc_from(packet) != _crc_of(packet):
+    received, calculated = _crc_from(packet), _crc_of(packet)
+    if received != calculated:
         MDTLogger.error(
-            f"CRC mismatch: received 0x{_crc_from(packet):04X}, "
-            f"calculated 0x{_crc_of(packet):04X}.",
+            f"CRC mismatch: received 0x{received:04X}, calculated 0x{calculated:04X}.",
             code=3,
         )
         return False
@@ -134,3 +339,142 @@ def validate_command_packet(packet: bytes) -> bool:
         return False
 
     return True
+
+
+class PacketView:
+    """Read-only, decode-on-access view of one received packet.
+
+    Framing (length, START, END) and CRC are checked exactly once, in the
+    constructor; the outcome is ``error`` (None when the frame is sound).
+    Fields are read straight out of the underlying buffer on access, so
+    classifying a packet (``is_event``, ``is_nack``, ``seq``) costs a
+    couple of index operations and no ``CommandPacket`` is ever built
+    unless ``to_command_packet()`` is called.
+
+    Exposes the same field names as ``CommandPacket`` so it can be passed
+    wherever one is rendered (e.g. ``Terminal.packet``).
+    """
+
+    __slots__ = ("raw", "_mv", "error")
+
+    def __init__(self, packet: bytes) -> None:
+        self.raw   = packet
+        self._mv   = memoryview(packet)
+        self.error = self._check(packet)
+
+    @staticmethod
+    def _check(packet: bytes) -> str | None:
+        if len(packet) != MDT_PACKET_SIZE:
+            return f"Invalid packet length: {len(packet)}, expected {MDT_PACKET_SIZE}."
+        if packet[MDTOffset.START] != CommandPacket.START_BYTE:
+            return f"Bad start byte: 0x{packet[MDTOffset.START]:02X}."
+        if packet[MDTOffset.END] != CommandPacket.END_BYTE:
+            return f"Bad end byte: 0x{packet[MDTOffset.END]:02X}."
+        received, calculated = _crc_from(packet), _crc_of(packet)
+        if received != calculated:
+            return f"CRC mismatch: received 0x{received:04X}, calculated 0x{calculated:04X}."
+        return None
+
+    # Validity
+    @property
+    def valid(self) -> bool:
+        """Framing and CRC are sound."""
+        return self.error is None
+
+    @property
+    def ok(self) -> bool:
+        """Same verdict as ``validate_command_packet``: sound and no STATUS_ERROR."""
+        return self.error is None and not self.is_error
+
+    # Raw fields
+    @property
+    def cmd_id(self) -> int:
+        return self._mv[MDTOffset.CMD_ID]
+
+    @property
+    def flags(self) -> int:
+        return self._mv[MDTOffset.FLAGS]
+
+    @property
+    def seq(self) -> int:
+        return self._mv[MDTOffset.SEQ]
+
+    @property
+    def mem_id(self) -> int | None:
+        if self._mv[MDTOffset.FLAGS] & MDTFlags.MEM_ID_PRESENT:
+            return self._mv[MDTOffset.MEM_ID]
+        return None
+
+    @property
+    def mem_byte(self) -> int:
+        """MEM_ID byte regardless of the flag (events carry their type here)."""
+        return self._mv[MDTOffset.MEM_ID]
+
+    @property
+    def address(self) -> int:
+        return int.from_bytes(self._mv[MDTOffset.ADDRESS : MDTOffset.ADDRESS + UtilEnum.WORD_SIZE], _LE)
+
+    @property
+    def length(self) -> int:
+        return int.from_bytes(self._mv[MDTOffset.LENGTH : MDTOffset.LENGTH + UtilEnum.HALF_WORD_SIZE], _LE)
+
+    @property
+    def data(self) -> memoryview:
+        """The 4 DATA bytes, as a zero-copy view."""
+        return self._mv[MDTOffset.DATA : MDTOffset.DATA + UtilEnum.WORD_SIZE]
+
+    @property
+    def data_word(self) -> int:
+        return int.from_bytes(self.data, _LE)
+
+    @property
+    def crc(self) -> int:
+        return _crc_from(self.raw)
+
+    # Classification
+    @property
+    def is_ack(self) -> bool:
+        return bool(self._mv[MDTOffset.FLAGS] & MDTFlags.ACK_NACK)
+
+    @property
+    def is_error(self) -> bool:
+        return bool(self._mv[MDTOffset.FLAGS] & MDTFlags.STATUS_ERROR)
+
+    @property
+    def is_nack(self) -> bool:
+        """Same rule as ``is_nack_packet``: cmd_id == 0 with ACK and ERROR set."""
+        flags = self._mv[MDTOffset.FLAGS]
+        return (
+            self._mv[MDTOffset.CMD_ID] == 0
+            and bool(flags & MDTFlags.ACK_NACK)
+            and bool(flags & MDTFlags.STATUS_ERROR)
+        )
+
+    @property
+    def is_event(self) -> bool:
+        return (
+            self._mv[MDTOffset.CMD_ID] == 0
+            and bool(self._mv[MDTOffset.FLAGS] & MDTFlags.EVENT_PACKET)
+        )
+
+    def to_command_packet(self) -> CommandPacket:
+        """Materialise a ``CommandPacket`` (for callers that need a dataclass)."""
+        return CommandPacket(
+            cmd_id  = self.cmd_id,
+            flags   = self.flags,
+            seq     = self.seq,
+            mem_id  = self.mem_id,
+            address = self.address,
+            length  = self.length,
+            data    = bytes(self.data),
+            crc     = self.crc,
+        )
+
+    def __repr__(self) -> str:
+        if len(self.raw) != MDT_PACKET_SIZE:
+            return f"PacketView(<invalid: {self.error}>)"
+        return (
+            f"PacketView(cmd_id={self.cmd_id}, flags={self.flags}, seq={self.seq}, "
+            f"mem_id={self.mem_id}, address={self.address}, length={self.length}, "
+            f"data={bytes(self.data)!r}, crc={self.crc})"
+        )
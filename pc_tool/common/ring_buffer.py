@@ -0,0 +1,87 @@
+from typing import Callable
+
+
+class RxRingBuffer:
+    """Fixed-capacity receive buffer with read/write cursors.
+
+    Bytes land in one preallocated ``bytearray`` between ``tail`` (next byte
+    to consume) and ``head`` (next free slot).  Consuming a frame only moves
+    ``tail``; nothing is shifted or reallocated.  When ``head`` reaches the
+    end, the few unread bytes (less than one frame in steady state) are
+    moved back to the start, so frames are always contiguous and can be
+    handed out as ``memoryview`` slices.
+
+    Usage::
+
+        rx = RxRingBuffer()
+        rx.fill(ser.readinto)       # or rx.write(data)
+        frame = rx.frame(18)        # memoryview, valid until the next fill
+        rx.consume(18)
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self._buf  = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._cap  = capacity
+        self.head  = 0
+        self.tail  = 0
+
+    def __len__(self) -> int:
+        return self.head - self.tail
+
+    @property
+    def capacity(self) -> int:
+        return self._cap
+
+    def clear(self) -> None:
+        self.head = self.tail = 0
+
+    def _make_room(self) -> None:
+        """Move unread bytes to the start so the free space is contiguous."""
+        if self.tail == self.head:
+            self.head = self.tail = 0
+        elif self.head == self._cap and self.tail > 0:
+            n = self.head - self.tail
+            self._view[:n] = self._view[self.tail : self.head]
+            self.tail, self.head = 0, n
+
+    def fill(self, readinto: Callable[[memoryview], int | None]) -> int:
+        """Let *readinto* write straight into the free space; return bytes added."""
+        self._make_room()
+        if self.head == self._cap:
+            raise BufferError("RX ring buffer full")
+        n = readinto(self._view[self.head :]) or 0
+        self.head += n
+        return n
+
+    def write(self, data: bytes) -> int:
+        """Copy *data* in, dropping the oldest unread bytes if it does not fit."""
+        data = memoryview(data)
+        if len(data) > self._cap:
+            data = data[-self._cap :]
+        overflow = len(self) + len(data) - self._cap
+        if overflow > 0:
+            self.tail += overflow
+        self._make_room()
+        if len(data) > self._cap - self.head:
+            n = self.head - self.tail
+            self._view[:n] = self._view[self.tail : self.head]
+            self.tail, self.head = 0, n
+        self._view[self.head : self.head + len(data)] = data
+        self.head += len(data)
+        return len(data)
+
+    def find(self, byte: int) -> int:
+        """Offset of *byte* from ``tail``, or -1 if it is not buffered."""
+        idx = self._buf.find(byte, self.tail, self.head)
+        return -1 if idx == -1 else idx - self.tail
+
+    def consume(self, n: int) -> None:
+        """Drop the next *n* unread bytes."""
+        self.tail = min(self.tail + n, self.head)
+        if self.tail == self.head:
+            self.head = self.tail = 0
+
+    def frame(self, n: int) -> memoryview:
+        """Zero-copy view of the next *n* unread bytes (caller checks ``len``)."""
+        return self._view[self.tail : self.tail + n]
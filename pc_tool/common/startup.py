@@ -0,0 +1,62 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from pc_tool.common.logger import MDTLogger
+from pc_tool.common.terminal import Terminal
+
+
+class StartupProfile:
+    """Wall-clock time of each session start-up phase, for ``--startup-profile``.
+
+    Phases are always timed (two ``perf_counter`` calls each) and written
+    to the log; ``report`` prints them only when the profile is enabled.
+    Phases may run on several threads at once (``ConfigLoader``), so
+    their sum can exceed the total.
+
+    Usage::
+
+        profile = StartupProfile(enabled=args.startup_profile, since=import_start)
+        with profile.phase("yaml"):
+            ...
+        profile.report()
+    """
+
+    def __init__(self, enabled: bool = False, since: float | None = None) -> None:
+        self.enabled = enabled
+        self.started = time.perf_counter() if since is None else since
+        self.phases: list[tuple[str, float]] = []
+        self._lock   = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record *seconds* under *name*, merging repeats of the same phase."""
+        with self._lock:
+            for i, (known, total) in enumerate(self.phases):
+                if known == name:
+                    self.phases[i] = (name, total + seconds)
+                    return
+            self.phases.append((name, seconds))
+
+    def total(self) -> float:
+        """Seconds since ``since`` (process start-up, as close as main can tell)."""
+        return time.perf_counter() - self.started
+
+    def report(self) -> None:
+        total = self.total()
+        other = max(total - sum(s for _, s in self.phases), 0.0)
+        lines = [f"  {name:<12} {s * 1000:8.1f} ms" for name, s in self.phases + [("other", other)]]
+        lines.append(f"  {'total':<12} {total * 1000:8.1f} ms")
+        text  = "Startup profile:\n" + "\n".join(lines)
+        if self.enabled:
+            Terminal.info(text)     # mirrored to the log
+        else:
+            MDTLogger.info(text)
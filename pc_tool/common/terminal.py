@@ -19,15 +19,11 @@ import sys
 import time
 import logging
 
-# Optional: lets ``event()`` recover the user's half-typed line so an
-# async event print can restore it.  Mirrors the fallback in parser.py.
-try:
-    import readline
-except ImportError:
-    try:
-        import pyreadline3 as readline
-    except ImportError:
-        readline = None
+# ``event()`` recovers the user's half-typed line from readline so an async
+# event print can restore it.  Only the interactive prompt (parser.CLIHistory)
+# imports readline; if it is not loaded, nobody is typing at a prompt.
+def _readline():
+    return sys.modules.get("readline") or sys.modules.get("pyreadline3")
 
 
 # Fixed box width for the packet view.  Avoids a syscall
@@ -145,18 +141,23 @@ class _TerminalPrinter:
             # prompt; recover it so we can redraw it after the event.
             # Without this, \033[K wipes it from the screen while readline
             # keeps it in its buffer, and the two desync on the next key.
+            readline = _readline()
             buf = readline.get_line_buffer() if readline else ""
             sys.stdout.write(f"\r\033[K{msg}\n> {buf}")
             sys.stdout.flush()
         self._log_mirror(logging.INFO, f"[event] {msg}")
 
     # Packet pretty-print
-    def packet(self, cmd_packet, raw: bytes | None = None) -> None:
-        """Render a CommandPacket as a labelled box.
+    def packet(self, cmd_packet, raw: bytes | None = None, label: str | None = None) -> None:
+        """Render a CommandPacket (or PacketView) as a labelled box.
 
+        A ``PacketView`` carries its own bytes, so *raw* defaults to them.
+        *label* (an ELF symbol, ``counter+0x2``) is shown next to the address.
         The whole output is built once and written in a single
         ``sys.stdout.write`` call to minimise syscalls.
         """
+        if raw is None:
+            raw = getattr(cmd_packet, "raw", None)
         # Imported lazily to keep this module dependency-light
         from pc_tool.common.enums import MDTFlags, CommandId
 
@@ -209,7 +210,7 @@ class _TerminalPrinter:
             f"│  Flags    : {flags_field}",
             f"│  Sequence : {cmd_packet.seq}",
             f"│  Mem ID   : {mem_field}",
-            f"│  Address  : 0x{cmd_packet.address:08X}",
+            f"│  Address  : 0x{cmd_packet.address:08X}" + (f"  <{label}>" if label else ""),
             f"│  Length   : {length_field}",
             f"│  Data     : {data_hex}",
             f"│  CRC      : {crc_field}",
@@ -0,0 +1,268 @@
+import atexit
+import struct
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from pathlib import Path
+from typing import Iterator, NamedTuple
+
+from pc_tool.common.enums import MDT_PACKET_SIZE
+from pc_tool.common.logger import MDTLogger
+
+# Layout (little-endian; header, block headers, records and entries are 32 bytes):
+#
+#   header   magic, version, record size, start wall clock and monotonic ns
+#   DATA     block header + ``count`` records of one frame each
+#   INDX     block header + ``count`` entries locating the DATA blocks
+#            written since the previous INDX (whose offset is ``prev``)
+#   trailer  magic + offset of the last INDX; only present after close()
+#
+# A trace cut short (crash, os._exit) has no trailer; the reader then
+# walks the DATA block headers instead and drops a torn last block.
+TRACE_MAGIC   = b"MDTTRACE"
+TRACE_VERSION = 1
+
+_HEADER  = struct.Struct("<8sHHIqq")            # magic, version, record size, flags, wall ns, mono ns
+_BLOCK   = struct.Struct("<4sIqqq")             # kind, count, first ns, last ns, prev INDX (-1)
+_RECORD  = struct.Struct(f"<qB{MDT_PACKET_SIZE}s5x")  # monotonic ns, direction, frame
+_ENTRY   = struct.Struct("<qqqI4x")             # DATA offset, first ns, last ns, records
+_TRAILER = struct.Struct("<8sq")
+_TRAILER_MAGIC = b"MDTTREND"
+_DATA, _INDX   = b"DATA", b"INDX"
+
+BLOCK_RECORDS  = 256    # frames per DATA block
+INDEX_EVERY    = 16     # DATA blocks per INDX block
+FLUSH_INTERVAL = 0.25   # seconds a frame may wait in memory before it is written
+
+
+class TraceDirection(IntEnum):
+    TX = 0  # PC -> MCU
+    RX = 1  # MCU -> PC
+
+
+class TraceRecord(NamedTuple):
+    time_ns:   int              # monotonic ns since the trace started
+    direction: TraceDirection
+    frame:     bytes
+
+
+class TraceBlock(NamedTuple):
+    offset:   int
+    first_ns: int
+    last_ns:  int
+    count:    int
+
+
+class TraceWriter:
+    """Appends every frame crossing the link to a binary trace file.
+
+    ``record`` only timestamps the frame and appends it to a deque, so it
+    is cheap enough for ``send_packet`` / ``read_packet``.  A daemon thread
+    packs pending frames into DATA blocks every ``FLUSH_INTERVAL`` seconds
+    (sooner once a block's worth is waiting), adds an INDX block every
+    ``INDEX_EVERY`` data blocks and flushes the file.  ``close`` (also
+    run at interpreter exit) writes the rest, a final index and the
+    trailer.
+
+    Usage::
+
+        trace = TraceWriter("session.mdtrace")
+        serial_link.trace = trace
+        ...
+        trace.close()
+    """
+
+    def __init__(self, path: str | Path, block_records: int = BLOCK_RECORDS,
+                 index_every: int = INDEX_EVERY, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path           = Path(path)
+        self.block_records  = block_records
+        self.index_every    = index_every
+        self.flush_interval = flush_interval
+        self.records        = 0
+        self.started_ns     = time.monotonic_ns()
+        self._pending: deque = deque()
+        self._unindexed: list[TraceBlock] = []
+        self._last_index = -1
+        self._wake   = threading.Event()
+        self._closed = False
+        self._lock   = threading.Lock()     # serialises block writes (thread vs close)
+
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, _RECORD.size, 0,
+                                      time.time_ns(), self.started_ns))
+        self._thread = threading.Thread(target=self._run, name="trace-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record(self, direction: TraceDirection, frame: bytes) -> None:
+        """Queue one frame; never blocks on the file."""
+        if self._closed:
+            return
+        self._pending.append((time.monotonic_ns(), direction, bytes(frame)))
+        if len(self._pending) >= self.block_records:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._write_pending()
+            except (OSError, ValueError) as exc:
+                MDTLogger.error(f"[Trace] Writing {self.path} failed: {exc}")
+                self._closed = True
+
+    def _write_pending(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            while self._pending:
+                batch = [self._pending.popleft()
+                         for _ in range(min(self.block_records, len(self._pending)))]
+                self._write_data(batch)
+            self._file.flush()
+
+    def _write_data(self, batch: list[tuple[int, int, bytes]]) -> None:
+        offset = self._file.tell()
+        first, last = batch[0][0] - self.started_ns, batch[-1][0] - self.started_ns
+        out = bytearray(_BLOCK.pack(_DATA, len(batch), first, last, -1))
+        for ts, direction, frame in batch:
+            out += _RECORD.pack(ts - self.started_ns, direction, frame)
+        self._file.write(out)
+        self.records += len(batch)
+        self._unindexed.append(TraceBlock(offset, first, last, len(batch)))
+        if len(self._unindexed) >= self.index_every:
+            self._write_index()
+
+    def _write_index(self) -> None:
+        blocks = self._unindexed
+        offset = self._file.tell()
+        out = bytearray(_BLOCK.pack(_INDX, len(blocks), blocks[0].first_ns, blocks[-1].last_ns,
+                                    self._last_index))
+        for b in blocks:
+            out += _ENTRY.pack(b.offset, b.first_ns, b.last_ns, b.count)
+        self._file.write(out)
+        self._last_index = offset
+        self._unindexed  = []
+
+    def close(self) -> None:
+        if self._closed and self._file.closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        atexit.unregister(self.close)
+        with self._lock:
+            if self._file.closed:
+                return
+            while self._pending:
+                batch = [self._pending.popleft()
+                         for _ in range(min(self.block_records, len(self._pending)))]
+                self._write_data(batch)
+            if self._unindexed:
+                self._write_index()
+            self._file.write(_TRAILER.pack(_TRAILER_MAGIC, self._last_index))
+            self._file.close()
+        MDTLogger.info(f"Trace: {self.records} frame(s) written to {self.path}")
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader:
+    """Reads a trace written by ``TraceWriter``, complete or cut short.
+
+    ``blocks()`` comes from the INDX chain when the trailer is there and
+    from a scan of the DATA block headers otherwise; ``records`` reads
+    only the blocks overlapping the requested time window.
+
+    Usage::
+
+        trace = TraceReader("session.mdtrace")
+        for rec in trace.records(start_ns=0, end_ns=2_000_000_000):
+            ...
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise ValueError(f"{self.path}: not an MCU-MDT trace (too short)")
+        magic, version, record_size, _, self.wall_ns, self.started_ns = _HEADER.unpack(head)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"{self.path}: not an MCU-MDT trace")
+        if version != TRACE_VERSION or record_size != _RECORD.size:
+            raise ValueError(f"{self.path}: unsupported trace version {version}")
+        self.complete = False
+        self._blocks: list[TraceBlock] | None = None
+
+    def blocks(self) -> list[TraceBlock]:
+        if self._blocks is None:
+            with open(self.path, "rb") as f:
+                self._blocks = self._from_index(f)
+                if self._blocks is None:
+                    self._blocks = self._scan(f)
+        return self._blocks
+
+    def _from_index(self, f) -> list[TraceBlock] | None:
+        size = f.seek(0, 2)
+        if size < _HEADER.size + _TRAILER.size:
+            return None
+        f.seek(size - _TRAILER.size)
+        magic, offset = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic != _TRAILER_MAGIC:
+            return None
+        blocks = []
+        while offset >= 0:
+            f.seek(offset)
+            kind, count, _, _, prev = _BLOCK.unpack(f.read(_BLOCK.size))
+            if kind != _INDX:
+                return None
+            raw = f.read(count * _ENTRY.size)
+            blocks[:0] = [TraceBlock(*e) for e in _ENTRY.iter_unpack(raw)]
+            offset = prev
+        self.complete = True
+        return blocks
+
+    @staticmethod
+    def _scan(f) -> list[TraceBlock]:
+        size   = f.seek(0, 2)
+        offset = _HEADER.size
+        blocks = []
+        while offset + _BLOCK.size <= size:
+            f.seek(offset)
+            kind, count, first, last, _ = _BLOCK.unpack(f.read(_BLOCK.size))
+            width = _RECORD.size if kind == _DATA else _ENTRY.size
+            end   = offset + _BLOCK.size + count * width
+            if kind not in (_DATA, _INDX) or end > size:
+                break           # torn block at the end of an interrupted trace
+            if kind == _DATA:
+                blocks.append(TraceBlock(offset, first, last, count))
+            offset = end
+        return blocks
+
+    def __len__(self) -> int:
+        return sum(b.count for b in self.blocks())
+
+    @property
+    def duration_ns(self) -> int:
+        blocks = self.blocks()
+        return blocks[-1].last_ns if blocks else 0
+
+    def records(self, start_ns: int | None = None, end_ns: int | None = None) -> Iterator[TraceRecord]:
+        """Frames in recording order, optionally only those with start_ns <= time_ns <= end_ns."""
+        with open(self.path, "rb") as f:
+            for block in self.blocks():
+                if (start_ns is not None and block.last_ns < start_ns) or \
+                   (end_ns is not None and block.first_ns > end_ns):
+                    continue
+                f.seek(block.offset + _BLOCK.size)
+                for ts, direction, frame in _RECORD.iter_unpack(f.read(block.count * _RECORD.size)):
+                    if (start_ns is None or ts >= start_ns) and (end_ns is None or ts <= end_ns):
+                        yield TraceRecord(ts, TraceDirection(direction), frame)
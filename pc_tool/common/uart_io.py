@@ -1,12 +1,20 @@
 import os
+import io
 import queue
+import selectors
 import time
-import serial
 
 from pc_tool.common.enums import MDT_PACKET_SIZE, FenceType
+from pc_tool.common.event_buffer import EVENT_BUFFER_CAPACITY, CoalescedEvent, EventBuffer
 from pc_tool.common.logger import MDTLogger
+from pc_tool.common.ring_buffer import RxRingBuffer
+from pc_tool.common.trace import TraceDirection
 
-_START_BYTE = FenceType.START_BYTE.to_bytes(1, "little")
+_RX_CAPACITY = 4096  # bytes buffered on the PC side between read_packet calls
+
+# A board that did not reset on open echoes the startup ping within this long
+_RESET_PROBE  = 0.25  # seconds
+_SYNC_TIMEOUT = 5.0  # seconds
 
 
 class MCUSerialLink:
@@ -18,6 +26,7 @@ class MCUSerialLink:
         timeout: float = 1.0,
         reset_delay: float = 2.0,
         startup_ping: bytes | None = None,
+        event_capacity: int = EVENT_BUFFER_CAPACITY,
     ) -> None:
         self.port          = port
         self.baudrate      = baudrate
@@ -26,15 +35,20 @@ class MCUSerialLink:
         self.startup_ping  = startup_ping
         self.running       = True
         self.response_queue = queue.Queue()
-        self.event_queue    = queue.Queue()
-        self._rx_buf       = bytearray()
+        self.event_queue    = EventBuffer(event_capacity)
+        self._rx_buf       = RxRingBuffer(_RX_CAPACITY)
+        self._selector     = None
         self.ser           = None
+        self.trace         = None   # TraceWriter recording every frame sent and received
 
     # Lifecycle
-    def open(self) -> None:
+    def open(self, sync: bool = True) -> None:
+        """Open the port; with *sync*, also wait for the MCU (see ``sync``)."""
         if self.ser is not None and self.ser.is_open:
             return
 
+        import serial  # pyserial costs ~15 ms to import; only a session needs it
+
         port = self._resolve_port(self.port)
 
         serial_kwargs = dict(
@@ -50,15 +64,47 @@ class MCUSerialLink:
             if port.startswith("socket://")
             else serial.Serial(port, **serial_kwargs)
         )
+        self._selector = self._make_selector(self.ser)
+        if self._selector is not None:
+            # The selector does the waiting; reads only drain what has arrived.
+            self.ser.timeout = 0
+
+        if sync:
+            self.sync()
+
+    def sync(self) -> None:
+        """Wait until the MCU is up, sleeping ``reset_delay`` only if opening the port reset it.
+
+        Opening a USB-serial port with DTR wired to RESET (Arduino boards)
+        restarts the MCU; ST-Link VCPs and ``socket://`` simulators do not.
+        The startup ping is tried first for ``_RESET_PROBE`` seconds: an echo
+        means the firmware is already running and the delay is skipped.
+        Without a startup ping the delay is always served, except on
+        ``socket://`` URLs, which have no reset line.
+        """
+        if not self.startup_ping:
+            if self.reset_delay > 0 and not str(self.port).startswith("socket://"):
+                time.sleep(self.reset_delay)
+            return
 
-        if self.reset_delay > 0:
-            time.sleep(self.reset_delay)
+        start = time.monotonic()
+        if self._synch_with_mcu(timeout=_RESET_PROBE, quiet=True):
+            return
 
-        if self.startup_ping:
-            self._synch_with_mcu()
+        remaining = self.reset_delay - (time.monotonic() - start)
+        if remaining > 0:
+            MDTLogger.info(f"No answer from the MCU; waiting {remaining:.1f}s for it to come out of reset.")
+            time.sleep(remaining)
+        self._synch_with_mcu()
 
     def close(self) -> None:
         self.running = False
+        if self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
         if self.ser:
             try:
                 self.ser.reset_input_buffer()
@@ -87,33 +133,82 @@ class MCUSerialLink:
             if os.path.exists(port):
                 return port
 
+        import serial
         raise serial.SerialException(
             f"Port '{port}' did not appear within {wait:.0f}s. "
             f"Check the board is connected and the port is correct "
             f"(e.g. /dev/ttyUSB0 or /dev/ttyACM0)"
         )
 
-    def _synch_with_mcu(self) -> None:
-        """Send the startup ping and wait for it to be echoed back, confirming that the MCU is responsive."""
+    @staticmethod
+    def _make_selector(ser) -> selectors.BaseSelector | None:
+        """Register the port's file descriptor for read readiness.
+
+        Works for POSIX ttys/ptys and ``socket://`` URLs, which both expose
+        ``fileno()``.  Returns None when the handle cannot be polled
+        (Windows COM ports); ``_fill_rx`` then blocks in ``read()``.
+        """
+        try:
+            fd  = ser.fileno()
+            sel = selectors.DefaultSelector()
+            sel.register(fd, selectors.EVENT_READ)
+            return sel
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
+
+    def _fill_rx(self, timeout: float) -> int:
+        """Sleep until bytes arrive or *timeout* expires, then move them into ``_rx_buf``.
+
+        Returns the number of bytes added (0 on timeout).  Never spins: the
+        thread is parked in ``select``/``read`` for the whole wait.  With a
+        selector the port calls ``readinto`` straight into the ring buffer.
+        """
+        timeout = max(timeout, 0.0)
+
+        if self._selector is not None:
+            if not self._selector.select(timeout):
+                return 0
+            return self._rx_buf.fill(self.ser.readinto)
+
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+        data = self.ser.read(1)
+        if data and self.ser.in_waiting:
+            data += self.ser.read(self.ser.in_waiting)
+        return self._rx_buf.write(data) if data else 0
+
+    def _synch_with_mcu(self, timeout: float = _SYNC_TIMEOUT, quiet: bool = False) -> bool:
+        """Send the startup ping and wait for it to be echoed back, confirming that the MCU is responsive.
+
+        Returns True on a full echo.  *quiet* skips the mismatch warning
+        (used for the reset probe, where silence is expected).
+        """
         self.ser.reset_input_buffer()
         self.ser.reset_output_buffer()
         self.ser.write(self.startup_ping)
         self.ser.flush()
 
-        echoed   = bytearray()
-        deadline = time.monotonic() + 5.0
+        self._rx_buf.clear()
+        deadline = time.monotonic() + timeout
 
-        while len(echoed) < MDT_PACKET_SIZE and time.monotonic() < deadline:
-            if self.ser.in_waiting:
-                echoed += self.ser.read(self.ser.in_waiting)
+        while len(self._rx_buf) < MDT_PACKET_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._fill_rx(remaining)
 
-        if len(echoed) < MDT_PACKET_SIZE:
-            MDTLogger.warning(
-                f"Startup ping echo mismatch: expected {MDT_PACKET_SIZE}, got {len(echoed)}."
-            )
-            return
+        echoed = len(self._rx_buf)
+        self._rx_buf.clear()  # the echo is not a response anyone waits for
+
+        if echoed < MDT_PACKET_SIZE:
+            if not quiet:
+                MDTLogger.warning(
+                    f"Startup ping echo mismatch: expected {MDT_PACKET_SIZE}, got {echoed}."
+                )
+            return False
 
         MDTLogger.info("Startup ping successful — MCU is connected.")
+        return True
 
     # I/O
     def send_packet(self, packet: bytes) -> None:
@@ -121,32 +216,40 @@ class MCUSerialLink:
             raise RuntimeError("Serial port is not open.")
         self.ser.write(packet)
         self.ser.flush()
+        if self.trace is not None:
+            self.trace.record(TraceDirection.TX, packet)
 
     def read_packet(self, timeout: float = 1.0) -> bytes | None:
-        """Read one full MDT packet from UART, resyncing on the start byte if needed."""
+        """Read one full MDT packet from UART, resyncing on the start byte if needed.
+
+        Resync and frame extraction only move the ring buffer's cursors; the
+        one copy is the ``bytes`` object handed to the caller, which has to
+        outlive the buffer slot because it is queued across threads.
+        """
         if self.ser is None or not self.ser.is_open:
             return None
 
+        rx       = self._rx_buf
         deadline = time.monotonic() + timeout
 
-        while time.monotonic() < deadline:
-            if self.ser.in_waiting:
-                self._rx_buf += self.ser.read(self.ser.in_waiting)
-
-            idx = self._rx_buf.find(_START_BYTE)
+        while True:
+            idx = rx.find(FenceType.START_BYTE)
             if idx == -1:
-                self._rx_buf.clear()
-                continue
-
-            if idx > 0:
-                self._rx_buf = self._rx_buf[idx:]
-
-            if len(self._rx_buf) >= MDT_PACKET_SIZE:
-                pkt          = bytes(self._rx_buf[:MDT_PACKET_SIZE])
-                self._rx_buf = self._rx_buf[MDT_PACKET_SIZE:]
+                rx.clear()
+            elif idx > 0:
+                rx.consume(idx)
+
+            if len(rx) >= MDT_PACKET_SIZE:
+                pkt = bytes(rx.frame(MDT_PACKET_SIZE))
+                rx.consume(MDT_PACKET_SIZE)
+                if self.trace is not None:
+                    self.trace.record(TraceDirection.RX, pkt)
                 return pkt
 
-        return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._fill_rx(remaining)
 
     # Queue management
     def get_response_packet(self, timeout: float = 1.0) -> bytes | None:
@@ -156,13 +259,17 @@ class MCUSerialLink:
             return None
 
     def get_event_packet(self, timeout: float = 1.0) -> bytes | None:
-        try:
-            return self.event_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+        """Latest packet of the next pending event (repeats folded into it are skipped)."""
+        entry = self.event_queue.get(timeout=timeout)
+        return entry.last if entry is not None else None
+
+    def get_events(self, timeout: float = 1.0) -> list[CoalescedEvent]:
+        """Every pending event, once at least one arrives within *timeout*."""
+        return self.event_queue.drain(timeout=timeout)
 
     def push_back_packet(self, pkt: bytes) -> None:
         self.response_queue.put(pkt)
 
-    def push_back_event_packet(self, pkt: bytes) -> None:
-        self.event_queue.put(pkt)
\ No newline at end of file
+    def push_back_event_packet(self, pkt: bytes, coalesce: bool = True) -> bool:
+        """Queue an event packet; False if the event buffer was full and it was dropped."""
+        return self.event_queue.put(pkt, coalesce=coalesce)
\ No newline at end of file
@@ -0,0 +1,270 @@
+from __future__ import annotations
+import argparse
+import fnmatch
+import json
+import os
+import re
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+
+from pc_tool.common.enums import MCUPlatforms
+from pc_tool.common.logger import MDTLogger
+
+# Shipped next to the database; regenerate with `mcu-mdt-db index`
+INDEX_FILE    = "index.json"
+INDEX_VERSION = 1
+
+_DB_ROOT: Path = Path(__file__).parent / "mcu_db"
+
+# The <device> tag sits in the first few KB of every ATDF; no need to parse the file
+_ATDF_HEAD   = 8192
+_ATDF_DEVICE = re.compile(r'<device\s+name="([^"]+)"([^>]*)>')
+_ATDF_ATTR   = re.compile(r'(\w+)="([^"]*)"')
+_ATDF_ORDER  = re.compile(r'<variant\s[^>]*ordercode="([^"]+)"')
+
+
+@dataclass(frozen=True)
+class DeviceEntry:
+    """One supported part and where its description lives in the database."""
+    part:     str            # normalised part number: atmega328p, stm32f103x8
+    platform: str            # MCUPlatforms value
+    path:     str            # database file, relative to the database root (posix)
+    core:     str | None     # AVR8, cortex-m3, ...
+    family:   str | None     # megaAVR, f103, ...
+    variant:  str | None = None   # key in the SVD's memory YAML (STM32 only)
+    flash:    int | None = None
+    ram:      int | None = None
+
+
+def normalize_part(name: str) -> str:
+    """Lower-case a part number and drop whitespace, as every index key is stored."""
+    return "".join(str(name).split()).lower()
+
+
+class DeviceIndex:
+    """Part number -> ``DeviceEntry`` map for one database root.
+
+    Resolution is a dict lookup: exact part, then ordering code alias
+    (``ATmega328P-AU``), then for STM32 the ``stm32`` prefix and the
+    density class (``stm32f103c8`` -> ``stm32f103x8``).
+
+    Usage::
+
+        index = device_index()
+        entry = index.resolve("STM32F103C8")     # -> stm32f103x8, STM32F103.svd
+        names = [e.part for e in index.search("atmega32*")]
+    """
+
+    def __init__(self, db_root: str | Path, entries: list[DeviceEntry],
+                 aliases: dict[str, str] | None = None) -> None:
+        self.db_root  = Path(db_root)
+        self._entries = {e.part: e for e in entries}
+        self._aliases = aliases or {}
+        # STM32 family -> SVD entry, for parts whose memory variant is not listed
+        self._families: dict[str, DeviceEntry] = {}
+        for e in entries:
+            if e.platform == MCUPlatforms.STM:
+                self._families.setdefault(e.family, e)
+
+    # Construction
+    @classmethod
+    def build(cls, db_root: str | Path) -> DeviceIndex:
+        """Scan *db_root* and index every ATDF and SVD variant found."""
+        root    = Path(db_root)
+        entries: list[DeviceEntry] = []
+        aliases: dict[str, str]    = {}
+
+        for path in sorted(root.glob("**/*.atdf"), key=lambda p: p.as_posix().lower()):
+            entry, codes = cls._atdf_entry(root, path)
+            entries.append(entry)
+            aliases.update((normalize_part(code), entry.part) for code in codes)
+
+        for path in sorted(root.glob("**/*.svd"), key=lambda p: p.as_posix().lower()):
+            entries.extend(cls._svd_entries(root, path))
+
+        return cls(root, entries, aliases)
+
+    @staticmethod
+    def _atdf_entry(root: Path, path: Path) -> tuple[DeviceEntry, list[str]]:
+        with open(path, "r", encoding="utf-8", errors="replace") as fh:
+            head = fh.read(_ATDF_HEAD)
+        match = _ATDF_DEVICE.search(head)
+        attrs = dict(_ATDF_ATTR.findall(match.group(2))) if match else {}
+        part  = normalize_part(match.group(1) if match else path.stem)
+        entry = DeviceEntry(
+            part     = part,
+            platform = MCUPlatforms.AVR,
+            path     = path.relative_to(root).as_posix(),
+            core     = attrs.get("architecture"),
+            family   = attrs.get("family"),
+        )
+        return entry, _ATDF_ORDER.findall(head)
+
+    @staticmethod
+    def _svd_entries(root: Path, path: Path) -> list[DeviceEntry]:
+        """One entry per memory variant listed in the SVD's companion YAML."""
+        yaml_path = path.with_suffix(".yaml")
+        if not yaml_path.is_file():
+            return []
+        import yaml  # only a rebuild reads the YAMLs; lookups use index.json
+        with open(yaml_path, "r") as fh:
+            variants = (yaml.safe_load(fh) or {}).get("variants") or {}
+
+        return [
+            DeviceEntry(
+                part     = normalize_part(key),
+                platform = MCUPlatforms.STM,
+                path     = path.relative_to(root).as_posix(),
+                core     = path.parent.name,
+                family   = normalize_part(key)[5:9],
+                variant  = key,
+                flash    = (info or {}).get("flash"),
+                ram      = (info or {}).get("ram"),
+            )
+            for key, info in variants.items()
+        ]
+
+    @classmethod
+    def load(cls, db_root: str | Path) -> DeviceIndex:
+        """Read ``index.json`` from *db_root*; build the index in memory if it is missing or stale."""
+        path = Path(db_root) / INDEX_FILE
+        try:
+            with open(path, "r") as fh:
+                data = json.load(fh)
+            if data.get("version") == INDEX_VERSION:
+                return cls(db_root, [DeviceEntry(**e) for e in data["devices"]], data.get("aliases"))
+            MDTLogger.info(f"Device index {path} has an old format; rebuilding in memory")
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError, KeyError) as exc:
+            MDTLogger.warning(f"Ignoring unreadable device index {path}: {exc}")
+        return cls.build(db_root)
+
+    def save(self, path: str | Path | None = None) -> Path:
+        path = Path(path) if path else self.db_root / INDEX_FILE
+        data = {
+            "version": INDEX_VERSION,
+            "devices": [asdict(e) for e in self._entries.values()],
+            "aliases": dict(sorted(self._aliases.items())),
+        }
+        with open(path, "w") as fh:
+            json.dump(data, fh, indent=1)
+            fh.write("\n")
+        return path
+
+    # Queries
+    def resolve(self, name: str, platform: str | None = None) -> DeviceEntry | None:
+        """Return the entry for part *name*, or None if the database has no such part."""
+        key   = normalize_part(name)
+        keys  = [key, self._aliases.get(key)]
+        if platform in (None, MCUPlatforms.STM):
+            stm = key if key.startswith("stm32") else "stm32" + key
+            # Density class: replace the package letter after 'stm32' + family
+            keys += [stm, stm[:9] + "x" + stm[10:] if len(stm) > 10 else None]
+
+        for k in keys:
+            entry = self._entries.get(k) if k else None
+            if entry is not None and (platform is None or entry.platform == platform):
+                return entry
+
+        if platform in (None, MCUPlatforms.STM):
+            # Known family, unlisted part: the SVD applies, the memory sizes are unknown
+            entry = self._families.get(stm[5:9])
+            if entry is not None:
+                return replace(entry, part=stm, variant=None, flash=None, ram=None)
+        return None
+
+    def path_of(self, entry: DeviceEntry) -> str:
+        return str(self.db_root / entry.path)
+
+    def list_devices(self, platform: str | None = None) -> list[DeviceEntry]:
+        return [e for e in self._entries.values() if platform is None or e.platform == platform]
+
+    def search(self, pattern: str, platform: str | None = None) -> list[DeviceEntry]:
+        """Entries whose part (or an ordering code) matches *pattern*.
+
+        A pattern with ``*``/``?`` is a glob; anything else is a substring.
+        """
+        pat = normalize_part(pattern)
+        if not any(c in pat for c in "*?["):
+            pat = f"*{pat}*"
+        parts = {p for p in self._entries if fnmatch.fnmatchcase(p, pat)}
+        parts.update(part for code, part in self._aliases.items() if fnmatch.fnmatchcase(code, pat))
+        return [e for e in self.list_devices(platform) if e.part in parts]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+
+_INDEXES: dict[str, DeviceIndex] = {}
+
+def device_index(db_root: str | Path | None = None, rebuild: bool = False) -> DeviceIndex:
+    """Return the (memoised) index for *db_root*, the bundled database by default.
+
+    *rebuild* rescans the tree, for when a lookup in the shipped index
+    misses or points at a file that has gone.
+    """
+    root = str(db_root or _DB_ROOT)
+    if rebuild or root not in _INDEXES:
+        _INDEXES[root] = DeviceIndex.build(root) if rebuild else DeviceIndex.load(root)
+    return _INDEXES[root]
+
+
+def find_device_file(mcu_name: str, platform: str, db_root: str | Path) -> str:
+    """Database file describing *mcu_name*; raises FileNotFoundError if there is none."""
+    for rebuild in (False, True):
+        index = device_index(db_root, rebuild=rebuild)
+        entry = index.resolve(mcu_name, platform)
+        if entry is not None and os.path.isfile(index.path_of(entry)):
+            return index.path_of(entry)
+    kind = "ATDF" if platform == MCUPlatforms.AVR else "SVD"
+    raise FileNotFoundError(f"{kind} file for MCU '{mcu_name}' not found in {db_root}")
+
+
+# Command line: mcu-mdt-db
+def _format(entry: DeviceEntry) -> str:
+    size = f"flash={entry.flash} ram={entry.ram}" if entry.flash else ""
+    return f"{entry.part:<20} {entry.platform:<6} {entry.core or '-':<10} {entry.family or '-':<10} {size}"
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="mcu-mdt-db", description="MCU-MDT device database tools")
+    sub    = parser.add_subparsers(dest="cmd", required=True)
+
+    p_list = sub.add_parser("list", help="List supported parts")
+    p_find = sub.add_parser("search", help="Find parts by substring or glob")
+    p_find.add_argument("pattern")
+    for p in (p_list, p_find):
+        p.add_argument("--platform", choices=[MCUPlatforms.AVR, MCUPlatforms.STM])
+        p.add_argument("--names", action="store_true", help="Part numbers only (for shell completion)")
+
+    p_index = sub.add_parser("index", help=f"Regenerate {INDEX_FILE} in the database root")
+    p_build = sub.add_parser("build", help="Compile every ATDF/SVD into one memory-mapped bundle")
+    p_build.add_argument("--output", default=None, help="Bundle path (default: devices.mdtb in the database root)")
+    for p in (p_index, p_build):
+        p.add_argument("--db", default=str(_DB_ROOT), help="Database root")
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "index":
+        index = DeviceIndex.build(args.db)
+        print(f"Indexed {len(index)} device(s) -> {index.save()}")
+        return 0
+
+    if args.cmd == "build":
+        from pc_tool.loader import compile_bundle   # the loader imports this module
+        path = compile_bundle(args.db, args.output)
+        print(f"Compiled {args.db} -> {path} ({path.stat().st_size / 1e6:.1f} MB)")
+        return 0
+
+    index   = device_index()
+    entries = index.list_devices(args.platform) if args.cmd == "list" else index.search(args.pattern, args.platform)
+    for entry in entries:
+        print(entry.part if args.names else _format(entry))
+    return 0 if entries else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
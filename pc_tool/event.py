@@ -2,20 +2,31 @@ import os
 import time
 import threading
 
-from pc_tool.common.enums import MDTFlags, MDTOffset, EventType
-from pc_tool.common.protocol import serialize_command_packet
+from pc_tool.common.enums import EventType
+from pc_tool.common.protocol import serialize_command_packet, PacketView
 from pc_tool.common.dataclasses import Command
 from pc_tool.common.logger import MDTLogger
+from pc_tool.common.poll_scheduler import PollScheduler
 from pc_tool.common.terminal import Terminal
 
-EVENT_POLL_INTERVAL = 0.5  # seconds
+EVENT_POLL_INTERVAL = 0.5  # seconds; fixed poll period of the asyncio fleet links
 
 _RX_ERROR_BACKOFF          = 0.5   # seconds to wait after a recoverable RX error
 _RX_MAX_CONSECUTIVE_ERRORS = 10    # stop the reader after this many errors in a row
 
+# Minimum gap between two event printouts; events arriving meanwhile are
+# coalesced in the link's EventBuffer and printed together.
+_EVENT_REDRAW_INTERVAL = 0.05  # seconds
+
 _POLL_COMMAND = Command(name="POLL", id=0x00, mem=None, address=0, data=None)
 _POLL_PACKET  = serialize_command_packet(_POLL_COMMAND, seq=0, multi=False, last=False)
 
+# The target ran code the PC did not see; cached memory can no longer be trusted
+_INVALIDATING_EVENTS = (
+    EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT,
+    EventType.INTERNAL_MDT_EVENT_WATCHPOINT_HIT,
+)
+
 
 class EventHandler:
     """Manages the background threads that read packets from UART and dispatch events.
@@ -28,49 +39,46 @@ class EventHandler:
         # threads are daemon threads; they die with the process
     """
 
-    def __init__(self, serial_link, uart_idle: bool = False) -> None:
+    def __init__(self, serial_link, uart_idle: bool = False, shadow=None,
+                 symbols=None, watches=None, poll: PollScheduler | None = None) -> None:
         self._link      = serial_link
         self._uart_idle = uart_idle
+        self._shadow    = shadow    # ShadowMemory dropped on breakpoint/watchpoint hits
+        self._symbols   = symbols   # SymbolTable naming watched addresses
+        self._watches   = watches   # Commander.watches: slot -> watched address
+        self._poll      = poll if poll is not None else PollScheduler()  # shared with Commander
 
     # Packet parsing
     @staticmethod
-    def _is_event(pkt: bytes) -> bool:
+    def _is_event(view: PacketView) -> bool:
         """Identify if a packet is an event packet based on CMD_ID and FLAGS."""
-        return (
-            pkt[MDTOffset.CMD_ID] == 0
-            and bool(pkt[MDTOffset.FLAGS] & MDTFlags.EVENT_PACKET)
-        )
+        return view.is_event
 
     @staticmethod
-    def _is_clean_poll_ack(pkt: bytes) -> bool:
+    def _is_clean_poll_ack(view: PacketView) -> bool:
         """Identify if a packet is a clean ACK to the poll command, with no events."""
-        flags = pkt[MDTOffset.FLAGS]
-        return (
-            pkt[MDTOffset.CMD_ID] == 0
-            and bool(flags & MDTFlags.ACK_NACK)
-            and not bool(flags & MDTFlags.STATUS_ERROR)
-        )
+        return view.cmd_id == 0 and view.is_ack and not view.is_error
 
     # Formatting event packets
     @staticmethod
-    def _parse_event_fields(pkt: bytes) -> tuple[int, int, int, int, int]:
+    def _parse_event_fields(view: PacketView) -> tuple[int, int, int, int, int]:
         """Return (event_type, slot_id, address, length, data)."""
-        event_type = pkt[MDTOffset.MEM_ID]
-        slot_id    = pkt[MDTOffset.SEQ]
-        address    = int.from_bytes(pkt[MDTOffset.ADDRESS : MDTOffset.ADDRESS + 4], "little")
-        length     = int.from_bytes(pkt[MDTOffset.LENGTH  : MDTOffset.LENGTH  + 2], "little")
-        data       = int.from_bytes(pkt[MDTOffset.DATA    : MDTOffset.DATA    + 4], "little")
-        return event_type, slot_id, address, length, data
+        return view.mem_byte, view.seq, view.address, view.length, view.data_word
 
     @staticmethod
-    def _format_event(ev: EventType, slot_id: int, address: int, length: int, data: int) -> str:
-        """Format an event packet into a human-readable string based on its type."""
+    def _format_event(ev: EventType, slot_id: int, address: int, length: int, data: int,
+                      where: str | None = None) -> str:
+        """Format an event packet into a human-readable string based on its type.
+
+        *where* names the watched location of a watchpoint hit, when known.
+        """
         if ev == EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT:
             return f"[Event] {ev.name} (slot={slot_id}, hit_count={data})"
         if ev == EventType.INTERNAL_MDT_EVENT_WATCHPOINT_HIT:
             return (
                 f"[Event] {ev.name} "
                 f"(slot={slot_id}, old=0x{address:08X}, new=0x{data:08X}, width={length})"
+                + (f" at {where}" if where else "")
             )
         # Generic fallback: BUFFER_OVERFLOW, FAILED_PACKET, future types
         return (
@@ -79,6 +87,14 @@ class EventHandler:
         )
 
 
+    def _watch_location(self, slot_id: int) -> str | None:
+        """``0x20000010 <counter>`` for a watchpoint slot the Commander armed, else None."""
+        addr = self._watches.get(slot_id) if self._watches is not None else None
+        if addr is None:
+            return None
+        name = self._symbols.describe(addr) if hasattr(self._symbols, "describe") else None
+        return f"0x{addr:08X}" + (f" <{name}>" if name else "")
+
     def _after_rx_error(self, exc: Exception, consecutive: int) -> int:
         """Log a recoverable RX error, back off, and stop the reader if errors persist."""
         consecutive += 1
@@ -108,9 +124,12 @@ class EventHandler:
                 if pkt is None:
                     continue
 
-                if self._is_event(pkt):
-                    self._link.push_back_event_packet(pkt)
-                elif self._is_clean_poll_ack(pkt):
+                view = PacketView(pkt)
+                if self._is_event(view):
+                    # Type/slot bytes of a corrupt packet are not trusted for coalescing
+                    self._link.push_back_event_packet(pkt, coalesce=view.valid)
+                    self._poll.on_event()
+                elif self._is_clean_poll_ack(view):
                     pass  # discard
                 else:
                     self._link.push_back_packet(pkt)
@@ -124,41 +143,101 @@ class EventHandler:
             except Exception as exc:
                 consecutive_errors = self._after_rx_error(exc, consecutive_errors)
 
+    def _format_entry(self, entry) -> tuple[EventType | None, str] | None:
+        """Format a ``CoalescedEvent``: the last event, plus the run length when repeated.
+
+        A repeated watchpoint hit reports the value before the first hit
+        and after the last one.  An event type this tool does not know is
+        printed generically, with ``None`` as its type.  Returns None for a
+        corrupt packet.
+        """
+        view = PacketView(entry.last)
+        if not view.valid:
+            MDTLogger.error(f"[Event Listener] Dropped corrupt event: {view.error}")
+            return None
+
+        event_type, slot_id, address, length, data = self._parse_event_fields(view)
+        try:
+            ev = EventType(event_type)
+        except ValueError:
+            ev  = None
+            msg = (
+                f"[Event] event {event_type} "
+                f"(slot={slot_id}, address=0x{address:08X}, length={length}, data=0x{data:08X})"
+            )
+        else:
+            where = None
+            if ev == EventType.INTERNAL_MDT_EVENT_WATCHPOINT_HIT:
+                where   = self._watch_location(slot_id)
+                address = PacketView(entry.first).address   # old value of the first hit
+            msg = self._format_event(ev, slot_id, address, length, data, where)
+        if entry.count > 1:
+            msg += f" x{entry.count} in {entry.span * 1000:.0f} ms"
+        return ev, msg
+
     def _event_listener(self) -> None:
-        """Consume event packets from the event queue and print them asynchronously."""
+        """Print pending events, at most one terminal redraw per ``_EVENT_REDRAW_INTERVAL``.
+
+        Each pass takes everything the event buffer holds, so an event storm
+        becomes a few coalesced lines instead of one prompt redraw per packet.
+        Events the full buffer had to drop are reported as a count.
+        """
+        reported_drops = 0
         while self._link.running:
             try:
-                pkt = self._link.get_event_packet(timeout=1.0)
-                if pkt is None:
+                entries = self._link.get_events(timeout=1.0)
+                if not entries:
                     continue
 
-                event_type, slot_id, address, length, data = self._parse_event_fields(pkt)
-                ev  = EventType(event_type)
-                msg = self._format_event(ev, slot_id, address, length, data)
-
-                Terminal.event(msg)
+                lines, invalidate = [], False
+                for entry in entries:
+                    # One bad entry must not cost the rest of the batch
+                    try:
+                        formatted = self._format_entry(entry)
+                    except Exception as exc:
+                        MDTLogger.error(f"[Event Listener] Dropped event {entry!r}: {exc}")
+                        continue
+                    if formatted is None:
+                        continue
+                    ev, msg = formatted
+                    invalidate = invalidate or ev in _INVALIDATING_EVENTS
+                    lines.append(msg)
+
+                dropped = self._link.event_queue.dropped
+                if dropped > reported_drops:
+                    lines.append(f"[Event] {dropped - reported_drops} event(s) dropped: event buffer full")
+                    reported_drops = dropped
+
+                if self._shadow is not None and invalidate:
+                    self._shadow.invalidate()
+
+                if lines:
+                    Terminal.event("\n".join(lines))
+                    time.sleep(_EVENT_REDRAW_INTERVAL)
 
             except Exception as exc:
                 if self._link.running:
                     MDTLogger.error(f"\n[Event Listener] {exc}\n> ", code=5)
 
     def _event_poll_worker(self) -> None:
-        """Send a CMD_ID=0 poll packet every ``EVENT_POLL_INTERVAL`` seconds.
+        """Send a CMD_ID=0 poll packet whenever the ``PollScheduler`` says so.
 
         The MCU fills the response with any pending event data and sets
         FLAG_EVENT if one is present.  ``rx_worker`` routes that response to
-        the event queue.  Sending is fire-and-forget; no response is consumed
-        here.
+        the event queue and tells the scheduler, which polls again quickly;
+        an idle target is polled less and less often, and not at all while
+        the Commander has packets in flight.  Sending is fire-and-forget; no
+        response is consumed here.
         """
         while self._link.running:
+            if not self._poll.wait(max_block=1.0):
+                continue
             try:
                 self._link.send_packet(_POLL_PACKET)
             except Exception as exc:
                 if self._link.running:
                     MDTLogger.error(f"\n[Poll Worker] {exc}\n> ", code=5)
 
-            time.sleep(EVENT_POLL_INTERVAL)
-
 
     def drain_stale_events(self, max_polls: int = 8,
                            per_poll_timeout: float = 0.2) -> int:
@@ -178,7 +257,7 @@ class EventHandler:
             if pkt is None:
                 break  # quiet on the wire -> queue is empty
 
-            if self._is_event(pkt):
+            if self._is_event(PacketView(pkt)):
                 MDTLogger.info(f"Dropped stale event at startup: {pkt.hex()}")
                 dropped += 1
                 continue
@@ -206,16 +285,21 @@ class EventHandler:
             poll_thread = threading.Thread(target=self._event_poll_worker, daemon=True)
             poll_thread.start()
             threads.append(poll_thread)
-            Terminal.info("UART idle interrupt mode — event poll thread started.")
+            Terminal.info(
+                f"UART idle interrupt mode — event poll thread started "
+                f"({self._poll.floor * 1000:.0f}-{self._poll.ceiling * 1000:.0f} ms)."
+            )
         else:
             Terminal.info("Poll mode — MCU drains events via mcu_mdt_poll(), no event poll thread needed.")
 
         return threads
 
 
-def start_async_handlers(serial_link, uart_idle: bool = False) -> list[threading.Thread]:
+def start_async_handlers(serial_link, uart_idle: bool = False, shadow=None,
+                         symbols=None, watches=None, poll=None) -> list[threading.Thread]:
     """Module-level shim to start event handlers, preserving existing call sites."""
-    return EventHandler(serial_link, uart_idle=uart_idle).start()
+    return EventHandler(serial_link, uart_idle=uart_idle, shadow=shadow,
+                        symbols=symbols, watches=watches, poll=poll).start()
 
 
 def drain_stale_events(serial_link, uart_idle: bool = False,
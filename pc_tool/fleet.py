@@ -0,0 +1,326 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+from pc_tool.commander import AsyncCommander
+from pc_tool.common.async_io import AsyncMCUSerialLink
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.enums import DEFAULT_TX_WINDOW, CommandId, EventType
+from pc_tool.common.logger import MDTLogger
+from pc_tool.common.protocol import serialize_command_packet
+from pc_tool.common.terminal import Terminal
+from pc_tool.event import EVENT_POLL_INTERVAL, EventHandler
+from pc_tool.loader import ConfigLoader, load_configs
+from pc_tool.parser import parse_line
+from pc_tool.validator import validate_commands
+
+# Commands that only make sense at an interactive prompt
+_PC_ONLY = ("EXIT", "HELP", "CLEAR")
+
+
+# Data model
+@dataclass
+class FleetTarget:
+    """One board in the fleet: where it is and which build_info describes it."""
+    name:       str
+    port:       str
+    build_info: str
+    baudrate:   int  = 19200
+    uart_idle:  bool = False
+    tx_window:  int  = DEFAULT_TX_WINDOW
+
+
+@dataclass
+class StepResult:
+    lineno:  int
+    line:    str
+    ok:      bool
+    elapsed: float
+    data:    bytes | None = None
+
+
+@dataclass
+class BoardResult:
+    target:    FleetTarget
+    ok:        bool        = False
+    open_time: float       = 0.0
+    run_time:  float       = 0.0
+    steps:     list[StepResult] = field(default_factory=list)
+    events:    int         = 0
+    error:     str | None  = None
+
+    def to_dict(self) -> dict:
+        return {
+            "name":      self.target.name,
+            "port":      self.target.port,
+            "ok":        self.ok,
+            "open_s":    round(self.open_time, 4),
+            "run_s":     round(self.run_time, 4),
+            "events":    self.events,
+            "error":     self.error,
+            "steps": [
+                {
+                    "line":    s.lineno,
+                    "command": s.line,
+                    "ok":      s.ok,
+                    "elapsed": round(s.elapsed, 4),
+                    "data":    s.data.hex() if s.data is not None else None,
+                }
+                for s in self.steps
+            ],
+        }
+
+
+@dataclass
+class FleetReport:
+    boards:     list[BoardResult]
+    total_time: float
+
+    @property
+    def failed(self) -> list[BoardResult]:
+        return [b for b in self.boards if not b.ok]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def lines(self) -> list[str]:
+        """Human-readable summary, one row per board."""
+        width = max([len(b.target.name) for b in self.boards] + [5])
+        rows  = [f"{'BOARD':<{width}}  STATUS  OPEN(s)  RUN(s)  STEPS    DETAIL"]
+        for b in self.boards:
+            passed = sum(s.ok for s in b.steps)
+            rows.append(
+                f"{b.target.name:<{width}}  {'PASS' if b.ok else 'FAIL':<6}  "
+                f"{b.open_time:>7.3f}  {b.run_time:>6.3f}  "
+                f"{f'{passed}/{len(b.steps)}':<7}  {b.error or ''}"
+            )
+        rows.append(
+            f"{len(self.boards) - len(self.failed)}/{len(self.boards)} board(s) passed "
+            f"in {self.total_time:.3f}s"
+        )
+        return rows
+
+    def to_dict(self) -> dict:
+        return {
+            "ok":      self.ok,
+            "total_s": round(self.total_time, 4),
+            "boards":  [b.to_dict() for b in self.boards],
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+# Target resolution
+def _is_build_info(entry: str) -> bool:
+    return entry.lower().endswith((".yaml", ".yml")) and os.path.isfile(entry)
+
+
+def resolve_targets(entries: list[str], template: str | None = None) -> list[FleetTarget]:
+    """Turn a list of build_info paths and/or ports into fleet targets.
+
+    A build_info entry brings its own port, baudrate, ``uart_idle`` and
+    ``tx_window``.  A bare port (``/dev/ttyUSB3``, ``socket://host:4000``)
+    borrows everything but the port from *template*, which is required in
+    that case.
+    """
+    targets: list[FleetTarget] = []
+    cache:   dict[str, dict]   = {}
+
+    def build_data(path: str) -> dict:
+        if path not in cache:
+            cache[path] = load_configs(path)
+        return cache[path]
+
+    for entry in entries:
+        if _is_build_info(entry):
+            path, data = entry, build_data(entry)
+            port = data["port"]
+        else:
+            if template is None:
+                raise ValueError(f"Port '{entry}' needs a template build_info.yaml for its MCU config.")
+            path, data, port = template, build_data(template), entry
+
+        targets.append(FleetTarget(
+            name       = f"{data.get('mcu', 'mcu')}@{port}",
+            port       = port,
+            build_info = path,
+            baudrate   = int(data.get("baudrate", 19200)),
+            uart_idle  = bool(data.get("uart_idle", False)),
+            tx_window  = int(data.get("tx_window", DEFAULT_TX_WINDOW)),
+        ))
+
+    return targets
+
+
+def read_script(script_path: str) -> list[tuple[int, str]]:
+    """Return the (line number, command) pairs of a script, skipping blanks and comments."""
+    with open(script_path, "r") as f:
+        return [
+            (lineno, line)
+            for lineno, raw in enumerate(f, start=1)
+            if (line := raw.strip()) and not line.startswith("#")
+        ]
+
+
+# Session
+class FleetSession:
+    """Run the same command list against many boards at once.
+
+    Every board gets its own ``AsyncMCUSerialLink`` and ``AsyncCommander``
+    on one event loop: links are opened in parallel, each board walks the
+    command list on its own, and a board that fails stops without holding
+    up the others (same stop-on-first-failure rule as ``run_script``).
+    Commands are parsed and validated once per distinct build_info before
+    any board is touched; a board whose script is rejected is never opened.
+
+    Usage::
+
+        session = FleetSession(resolve_targets(["a/build_info.yaml", "b/build_info.yaml"]))
+        report  = session.run(read_script("flash_and_verify.mdt"))
+    """
+
+    def __init__(self, targets: list[FleetTarget], reset_delay: float = 2.0) -> None:
+        self.targets     = targets
+        self.reset_delay = reset_delay
+        self._loaders: dict[str, ConfigLoader] = {}
+
+    def _loader(self, build_info: str) -> ConfigLoader:
+        if build_info not in self._loaders:
+            self._loaders[build_info] = ConfigLoader(build_info)
+        return self._loaders[build_info]
+
+    def _plan(self, build_info: str, lines: list[tuple[int, str]]) -> list[tuple[int, str, Command | None]]:
+        """Parse and validate *lines* for one build_info; None marks a rejected line."""
+        loader   = self._loader(build_info)
+        commands = loader.yaml_command_data["commands"]
+        control  = loader.yaml_command_data["control_values"]
+        metadata = loader.mcu_metadata
+        symbols  = loader.elf_symbols
+
+        plan = []
+        for lineno, line in lines:
+            command = parse_line(line, commands, control, metadata, symbols)
+            if command is not None and command.name in _PC_ONLY:
+                continue
+            if command is not None and command.name != "PING" and not validate_commands(command, metadata):
+                command = None
+            plan.append((lineno, line, command))
+        return plan
+
+    def run(self, lines: list[tuple[int, str]]) -> FleetReport:
+        """Blocking entry point: run *lines* on every target and return the report."""
+        build_infos = dict.fromkeys(t.build_info for t in self.targets)
+        plans       = {path: self._plan(path, lines) for path in build_infos}
+        return asyncio.run(self.run_async(plans))
+
+    async def run_async(self, plans: dict[str, list]) -> FleetReport:
+        start   = time.perf_counter()
+        results = await asyncio.gather(
+            *(self._run_board(t, plans[t.build_info]) for t in self.targets)
+        )
+        return FleetReport(boards=list(results), total_time=time.perf_counter() - start)
+
+    async def _run_board(self, target: FleetTarget, plan: list) -> BoardResult:
+        result = BoardResult(target=target)
+
+        # A script that does not parse/validate never touches the board
+        for lineno, line, command in plan:
+            if command is None:
+                result.steps.append(StepResult(lineno, line, False, 0.0))
+                result.error = f"line {lineno}: rejected by parser/validator"
+                return result
+
+        ping_id = self._loader(target.build_info).yaml_command_data["commands"]["PING"]["id"]
+        link = AsyncMCUSerialLink(
+            port          = target.port,
+            baudrate      = target.baudrate,
+            reset_delay   = self.reset_delay,
+            startup_ping  = serialize_command_packet(
+                Command(name="PING", id=ping_id, mem=None, address=0, data=None),
+                seq=0, multi=False, last=False,
+            ),
+            poll_interval = EVENT_POLL_INTERVAL if target.uart_idle else None,
+        )
+
+        t0 = time.perf_counter()
+        try:
+            await link.open()
+        except Exception as exc:
+            result.error = f"open failed: {exc}"
+            MDTLogger.error(f"[{target.name}] {result.error}", code=1)
+            return result
+        result.open_time = time.perf_counter() - t0
+
+        listener = asyncio.create_task(self._drain_events(target, link, result))
+        commander = AsyncCommander(link, window=target.tx_window)
+
+        t0 = time.perf_counter()
+        try:
+            result.ok = await self._run_plan(target, commander, plan, result)
+        except Exception as exc:
+            result.error = f"{type(exc).__name__}: {exc}"
+            MDTLogger.error(f"[{target.name}] {result.error}", code=5)
+        finally:
+            result.run_time = time.perf_counter() - t0
+            await link.close()
+            await listener
+
+        return result
+
+    @staticmethod
+    async def _run_plan(target: FleetTarget, commander: AsyncCommander,
+                        plan: list, result: BoardResult) -> bool:
+        for lineno, line, command in plan:
+            t0   = time.perf_counter()
+            data = None
+            if command.name == "PING":
+                ok = await commander.ping(command)
+            elif command.id in (CommandId.READ_MEM, CommandId.READ_REG):
+                data = await commander.read(command)
+                ok   = data is not None
+            else:
+                ok = await commander.write(command)
+
+            result.steps.append(StepResult(
+                lineno, line, ok, time.perf_counter() - t0,
+                bytes(data) if data is not None else None,
+            ))
+            MDTLogger.info(f"[{target.name}] [{lineno}] {line} -> {'ok' if ok else 'FAILED'}")
+            if not ok:
+                result.error = f"line {lineno}: {line}"
+                return False
+
+        return True
+
+    @staticmethod
+    async def _drain_events(target: FleetTarget, link: AsyncMCUSerialLink,
+                            result: BoardResult) -> None:
+        """Log events raised while the board runs; they do not fail the board."""
+        async for ev in link.events():
+            result.events += 1
+            event_type, slot_id, address, length, data = EventHandler._parse_event_fields(ev)
+            try:
+                msg = EventHandler._format_event(EventType(event_type), slot_id, address, length, data)
+            except ValueError:
+                msg = f"[Event] unknown type {event_type} (slot={slot_id})"
+            MDTLogger.info(f"[{target.name}] {msg}")
+
+
+def run_fleet(targets: list[FleetTarget], lines: list[tuple[int, str]],
+              report_path: str | None = None) -> FleetReport:
+    """Run *lines* on every target, print the summary and optionally save it as JSON."""
+    Terminal.info(f"Fleet: {len(targets)} target(s), {len(lines)} command(s).")
+    report = FleetSession(targets).run(lines)
+
+    for row in report.lines():
+        Terminal.info(row)
+    if report_path:
+        report.write_json(report_path)
+        MDTLogger.info(f"Fleet report written to {report_path}")
+
+    return report
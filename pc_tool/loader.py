@@ -2,30 +2,39 @@ from __future__ import annotations
 import os
 import re
 import xml.etree.ElementTree as ET
+import xml.parsers.expat
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from collections.abc import Mapping
 from typing import Iterator
 
-import yaml
-
 from pc_tool.common.enums import MCUPlatforms, STM32Type
-from pc_tool.common.elf_symbols import load_elf_symbols
+from pc_tool.common.elf_symbols import ELFSource, SymbolInfo, load_elf_symbols
+from pc_tool.common.elf_image import FirmwareImage, load_firmware_image
+from pc_tool.common import disk_cache
+from pc_tool.common.startup import StartupProfile
+from pc_tool.bundle import BUNDLE_FILE, BundleEntry, BundleSource, DeviceBundle, write_bundle
+from pc_tool.device_index import DeviceIndex, find_device_file
+from pc_tool.metadata import (
+    Bitfield, FrozenDict, LazyModules, MemorySegment, Register, RegisterGroup, Span,
+    cut_spans, scan_spans,
+)
 from pc_tool.common.logger import MDTLogger
 
 # Resolved at import time
 _DB_ROOT: Path = Path(__file__).parent / "mcu_db"
 
-# Shared data model
-@dataclass
-class MemorySegment:
-    name:     str
-    start:    int
-    size:     int
-    mem_type: str
-    pagesize: str | None = None
+# Bump whenever a platform loader changes what it produces; invalidates cached metadata
+METADATA_CACHE_VERSION = 4
 
+# Register table of an SVD peripheral without <registers>
+_NO_REGISTERS = FrozenDict()
 
+_SVD_BIT_RANGE = re.compile(r"\[(\d+):(\d+)\]")
+
+# Shared data model
 @dataclass
 class MCUMetadata:
     """Normalised MCU metadata produced by every platform loader."""
@@ -33,8 +42,8 @@ class MCUMetadata:
     architecture: str | None
     family:       str | None
     peripherals:  dict = field(default_factory=dict)
-    modules:      dict = field(default_factory=dict)
-    memories:     dict = field(default_factory=dict)
+    modules:      Mapping[str, dict] = field(default_factory=dict)   # LazyModules when lazy
+    memories:     dict[str, MemorySegment] = field(default_factory=dict)
     interrupts:   dict = field(default_factory=dict)
 
     def to_dict(self) -> dict:
@@ -55,19 +64,57 @@ class _PlatformLoader(ABC):
     """Strategy interface for per-platform MCU metadata parsers."""
 
     @abstractmethod
-    def load(self, mcu_name: str, db_root: str) -> MCUMetadata:
-        """Return an MCUMetadata for *mcu_name*, sourcing data from *db_root*."""
+    def load(self, mcu_name: str, db_root: str, lazy: bool = True) -> MCUMetadata:
+        """Return an MCUMetadata for *mcu_name*, sourcing data from *db_root*.
+
+        With *lazy*, ``modules`` is a ``LazyModules`` that parses each
+        module's registers on first access; otherwise a fully built dict.
+        """
+
+    @abstractmethod
+    def sources(self, mcu_name: str, db_root: str) -> list[str]:
+        """Return the files ``load`` reads for *mcu_name*; they key the metadata cache."""
+
+    @abstractmethod
+    def from_bundle(self, entry: BundleEntry, mcu_name: str, lazy: bool = True) -> MCUMetadata:
+        """Return what ``load`` would for *mcu_name*, decoded from its compiled bundle *entry*."""
+
+    @abstractmethod
+    def bundle_source(self, mcu_name: str, db_root: str) -> BundleSource:
+        """Parse the database file covering *mcu_name* for ``compile_bundle``."""
+
+    @staticmethod
+    def _bundled(entry: BundleEntry, device: str, lazy: bool) -> MCUMetadata:
+        meta = MCUMetadata(
+            device       = device,
+            architecture = entry.architecture,
+            family       = entry.family,
+            peripherals  = entry.peripherals(),
+            memories     = entry.memories(),
+            interrupts   = entry.interrupts(),
+        )
+        meta.modules = entry.modules()
+        if not lazy:
+            meta.modules = meta.modules.materialize()
+        return meta
 
 
 # ATDF (AVR) parser
 class _ATDFLoader(_PlatformLoader):
     """Parse Microchip ATDF files for AVR devices."""
 
-    def load(self, mcu_name: str, db_root: str) -> MCUMetadata:
-        """Load the ATDF file for *mcu_name* from *db_root* and parse it into MCUMetadata."""
+    def load(self, mcu_name: str, db_root: str, lazy: bool = True) -> MCUMetadata:
+        """Load the ATDF file for *mcu_name* from *db_root* and parse it into MCUMetadata.
+
+        One expat pass records where each ``<modules>/<module>`` lives; the
+        rest of the file (memories, interrupts, peripherals) is parsed
+        eagerly with the modules cut out.
+        """
         mcu_lower = mcu_name.lower()
         atdf_path = self._find_file(mcu_lower, db_root)
-        root      = self._parse_xml(atdf_path)
+        data      = Path(atdf_path).read_bytes()
+        modules   = _scan(data, atdf_path, "ATDF", ("avr-tools-device-file", "modules", "module"))
+        root      = self._parse_xml(atdf_path, cut_spans(data, [span for _, span in modules]))
         device    = self._validate_device(root, mcu_lower)
 
         meta = MCUMetadata(
@@ -77,28 +124,46 @@ class _ATDFLoader(_PlatformLoader):
         )
 
         self._parse_memories(root, meta)
-        self._parse_modules(root, meta)
         self._parse_interrupts(root, meta)
         self._parse_peripherals(root, meta)
+
+        entries = {attrs["name"]: (span, None) for attrs, span in modules if attrs.get("name")}
+        meta.modules = LazyModules(atdf_path, entries, _ATDFLoader._build_module)
+        if not lazy:
+            meta.modules = meta.modules.materialize()
         return meta
 
+    def sources(self, mcu_name: str, db_root: str) -> list[str]:
+        return [self._find_file(mcu_name.lower(), db_root)]
+
+    def from_bundle(self, entry: BundleEntry, mcu_name: str, lazy: bool = True) -> MCUMetadata:
+        mcu_lower = mcu_name.lower()
+        if entry.device != mcu_lower:
+            raise ValueError(
+                f"ATDF device mismatch: expected '{mcu_lower}', found '{entry.device}'"
+            )
+        return self._bundled(entry, mcu_lower, lazy)
+
+    def bundle_source(self, mcu_name: str, db_root: str) -> BundleSource:
+        sources = self.sources(mcu_name, db_root)
+        return BundleSource(
+            source   = _relative(sources[0], db_root),
+            platform = MCUPlatforms.AVR,
+            digest   = _bundle_digest(sources),
+            meta     = self.load(mcu_name, db_root, lazy=False),
+            variants = {},
+        )
+
     @staticmethod
     def _find_file(mcu_name: str, db_root: str) -> str:
-        """Search *db_root* recursively for an ATDF file matching *mcu_name* (case-insensitive)."""
-        for dirpath, _, files in os.walk(db_root):
-            for fname in files:
-                if fname.lower().endswith(".atdf") and \
-                        os.path.splitext(fname)[0].lower() == mcu_name:
-                    return os.path.join(dirpath, fname)
-        raise FileNotFoundError(
-            f"ATDF file for MCU '{mcu_name}' not found in {db_root}"
-        )
+        """Return the ATDF file for *mcu_name* via the device index."""
+        return find_device_file(mcu_name, MCUPlatforms.AVR, db_root)
 
     @staticmethod
-    def _parse_xml(path: str) -> ET.Element:
-        """Parse the ATDF XML file at *path* and return the root element."""
+    def _parse_xml(path: str, data: bytes) -> ET.Element:
+        """Parse ATDF XML *data* read from *path* and return the root element."""
         try:
-            return ET.parse(path).getroot()
+            return ET.fromstring(data)
         except ET.ParseError as exc:
             raise ValueError(f"Invalid ATDF XML in '{path}': {exc}") from exc
 
@@ -122,71 +187,67 @@ class _ATDFLoader(_PlatformLoader):
             name = mem.get("name")
             if not name:
                 continue
-            meta.memories[name] = {
-                "start":    int(mem.get("start", "0"), 0),
-                "size":     int(mem.get("size",  "0"), 0),
-                "type":     mem.get("type"),
-                "pagesize": mem.get("pagesize"),
-            }
+            meta.memories[name] = MemorySegment(
+                name     = name,
+                start    = int(mem.get("start", "0"), 0),
+                size     = int(mem.get("size",  "0"), 0),
+                mem_type = mem.get("type"),
+                pagesize = mem.get("pagesize"),
+            )
 
     @staticmethod
-    def _parse_modules(root: ET.Element, meta: MCUMetadata) -> None:
-        """Parse <module> elements from the ATDF XML and populate meta.modules."""
-        for module in root.findall(".//modules/module"):
-            mod_name = module.get("name")
-            if not mod_name:
-                continue
-
-            mod_entry: dict = {
-                "caption":        module.get("caption"),
-                "instances":      [],
-                "register_groups": {},
-            }
+    def _build_module(mod_name: str, _info: object, module: ET.Element) -> dict:
+        """Build the metadata for one ``<module>`` element (a ``LazyModules`` builder)."""
+        mod_entry: dict = {
+            "caption":        module.get("caption"),
+            "instances":      [],
+            "register_groups": {},
+        }
 
-            for inst in module.findall(".//instance"):
-                inst_data: dict = {"name": inst.get("name")}
-                for rg in inst.findall(".//register-group"):
-                    inst_data.update({
-                        "register_group": rg.get("name-in-module"),
-                        "offset":         rg.get("offset"),
-                        "address_space":  rg.get("address-space"),
-                    })
-                mod_entry["instances"].append(inst_data)
-
-            for rg in module.findall(".//register-group"):
-                rg_name = rg.get("name")
-                if not rg_name:
-                    continue
-                mod_entry["register_groups"][rg_name] = {
-                    "name_in_module": rg.get("name-in-module"),
-                    "caption":        rg.get("caption"),
+        for inst in module.findall(".//instance"):
+            inst_data: dict = {"name": inst.get("name")}
+            for rg in inst.findall(".//register-group"):
+                inst_data.update({
+                    "register_group": rg.get("name-in-module"),
                     "offset":         rg.get("offset"),
-                    "registers":      _ATDFLoader._parse_registers(rg),
-                }
+                    "address_space":  rg.get("address-space"),
+                })
+            mod_entry["instances"].append(inst_data)
 
-            meta.modules[mod_name] = mod_entry
+        for rg in module.findall(".//register-group"):
+            rg_name = rg.get("name")
+            if not rg_name:
+                continue
+            mod_entry["register_groups"][rg_name] = RegisterGroup(
+                name_in_module = rg.get("name-in-module"),
+                caption        = rg.get("caption"),
+                offset         = _parse_opt_int(rg.get("offset")),
+                registers      = _ATDFLoader._parse_registers(rg),
+            )
+
+        return mod_entry
 
     @staticmethod
-    def _parse_registers(rg_elem: ET.Element) -> dict:
-        """Parse <register> elements from a <register-group> and return a dict of register metadata."""
+    def _parse_registers(rg_elem: ET.Element) -> dict[str, Register]:
+        """Parse <register> elements from a <register-group> into Register records."""
         registers: dict = {}
         for reg in rg_elem.findall(".//register"):
             reg_name = reg.get("name")
             if not reg_name:
                 continue
-            registers[reg_name] = {
-                "caption":   reg.get("caption"),
-                "offset":    reg.get("offset"),
-                "size":      reg.get("size"),
-                "mask":      reg.get("mask"),
-                "rw":        reg.get("rw"),
-                "bitfields": _ATDFLoader._parse_bitfields(reg),
-            }
+            registers[reg_name] = Register(
+                caption   = reg.get("caption"),
+                offset    = _parse_int(reg.get("offset")),
+                size      = _parse_opt_int(reg.get("size")),
+                mask      = _parse_opt_int(reg.get("mask")),
+                rw        = reg.get("rw"),
+                bitfields = _ATDFLoader._parse_bitfields(reg),
+            )
         return registers
 
     @staticmethod
-    def _parse_bitfields(reg_elem: ET.Element) -> dict:
-        """Parse <bitfield> elements from a <register> and return a dict of bitfield metadata."""
+    def _parse_bitfields(reg_elem: ET.Element) -> dict[str, Bitfield]:
+        """Parse <bitfield> elements from a <register> into Bitfield records."""
         bitfields: dict = {}
         for bf in reg_elem.findall(".//bitfield"):
             bf_name = bf.get("name")
@@ -200,11 +261,11 @@ class _ATDFLoader(_PlatformLoader):
                         "caption": val.get("caption"),
                         "value":   val.get("value"),
                     }
-            bitfields[bf_name] = {
-                "caption": bf.get("caption"),
-                "mask":    bf.get("mask"),
-                "values":  values,
-            }
+            bitfields[bf_name] = Bitfield(
+                caption = bf.get("caption"),
+                mask    = _parse_int(bf.get("mask")),
+                values  = values,
+            )
         return bitfields
 
     @staticmethod
@@ -235,84 +296,169 @@ class _ATDFLoader(_PlatformLoader):
             }
 
 
-# TODO: Improve this family parser
-@dataclass(frozen=True)
-class STM32SVD:
-    core: str
-    families: set[str]
-
-_STM32_SVD_MAP = {
-    "STM32F0x0.svd": STM32SVD(
-        core="cortex-m0",
-        families={"f030", "f070"},
-    ),
-    "STM32F0x1.svd": STM32SVD(
-        core="cortex-m0",
-        families={"f031", "f051"},
-    ),
-    "STM32F0x2.svd": STM32SVD(
-        core="cortex-m0",
-        families={"f042", "f072"},
-    ),
-    "STM32F103.svd": STM32SVD(
-        core="cortex-m3",
-        families={"f103"},
-    ),
-}
+@dataclass
+class _SVDPeripheral:
+    """Header of one SVD ``<peripheral>``; ``registers`` is its span (lazy) or parsed table."""
+    name:         str | None
+    derived_from: str | None
+    base:         int
+    description:  str | None
+    interrupts:   list[tuple[str | None, str | None, str | None]]   # (name, value, description)
+    registers:    object = None
+
+
+@dataclass
+class _SVDDevice:
+    """Everything the SVD loader keeps from the file besides register bodies."""
+    architecture: str | None = None
+    family:       str | None = None
+    peripherals:  list[_SVDPeripheral] = field(default_factory=list)
+    interrupts:   list[tuple[str | None, str | None, str | None]] = field(default_factory=list)
+
 
 class _SVDLoader(_PlatformLoader):
     """Parse ARM SVD files for STM32 devices."""
 
-    def load(self, mcu_name: str, db_root: str) -> MCUMetadata:
-        mcu_lower = mcu_name.lower()
-        if not mcu_lower.startswith("stm32"):
-            mcu_lower = "stm32" + mcu_lower
+    def load(self, mcu_name: str, db_root: str, lazy: bool = True) -> MCUMetadata:
+        """Load the SVD covering *mcu_name* (plus its memory YAML) into MCUMetadata.
 
+        Lazily, one expat pass records where each peripheral's
+        ``<registers>`` block lives and registers are parsed per module on
+        first access.  Eagerly, the file is streamed peripheral by
+        peripheral, so memory stays bounded by the largest peripheral.
+        """
+        mcu_lower  = self._normalize(mcu_name)
         svd_path   = self._find_svd(mcu_lower, db_root)
         yaml_path  = Path(svd_path).with_suffix(".yaml")
         mem_data   = load_configs(str(yaml_path)) if yaml_path.is_file() else None
 
-        root, ns   = self._parse_xml(svd_path)
-        find       = _SVDXmlHelper(root, ns)
+        device = self._read_indexed(svd_path) if lazy else self._read_streaming(svd_path)
 
         meta = MCUMetadata(
             device       = mcu_lower,
-            architecture = find.text("cpu/name"),
-            family       = find.text("name"),
+            architecture = device.architecture,
+            family       = device.family,
         )
 
         self._parse_memories(mcu_lower, mem_data, meta)
-        self._parse_peripherals(find, meta)
+        entries = self._resolve_peripherals(device, meta)
+
+        if lazy:
+            meta.modules = LazyModules(
+                svd_path, entries, _SVDLoader._module, parse=_SVDLoader._parse_registers
+            )
+        else:
+            meta.modules = {pname: self._module(pname, info, table) for pname, (table, info) in entries.items()}
         return meta
 
-    @staticmethod
-    def _find_svd(mcu_lower: str, db_root: str) -> str:
-        family = mcu_lower[5:9]
+    def sources(self, mcu_name: str, db_root: str) -> list[str]:
+        svd_path  = self._find_svd(self._normalize(mcu_name), db_root)
+        yaml_path = Path(svd_path).with_suffix(".yaml")
+        return [svd_path, str(yaml_path)] if yaml_path.is_file() else [svd_path]
+
+    def from_bundle(self, entry: BundleEntry, mcu_name: str, lazy: bool = True) -> MCUMetadata:
+        """One entry serves every part of the SVD; memories come from its YAML variants."""
+        mcu_lower = self._normalize(mcu_name)
+        meta      = self._bundled(entry, mcu_lower, lazy)
+        variants  = entry.variants()
+        self._parse_memories(mcu_lower, {"variants": variants} if variants else None, meta)
+        return meta
 
-        for svd_file, svd in _STM32_SVD_MAP.items():
-            if family in svd.families:
-                path = Path(db_root) / "stm32" / svd.core / svd_file
+    def bundle_source(self, mcu_name: str, db_root: str) -> BundleSource:
+        sources  = self.sources(mcu_name, db_root)
+        mem_data = load_configs(sources[1]) if len(sources) > 1 else {}
+        return BundleSource(
+            source   = _relative(sources[0], db_root),
+            platform = MCUPlatforms.STM,
+            digest   = _bundle_digest(sources),
+            meta     = replace(self.load(mcu_name, db_root, lazy=False), memories={}),
+            variants = mem_data.get("variants") or {},
+        )
 
-                if path.is_file():
-                    return str(path)
+    @staticmethod
+    def _normalize(mcu_name: str) -> str:
+        mcu_lower = mcu_name.lower()
+        return mcu_lower if mcu_lower.startswith("stm32") else "stm32" + mcu_lower
 
-        raise FileNotFoundError(
-            f"SVD file for MCU '{mcu_lower}' not found in {db_root}"
-        )
+    @staticmethod
+    def _find_svd(mcu_lower: str, db_root: str) -> str:
+        """Return the SVD file covering *mcu_lower* via the device index."""
+        return find_device_file(mcu_lower, MCUPlatforms.STM, db_root)
 
     @staticmethod
-    def _parse_xml(path: str) -> tuple[ET.Element, dict]:
-        """Parse the SVD XML file at *path* and return the root element along with any namespace mappings."""
+    def _parse_xml(path: str, data: bytes) -> ET.Element:
+        """Parse SVD XML *data* read from *path*; tags are reduced to their local names."""
         try:
-            root = ET.parse(path).getroot()
+            root = ET.fromstring(data)
         except ET.ParseError as exc:
             raise ValueError(f"Invalid SVD XML in '{path}': {exc}") from exc
 
-        ns: dict = {}
         if root.tag.startswith("{"):
-            uri = root.tag.split("}")[0].strip("{")
-            ns  = {"svd": uri}
-        return root, ns
+            for elem in root.iter():
+                elem.tag = _local_name(elem.tag)
+        return root
+
+    def _read_indexed(self, svd_path: str) -> _SVDDevice:
+        """Parse the SVD with every ``<registers>`` block cut out; peripherals carry spans."""
+        data    = Path(svd_path).read_bytes()
+        scanned = _scan(data, svd_path, "SVD", ("device", "peripherals", "peripheral"), child="registers")
+        spans   = [span for _, span in scanned]
+        root    = self._parse_xml(svd_path, cut_spans(data, spans))
+
+        elems = root.findall(".//peripheral")
+        if len(elems) != len(spans):
+            raise ValueError(f"Unexpected SVD layout in '{svd_path}': peripherals outside <peripherals>")
+
+        return _SVDDevice(
+            architecture = root.findtext("cpu/name"),
+            family       = root.findtext("name"),
+            peripherals  = [self._peripheral(elem, span) for elem, span in zip(elems, spans, strict=True)],
+            interrupts   = [_svd_interrupt(intr) for intr in root.iterfind(".//interrupts/interrupt")],
+        )
+
+    def _read_streaming(self, svd_path: str) -> _SVDDevice:
+        """Stream the SVD with ``iterparse``, parsing and then dropping one peripheral at a time.
+
+        Only the peripheral being read is held as a tree; ``derivedFrom``
+        is resolved afterwards, since a base may follow the peripheral
+        derived from it.
+        """
+        device = _SVDDevice()
+        tags: list[str] = []
+        try:
+            for event, elem in ET.iterparse(svd_path, events=("start", "end")):
+                if event == "start":
+                    elem.tag = _local_name(elem.tag)
+                    tags.append(elem.tag)
+                    continue
+
+                where = tuple(tags)
+                tags.pop()
+                if where == ("device", "peripherals", "peripheral"):
+                    block = elem.find("registers")
+                    table = self._parse_registers(block) if block is not None else None
+                    device.peripherals.append(self._peripheral(elem, table))
+                    elem.clear()
+                elif where == ("device", "name"):
+                    device.family = elem.text or ""
+                elif where == ("device", "cpu", "name"):
+                    device.architecture = elem.text or ""
+                elif where[-2:] == ("interrupts", "interrupt"):
+                    device.interrupts.append(_svd_interrupt(elem))
+        except ET.ParseError as exc:
+            raise ValueError(f"Invalid SVD XML in '{svd_path}': {exc}") from exc
+        return device
+
+    @staticmethod
+    def _peripheral(elem: ET.Element, registers: object) -> _SVDPeripheral:
+        return _SVDPeripheral(
+            name         = elem.findtext("name"),
+            derived_from = elem.get("derivedFrom"),
+            base         = _parse_int(elem.findtext("baseAddress")),
+            description  = elem.findtext("description"),
+            interrupts   = [_svd_interrupt(intr) for intr in elem.iterfind("interrupt")],
+            registers    = registers,
+        )
 
     @staticmethod
     def _parse_memories(
@@ -333,19 +479,20 @@ class _SVDLoader(_PlatformLoader):
         flash_page = variant.get("flash_page")
 
         if flash_size:
-            meta.memories["FLASH"] = {
-                "start":    STM32Type.FLASH_BASE,
-                "size":     flash_size,
-                "type":     "flash",
-                "pagesize": str(flash_page) if flash_page else None,
-            }
+            meta.memories["FLASH"] = MemorySegment(
+                name     = "FLASH",
+                start    = int(STM32Type.FLASH_BASE),
+                size     = flash_size,
+                mem_type = "flash",
+                pagesize = str(flash_page) if flash_page else None,
+            )
         if ram_size:
-            meta.memories["RAM"] = {
-                "start":    STM32Type.RAM_BASE,
-                "size":     ram_size,
-                "type":     "ram",
-                "pagesize": None,
-            }
+            meta.memories["RAM"] = MemorySegment(
+                name     = "RAM",
+                start    = int(STM32Type.RAM_BASE),
+                size     = ram_size,
+                mem_type = "ram",
+            )
 
     @staticmethod
     def _lookup_variant(variants: dict, mcu_lower: str) -> dict:
@@ -373,159 +520,136 @@ class _SVDLoader(_PlatformLoader):
         return {}
 
     @staticmethod
-    def _parse_peripherals(find: "_SVDXmlHelper", meta: MCUMetadata) -> None:
-        # Index all peripheral elements for derivedFrom resolution
-        periph_elems: dict[str, ET.Element] = {
-            name: elem
-            for elem in find.all(".//peripheral")
-            if (name := find.text_of(elem, "name"))
-        }
+    def _resolve_peripherals(
+        device: _SVDDevice,
+        meta: MCUMetadata,
+    ) -> dict[str, tuple[object, tuple[str, int]]]:
+        """Fill meta.peripherals and meta.interrupts; return the module entries.
 
-        def resolve(elem: ET.Element) -> ET.Element:
-            base = elem.get("derivedFrom")
-            return periph_elems.get(base, elem) if base else elem
-
-        for pname, p_elem in periph_elems.items():
-            base_elem = resolve(p_elem)
-            base_addr = _parse_int(find.text_of(p_elem, "baseAddress"))
-            caption   = (
-                find.text_of(p_elem, "description")
-                or find.text_of(base_elem, "description")
-                or ""
-            )
-            base_hex  = hex(base_addr)
+        Second phase of the load: every peripheral is indexed by name, so
+        a ``derivedFrom`` base is found wherever it sits in the file and
+        the derived peripheral takes its registers (span or table).
+        """
+        index = {p.name: p for p in device.peripherals if p.name}
+
+        entries: dict[str, tuple[object, tuple[str, int]]] = {}
+        for pname, periph in index.items():
+            base    = index.get(periph.derived_from, periph) if periph.derived_from else periph
+            caption = periph.description or base.description or ""
 
             meta.peripherals[pname] = {
                 "caption":   caption,
                 "instances": [{"name": pname}],
             }
-            meta.modules[pname] = {
-                "caption":   caption,
-                "instances": [{
-                    "name":           pname,
-                    "offset":         base_hex,
-                    "register_group": pname,
-                    "address_space":  "data",
-                }],
-                "register_groups": {
-                    pname: {
-                        "name_in_module": pname,
-                        "caption":        caption,
-                        "offset":         base_hex,
-                        "registers":      _SVDLoader._parse_registers(
-                            base_elem, find
-                        ),
-                    }
-                },
-            }
+            entries[pname] = (base.registers, (caption, periph.base))
 
-            for intr in find.children(p_elem, "interrupt"):
-                int_name = find.text_of(intr, "name")
+            for int_name, value, int_caption in periph.interrupts:
                 if int_name and int_name not in meta.interrupts:
                     meta.interrupts[int_name] = {
-                        "index":           find.text_of(intr, "value"),
-                        "caption":         find.text_of(intr, "description"),
+                        "index":           value,
+                        "caption":         int_caption,
                         "module_instance": pname,
                     }
 
-        for intr in find.all(".//interrupts/interrupt"):
-            int_name = find.text_of(intr, "name")
+        for int_name, value, int_caption in device.interrupts:
             if int_name and int_name not in meta.interrupts:
                 meta.interrupts[int_name] = {
-                    "index":           find.text_of(intr, "value"),
-                    "caption":         find.text_of(intr, "description"),
+                    "index":           value,
+                    "caption":         int_caption,
                     "module_instance": None,
                 }
 
+        return entries
+
+    @staticmethod
+    def _module(pname: str, info: tuple[str, int], registers: FrozenDict | None) -> dict:
+        """Build the metadata for one peripheral around its (or its base's) register table.
+
+        Derived peripherals receive their base's table object itself, so
+        the instances differ only in caption and base address.
+        """
+        caption, base = info
+        return {
+            "caption":   caption,
+            "instances": [{
+                "name":           pname,
+                "offset":         hex(base),
+                "register_group": pname,
+                "address_space":  "data",
+            }],
+            "register_groups": {
+                pname: RegisterGroup(
+                    name_in_module = pname,
+                    caption        = caption,
+                    offset         = base,
+                    registers      = registers if registers is not None else _NO_REGISTERS,
+                )
+            },
+        }
+
     @staticmethod
-    def _parse_registers(base_elem: ET.Element, find: "_SVDXmlHelper") -> dict:
-        """Parse <register> elements from a peripheral and return a dict of register metadata."""
+    def _parse_registers(block: ET.Element) -> FrozenDict:
+        """Parse the <register> children of a <registers> block into a read-only register table.
+
+        The table is shared by every peripheral derived from this one, so
+        it is read-only all the way down.
+        """
         registers: dict = {}
-        for reg in find.children(base_elem, "registers/register"):
-            reg_name = find.text_of(reg, "name")
+        for reg in block.iterfind("register"):
+            reg_name = reg.findtext("name")
             if not reg_name:
                 continue
 
-            reg_offset = _parse_int(find.text_of(reg, "addressOffset"))
-            reg_size   = _parse_int(find.text_of(reg, "size") or "32", default=32)
-            reg_rw     = find.text_of(reg, "access") or "read-write"
-            reg_mask   = find.text_of(reg, "resetMask")
-
-            registers[reg_name] = {
-                "caption":   find.text_of(reg, "description"),
-                "offset":    str(reg_offset),
-                "size":      str(reg_size),
-                "mask":      reg_mask,
-                "rw":        reg_rw,
-                "bitfields": _SVDLoader._parse_bitfields(reg, find),
-            }
+            reg_offset = _parse_int(reg.findtext("addressOffset"))
+            reg_size   = _parse_int(reg.findtext("size") or "32", default=32)
+            reg_rw     = reg.findtext("access") or "read-write"
+            reg_mask   = _parse_opt_int(reg.findtext("resetMask"))
+
+            registers[reg_name] = Register(
+                caption   = reg.findtext("description"),
+                offset    = reg_offset,
+                size      = reg_size,
+                mask      = reg_mask,
+                rw        = reg_rw,
+                bitfields = _SVDLoader._parse_bitfields(reg),
+            )
 
-        return registers
+        return FrozenDict(registers)
 
     @staticmethod
-    def _parse_bitfields(reg_elem: ET.Element, find: "_SVDXmlHelper") -> dict:
-        """Parse <field> elements from a <register> and return a dict of bitfield metadata."""
+    def _parse_bitfields(reg_elem: ET.Element) -> FrozenDict:
+        """Parse <field> elements from a <register> into Bitfield records."""
         bitfields: dict = {}
-        for bf in find.children(reg_elem, "fields/field"):
-            bf_name = find.text_of(bf, "name")
+        for bf in reg_elem.iterfind("fields/field"):
+            bf_name = bf.findtext("name")
             if not bf_name:
                 continue
 
-            bit_range = find.text_of(bf, "bitRange")
-            if not bit_range:
-                lsb       = _parse_int(find.text_of(bf, "bitOffset"))
-                width     = _parse_int(find.text_of(bf, "bitWidth") or "1", default=1)
-                bit_range = f"[{lsb + width - 1}:{lsb}]"
+            bit_range = _SVD_BIT_RANGE.fullmatch((bf.findtext("bitRange") or "").strip())
+            if bit_range:
+                msb, lsb = int(bit_range[1]), int(bit_range[2])
+            else:
+                lsb = _parse_int(bf.findtext("bitOffset"))
+                msb = lsb + _parse_int(bf.findtext("bitWidth") or "1", default=1) - 1
 
             values: dict = {}
-            for val in find.children(bf, "enumeratedValues/enumeratedValue"):
-                val_name = find.text_of(val, "name")
+            for val in bf.iterfind("enumeratedValues/enumeratedValue"):
+                val_name = val.findtext("name")
                 if val_name:
-                    values[val_name] = {
-                        "caption": find.text_of(val, "description"),
-                        "value":   find.text_of(val, "value"),
-                    }
-
-            bitfields[bf_name] = {
-                "caption": find.text_of(bf, "description"),
-                "mask":    bit_range,
-                "values":  values,
-            }
-
-        return bitfields
-
-
-# SVD XML helper — abstracts namespace-aware findtext / findall
-class _SVDXmlHelper:
-    """Thin wrapper that handles optional XML namespaces transparently."""
-
-    def __init__(self, root: ET.Element, ns: dict) -> None:
-        self._root = root
-        self._ns   = ns
-
-    def text(self, path: str) -> str | None:
-        try:
-            return self._root.findtext(path, namespaces=self._ns)
-        except TypeError:
-            return self._root.findtext(path)
-
-    def all(self, path: str) -> list[ET.Element]:
-        try:
-            return self._root.findall(path, namespaces=self._ns)
-        except TypeError:
-            return self._root.findall(path)
+                    values[val_name] = FrozenDict(
+                        caption = val.findtext("description"),
+                        value   = val.findtext("value"),
+                    )
+
+            bitfields[bf_name] = Bitfield.from_range(
+                caption = bf.findtext("description"),
+                msb     = msb,
+                lsb     = lsb,
+                values  = FrozenDict(values),
+            )
 
-    def text_of(self, elem: ET.Element, path: str) -> str | None:
-        try:
-            return elem.findtext(path, namespaces=self._ns)
-        except TypeError:
-            return elem.findtext(path)
+        return FrozenDict(bitfields)
 
-    def children(self, elem: ET.Element, path: str) -> list[ET.Element]:
-        try:
-            return elem.findall(path, namespaces=self._ns)
-        except TypeError:
-            return elem.findall(path)
 
 # Platform loader registry — add new platforms here, nothing else changes
 _PLATFORM_LOADERS: dict[str, _PlatformLoader] = {
@@ -537,6 +661,8 @@ _PLATFORM_LOADERS: dict[str, _PlatformLoader] = {
 # Public helpers
 def load_configs(file_path: str) -> dict:
     """Load and return the contents of a YAML file as a dict."""
+    import yaml  # ~15 ms; deferred so importing the loader stays cheap
+
     try:
         with open(file_path, "r") as fh:
             return yaml.safe_load(fh) or {}
@@ -548,11 +674,15 @@ def load_configs(file_path: str) -> dict:
         return {}
 
 
-def load_mcu_metadata(mcu_name: str, mcu_platform: str) -> dict:
+def load_mcu_metadata(mcu_name: str, mcu_platform: str, lazy: bool = True) -> dict:
     """
     Dispatch to the correct platform loader and return metadata as a plain dict
     (for backwards compatibility with validator.py and commander.py).
 
+    With *lazy* (the default) ``"modules"`` is a read-only ``LazyModules``
+    mapping that parses a module's registers the first time it is looked
+    up; memories, interrupts and peripherals are always loaded eagerly.
+
     Raises
     ------
     NotImplementedError  If the platform has no loader registered yet.
@@ -566,7 +696,109 @@ def load_mcu_metadata(mcu_name: str, mcu_platform: str) -> dict:
             raise NotImplementedError("PIC platform support is not implemented yet")
         raise ValueError(f"Unsupported MCU platform: '{platform}'")
 
-    return loader.load(mcu_name, db_root=str(_DB_ROOT)).to_dict()
+    return _load_cached(loader, platform, mcu_name, lazy).to_dict()
+
+
+def _load_cached(loader: _PlatformLoader, platform: str, mcu_name: str, lazy: bool) -> MCUMetadata:
+    """Return the parsed metadata from the on-disk cache, parsing (and caching) on a miss.
+
+    The key covers the platform, part name, ``METADATA_CACHE_VERSION`` and
+    the contents of every source file, so editing the database or the
+    parsers rebuilds the entry on the next run.
+    """
+    db_root = str(_DB_ROOT)
+    sources = loader.sources(mcu_name, db_root)
+
+    meta = _load_bundled(loader, mcu_name, db_root, sources, lazy)
+    if meta is not None:
+        return meta
+
+    key     = disk_cache.cache_key(
+        METADATA_CACHE_VERSION, platform, mcu_name.lower(), lazy, files=tuple(sources)
+    )
+
+    meta = disk_cache.load("metadata", key)
+    if isinstance(meta, MCUMetadata):
+        MDTLogger.info(f"Loaded {mcu_name} metadata from cache")
+        return meta
+
+    meta = loader.load(mcu_name, db_root=db_root, lazy=lazy)
+    disk_cache.store("metadata", key, meta)
+    return meta
+
+
+class ConfigLoadError(RuntimeError):
+    """One or more of ``ConfigLoader``'s loading steps failed.
+
+    ``errors`` maps each failed step (``metadata``, ``elf``, ``mcu.h``)
+    to the exception it raised, so a session that is missing both its SVD
+    and its header reports both at once.
+    """
+
+    def __init__(self, errors: dict[str, Exception]) -> None:
+        self.errors = errors
+        lines = "".join(f"\n  {step}: {type(exc).__name__}: {exc}" for step, exc in errors.items())
+        super().__init__(f"{len(errors)} configuration step(s) failed:{lines}")
+
+
+# Compiled device bundle (mcu-mdt-db build)
+_BUNDLES: dict[str, DeviceBundle | None] = {}
+
+
+def _device_bundle(db_root: str) -> DeviceBundle | None:
+    """The bundle compiled into *db_root* (mapped once per process), or None."""
+    if db_root not in _BUNDLES:
+        try:
+            _BUNDLES[db_root] = DeviceBundle.open(Path(db_root) / BUNDLE_FILE)
+        except ValueError as exc:
+            MDTLogger.warning(f"Ignoring device bundle: {exc}")
+            _BUNDLES[db_root] = None
+    return _BUNDLES[db_root]
+
+
+def _bundle_digest(sources: list[str]) -> str:
+    """Freshness key of a bundle entry: the sources' contents and the parser version."""
+    return disk_cache.cache_key(METADATA_CACHE_VERSION, files=tuple(sources))
+
+
+def _relative(path: str, db_root: str) -> str:
+    return Path(path).resolve().relative_to(Path(db_root).resolve()).as_posix()
+
+
+def _load_bundled(loader: _PlatformLoader, mcu_name: str, db_root: str,
+                  sources: list[str], lazy: bool) -> MCUMetadata | None:
+    """Metadata from the compiled bundle, or None if it has no up-to-date entry for the part.
+
+    The XML stays the source of truth: an entry whose sources have changed
+    since the bundle was built is skipped, and the part is parsed as usual.
+    """
+    bundle = _device_bundle(db_root)
+    if bundle is None:
+        return None
+    entry = bundle.entry(_relative(sources[0], db_root))
+    if entry is None:
+        return None
+    if entry.digest != _bundle_digest(sources):
+        MDTLogger.info(f"Bundle entry for {entry.source} is out of date; parsing the XML")
+        return None
+    MDTLogger.info(f"Loaded {mcu_name} metadata from {bundle.path}")
+    return loader.from_bundle(entry, mcu_name, lazy)
+
+
+def compile_bundle(db_root: str | Path | None = None, path: str | Path | None = None) -> Path:
+    """Parse every database file with the XML loaders and compile them into one bundle.
+
+    Writes ``<db_root>/devices.mdtb`` unless *path* is given; returns the path.
+    """
+    root    = str(db_root or _DB_ROOT)
+    done:   set[str] = set()
+    sources: list[BundleSource] = []
+    for entry in DeviceIndex.build(root).list_devices():
+        if entry.path in done:
+            continue    # one SVD serves many parts
+        done.add(entry.path)
+        sources.append(_PLATFORM_LOADERS[entry.platform].bundle_source(entry.part, root))
+    return write_bundle(path or Path(root) / BUNDLE_FILE, sources)
 
 
 # Top-level ConfigLoader — used by main.py
@@ -574,11 +806,20 @@ class ConfigLoader:
     """
     Load all configuration data needed to drive an MCU-MDT session.
 
+    The two YAMLs are read first, since everything else is keyed off
+    build_info.  Device metadata, the ELF (symbols and firmware image, from
+    one parse) and ``mcu.h`` do not depend on each other and load side by
+    side on a thread pool; ``ready()`` is the barrier that waits for all
+    of them.
+
     Parameters
     ----------
     build_info_path:  Path to the project's build_info.yaml.
     commands_path:    Path to commands.yaml (default matches repo layout).
     platforms_path:   Directory that contains per-platform YAML configs.
+    profile:          Times each loading phase (``--startup-profile``).
+    wait:             Call ``ready()`` before returning.  ``main.setup``
+                      passes False and opens the serial port meanwhile.
     """
 
     def __init__(
@@ -586,19 +827,60 @@ class ConfigLoader:
         build_info_path: str = "build/",
         commands_path:   str = "pc_tool/configs/commands.yaml",
         platforms_path:  str = "pc_tool/configs/platforms",
+        profile:         StartupProfile | None = None,
+        wait:            bool = True,
     ) -> None:
-        self.yaml_build_data    = load_configs(build_info_path)
-        self.yaml_command_data  = load_configs(commands_path)
+        self._profile = profile or StartupProfile()
+
+        with self._profile.phase("yaml"):
+            self.yaml_build_data    = load_configs(build_info_path)
+            self.yaml_command_data  = load_configs(commands_path)
 
         mcu      = self.yaml_build_data.get("mcu")
         platform = self.yaml_build_data.get("platform", "")
 
-        self.mcu_metadata = load_mcu_metadata(mcu, platform)
-        self.elf_symbols  = self._load_elf(build_info_path)
-        self._inject_firmware_info(build_info_path)
+        pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="mdt-load")
+        self._pending: dict[str, Future] | None = {
+            "metadata": pool.submit(self._timed, "metadata", load_mcu_metadata, mcu, platform),
+            # Symbols and firmware image share one parse of the ELF; timed per part inside
+            "elf":      pool.submit(self._load_elf, build_info_path),
+            "mcu.h":    pool.submit(self._timed, "mcu.h", self._load_mcu_header, build_info_path),
+        }
+        pool.shutdown(wait=False)
+
+        if wait:
+            self.ready()
 
+    def _timed(self, phase: str, fn, *args):
+        with self._profile.phase(phase):
+            return fn(*args)
+
+    def ready(self) -> ConfigLoader:
+        """Wait for every loading step, then publish the results.
+
+        Raises ``ConfigLoadError`` listing every step that failed (not just
+        the first).  Calling it again after success is a no-op.
+        """
+        if self._pending is None:
+            return self
 
-    def _inject_firmware_info(self, build_info_path: str) -> None:
+        results: dict[str, object]    = {}
+        errors:  dict[str, Exception] = {}
+        for step, future in self._pending.items():
+            try:
+                results[step] = future.result()
+            except Exception as exc:
+                errors[step] = exc
+        if errors:
+            raise ConfigLoadError(errors) from next(iter(errors.values()))
+
+        self._pending       = None
+        self.mcu_metadata   = results["metadata"]
+        self.elf_symbols, self.firmware_image = results["elf"]
+        self._inject_firmware_info(results["mcu.h"])
+        return self
+
+    def _inject_firmware_info(self, header: dict) -> None:
         """Merge firmware boundary fields from build_info into mcu_metadata.
 
         The validator uses these to prevent writes and erases that would
@@ -608,7 +890,8 @@ class ConfigLoader:
           firmware_start_address  — first byte of firmware in flash
           firmware_end_address    — first byte AFTER firmware (exclusive)
           firmware_size           — byte count  (= end - start)
-          flash_page_size         — erase granularity in bytes
+        and from mcu.h (*header*):
+          FLASH_PAGE_SIZE         — erase granularity in bytes
 
         PyYAML safe_load parses bare hex literals (0x…) as ints, so no
         manual conversion is needed.  The method is a no-op for platforms
@@ -617,21 +900,11 @@ class ConfigLoader:
         start     = self.yaml_build_data.get("firmware_start_address")
         end       = self.yaml_build_data.get("firmware_end_address")
         size      = self.yaml_build_data.get("firmware_size")
-        page_size = self._load_mcu_header(build_info_path).get("FLASH_PAGE_SIZE")
+        page_size = header.get("FLASH_PAGE_SIZE")
 
         if start is None or end is None:
             return   # platform doesn't provide firmware boundaries
 
-        def _to_int(v: object) -> int | None:
-            if v is None:
-                return None
-            if isinstance(v, int):
-                return v
-            try:
-                return int(str(v), 0)
-            except ValueError:
-                return None
-
         self.mcu_metadata["firmware"] = {
             "start":     _to_int(start),
             "end":       _to_int(end),
@@ -639,22 +912,56 @@ class ConfigLoader:
             "page_size": _to_int(page_size),
         }
 
-    def _load_elf(self, build_info_path: str) -> dict:
-        """Load ELF symbols from the path specified in build_info.yaml, if it exists."""
-        elf_rel = self.yaml_build_data.get("elf")
-        if not elf_rel:
+    def _load_elf(self, build_info_path: str) -> tuple[Mapping[str, SymbolInfo], FirmwareImage | None]:
+        """Load ELF symbols and the firmware image from the ELF named in build_info.yaml.
+
+        The file is parsed at most once for both (not at all when the
+        symbols come from the disk cache and no image is wanted).
+        """
+        elf_path = self._elf_path(build_info_path)
+        if elf_path is None:
             MDTLogger.info(
                 "No 'elf' key in build_info.yaml — symbol resolution disabled. "
                 "Add 'elf: path/to/firmware.elf' to enable watchpoint symbol lookup."
             )
-            return {}
-
+            return {}, None
+
+        with ELFSource(elf_path) as source:
+            with self._profile.phase("elf"):
+                symbols = load_elf_symbols(elf_path, self.yaml_build_data.get("platform", ""), source)
+                MDTLogger.info(f"Loaded {len(symbols)} symbol(s) from {elf_path}")
+            with self._profile.phase("firmware"):
+                image = self._load_firmware_image(elf_path, source)
+        return symbols, image
+
+    def _elf_path(self, build_info_path: str) -> str | None:
+        """Absolute path of the ELF named in build_info.yaml (relative to it), or None."""
+        elf_rel = self.yaml_build_data.get("elf")
+        if not elf_rel:
+            return None
         build_dir = os.path.dirname(os.path.abspath(build_info_path))
-        elf_path  = os.path.normpath(os.path.join(build_dir, elf_rel))
-        platform  = self.yaml_build_data.get("platform", "")
-        symbols   = load_elf_symbols(elf_path, platform)
-        MDTLogger.info(f"Loaded {len(symbols)} symbol(s) from {elf_path}")
-        return symbols
+        return os.path.normpath(os.path.join(build_dir, elf_rel))
+
+    def _load_firmware_image(self, elf_path: str, source: ELFSource) -> FirmwareImage | None:
+        """Map the ELF's flash contents so READ_MEM FLASH inside the firmware can skip the UART.
+
+        Needs both an ELF and the firmware boundaries; disabled with
+        ``elf_flash_reads: 0`` in build_info.yaml.
+        """
+        start = _to_int(self.yaml_build_data.get("firmware_start_address"))
+        end   = _to_int(self.yaml_build_data.get("firmware_end_address"))
+        if start is None or end is None:
+            return None
+        if not self.yaml_build_data.get("elf_flash_reads", True):
+            return None
+
+        image = load_firmware_image(elf_path, self.yaml_build_data.get("platform", ""), start, end, source)
+        if image is not None:
+            MDTLogger.info(
+                f"Mapped {image.size} byte(s) of firmware image from {elf_path} "
+                f"(0x{image.start:08X}-0x{image.end:08X})"
+            )
+        return image
     
     def _load_mcu_header(self, build_info_path: str) -> dict:
             path_to_header = os.path.join(
@@ -691,6 +998,35 @@ class ConfigLoader:
             return defines
 
 # Internal utilities
+def _to_int(v: object) -> int | None:
+    if v is None:
+        return None
+    if isinstance(v, int):
+        return v
+    try:
+        return int(str(v), 0)
+    except ValueError:
+        return None
+
+
+def _scan(data: bytes, path: str, kind: str, container: tuple[str, ...],
+          child: str | None = None) -> list[tuple[dict, Span | None]]:
+    """``scan_spans`` with XML errors reported like the parsers report them."""
+    try:
+        return scan_spans(data, container, child)
+    except xml.parsers.expat.ExpatError as exc:
+        raise ValueError(f"Invalid {kind} XML in '{path}': {exc}") from exc
+
+
+def _svd_interrupt(elem: ET.Element) -> tuple[str | None, str | None, str | None]:
+    return elem.findtext("name"), elem.findtext("value"), elem.findtext("description")
+
+
+def _local_name(tag: str) -> str:
+    """``{uri}peripheral`` -> ``peripheral``."""
+    return tag.rpartition("}")[2]
+
+
 def _iter_yaml_files(folder: str) -> Iterator[str]:
     """Yield all .yaml / .yml file paths found recursively under *folder*."""
     for dirpath, _, files in os.walk(folder):
@@ -699,6 +1035,16 @@ def _iter_yaml_files(folder: str) -> Iterator[str]:
                 yield os.path.join(dirpath, fname)
 
 
+def _parse_opt_int(text: str | None) -> int | None:
+    """Like ``_parse_int``, but None for a missing or unparsable value."""
+    if not text:
+        return None
+    try:
+        return int(text.strip(), 0)
+    except ValueError:
+        return None
+
+
 def _parse_int(text: str | None, default: int = 0) -> int:
     """Convert a hex/decimal string to int, returning *default* on failure."""
     if not text:
@@ -1,10 +1,17 @@
-from pc_tool.loader import ConfigLoader
-from pc_tool.parser import parse_line, parse_args, CLIHistory
-from pc_tool.commander import Commander, help_command, intro_text, clear_command, serial_link_command, exit_command
-from pc_tool.validator import validate_commands
-from pc_tool.event import start_async_handlers, drain_stale_events
-from pc_tool.common.logger import MDTLogger
-from pc_tool.common.terminal import Terminal
+import time
+
+# Taken before the other imports so --startup-profile can report what they
+# cost; the imports below are deliberately late (E402).
+_IMPORT_START = time.perf_counter()
+
+from pc_tool.parser import parse_line, parse_args, CLIHistory  # noqa: E402
+from pc_tool.commander import Commander, help_command, intro_text, clear_command, serial_link_command, exit_command  # noqa: E402
+from pc_tool.validator import validate_commands  # noqa: E402
+from pc_tool.event import start_async_handlers, drain_stale_events  # noqa: E402
+from pc_tool.common.logger import MDTLogger  # noqa: E402
+from pc_tool.common.startup import StartupProfile  # noqa: E402
+from pc_tool.common.terminal import Terminal  # noqa: E402
+from pc_tool.common.enums import DEFAULT_TX_WINDOW  # noqa: E402
 
 
 def build_dispatch(loader, serial_link, commander, threads):
@@ -16,11 +23,23 @@ def build_dispatch(loader, serial_link, commander, threads):
         "PING":  lambda cmd: commander.ping(cmd),
     }
 
-def setup(build_info_path: str):
-    """Perform initial setup: load configs, initialize logger, open serial link, start event handlers."""
-    loader = ConfigLoader(build_info_path)
-    print(loader.mcu_metadata["firmware"]["page_size"])
-    exit(0)
+def setup(build_info_path: str, profile: StartupProfile | None = None,
+          trace_path: str | None = None):
+    """Perform initial setup: load configs, initialize logger, open serial link, start event handlers.
+
+    *profile* times each phase; it is reported once the session is ready.
+    *trace_path* records every frame on the link to a binary trace
+    (``pc_tool/common/trace.py``), closed with the link or at exit.
+    """
+    profile = profile or StartupProfile()
+    with profile.phase("imports"):
+        from pc_tool.common.elf_image import DEFAULT_VERIFY_SAMPLES
+        from pc_tool.common.event_buffer import EVENT_BUFFER_CAPACITY
+        from pc_tool.common.poll_scheduler import EVENT_POLL_CEILING, EVENT_POLL_FLOOR, PollScheduler
+        from pc_tool.loader import ConfigLoader, ConfigLoadError
+        from pc_tool.shadow import ShadowMemory
+    # Metadata, ELF and mcu.h keep loading in the background while the port opens
+    loader = ConfigLoader(build_info_path, profile=profile, wait=False)
 
     MDTLogger.enable_file_logging(mcu=loader.yaml_build_data.get('mcu', 'unknown'))
     MDTLogger.session_start(loader.yaml_build_data)
@@ -28,11 +47,23 @@ def setup(build_info_path: str):
     serial_link = serial_link_command(
         port=loader.yaml_build_data['port'],
         baudrate=loader.yaml_build_data.get('baudrate', 19200),
-        ping_command_id=loader.yaml_command_data['commands']['PING']['id']
+        ping_command_id=loader.yaml_command_data['commands']['PING']['id'],
+        event_capacity=int(loader.yaml_build_data.get('event_buffer', EVENT_BUFFER_CAPACITY)),
     )
 
+    if trace_path:
+        from pc_tool.common.trace import TraceWriter
+        try:
+            serial_link.trace = TraceWriter(trace_path)
+        except OSError as e:
+            MDTLogger.error(f"Cannot open trace file: {e}", code=1)
+            exit(1)
+
     try:
-        serial_link.open()
+        with profile.phase("port open"):
+            serial_link.open(sync=False)
+        with profile.phase("sync"):
+            serial_link.sync()
     except Exception as e:
         MDTLogger.error(f"Failed to open serial link: {e}", code=1)
         exit(1)
@@ -40,12 +71,37 @@ def setup(build_info_path: str):
     uart_idle = bool(loader.yaml_build_data.get('uart_idle', False))
 
     # Drain any stale events that may have accumulated before the event handlers are started.
-    drain_stale_events(serial_link, uart_idle=uart_idle)
+    with profile.phase("event drain"):
+        drain_stale_events(serial_link, uart_idle=uart_idle)
+
+    try:
+        with profile.phase("load wait"):
+            loader.ready()
+    except ConfigLoadError as e:
+        MDTLogger.error(str(e), code=1)
+        serial_link.close()
+        exit(1)
 
-    threads = start_async_handlers(serial_link, uart_idle=uart_idle)
+    shadow  = ShadowMemory.from_config(loader.mcu_metadata, loader.yaml_build_data.get('shadow'))
+    poll    = PollScheduler(
+        floor=float(loader.yaml_build_data.get('event_poll_floor', EVENT_POLL_FLOOR)),
+        ceiling=float(loader.yaml_build_data.get('event_poll_ceiling', EVENT_POLL_CEILING)),
+    )
 
-    commander = Commander(serial_link)
+    commander = Commander(
+        serial_link,
+        window=int(loader.yaml_build_data.get('tx_window', DEFAULT_TX_WINDOW)),
+        shadow=shadow,
+        image=loader.firmware_image,
+        image_samples=int(loader.yaml_build_data.get('elf_verify_samples', DEFAULT_VERIFY_SAMPLES)),
+        symbols=loader.elf_symbols,
+        poll=poll,
+    )
+    threads = start_async_handlers(serial_link, uart_idle=uart_idle, shadow=shadow,
+                                   symbols=loader.elf_symbols, watches=commander.watches,
+                                   poll=poll)
 
+    profile.report()
     return loader, serial_link, commander, threads
 
 
@@ -153,10 +209,48 @@ def run_loop(loader, serial_link, commander, threads):
 
     MDTLogger.session_end()
 
+def run_fleet_mode(args) -> None:
+    """Run --script or --command on every --fleet target concurrently, then exit."""
+    from pc_tool.fleet import resolve_targets, read_script, run_fleet
+
+    if args.script:
+        try:
+            lines = read_script(args.script)
+        except OSError as e:
+            MDTLogger.error(f"Cannot open script file: {e}", code=1)
+            exit(1)
+    elif args.command:
+        lines = [(1, args.command.strip())]
+    else:
+        MDTLogger.error("Fleet mode needs --script or --command.", code=1)
+        exit(1)
+
+    MDTLogger.enable_file_logging(mcu="fleet")
+
+    try:
+        targets = resolve_targets(args.fleet, template=args.build_info)
+    except (OSError, ValueError, KeyError) as e:
+        MDTLogger.error(f"Invalid fleet target list: {e}", code=1)
+        exit(1)
+
+    report = run_fleet(targets, lines, report_path=args.report)
+    MDTLogger.session_end()
+    if not report.ok:
+        exit(1)
+
+
 def main(args=None):
     if args is None:              # console-script entry (mcu-mdt): parse argv here
         args = parse_args()
-    loader, serial_link, commander, threads = setup(args.build_info)
+
+    if getattr(args, "fleet", None):
+        run_fleet_mode(args)
+        return
+
+    profile = StartupProfile(enabled=getattr(args, "startup_profile", False), since=_IMPORT_START)
+    profile.add("imports", time.perf_counter() - _IMPORT_START)
+    loader, serial_link, commander, threads = setup(args.build_info, profile,
+                                                    trace_path=getattr(args, "trace", None))
 
     if args.script:
         run_script(args.script, loader, serial_link, commander, threads)
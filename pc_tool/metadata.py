@@ -0,0 +1,486 @@
+from __future__ import annotations
+import heapq
+import threading
+import xml.etree.ElementTree as ET
+import xml.parsers.expat
+from bisect import bisect_right
+from collections.abc import Mapping
+from itertools import pairwise
+from typing import Callable, Iterator, NamedTuple
+
+# (start, end) byte offsets of one element in the source file, end exclusive
+Span = tuple[int, int]
+
+# build(name, info, part) -> module dict; part is parse(element), None when there is no span
+ModuleBuilder = Callable[[str, object, object], dict]
+
+
+def scan_spans(data: bytes, container: tuple[str, ...], child: str | None = None) -> list[tuple[dict, Span | None]]:
+    """Find the byte span of every element at path *container* in one expat pass.
+
+    Returns one ``(attributes, span)`` pair per container element, in
+    document order.  With *child*, the span is that of the container's
+    direct child named *child* (None if it has none); otherwise it is the
+    container element itself.  Only tag events are handled, so the pass is
+    far cheaper than building a tree.
+    """
+    parser = xml.parsers.expat.ParserCreate()
+    depth  = len(container)
+    path: list[str] = []
+    found: list[list] = []
+    starts: dict[int, tuple[int, int]] = {}    # depth -> (byte index, tag count at start)
+    tags   = 0
+
+    def element_end(level: int) -> Span:
+        start, count = starts.pop(level)
+        index = parser.CurrentByteIndex
+        # <empty/> ends right after "/>"; any other element ends at the ">" of its end tag
+        if count == tags and data[index - 2:index] == b"/>":
+            return start, index
+        return start, data.index(b">", index) + 1
+
+    def on_start(name: str, attrs: dict) -> None:
+        nonlocal tags
+        tags += 1
+        name = name.rpartition(":")[2]      # match svd:peripheral like peripheral
+        path.append(name)
+        if len(path) == depth and tuple(path) == container:
+            found.append([attrs, None])
+            if child is None:
+                starts[depth] = (parser.CurrentByteIndex, tags)
+        elif child is not None and len(path) == depth + 1 and name == child \
+                and tuple(path[:depth]) == container:
+            starts[depth + 1] = (parser.CurrentByteIndex, tags)
+
+    def on_end(name: str) -> None:
+        name  = name.rpartition(":")[2]
+        level = len(path)
+        if child is None and level == depth and tuple(path) == container:
+            found[-1][1] = element_end(depth)
+        elif child is not None and level == depth + 1 and name == child and depth + 1 in starts:
+            found[-1][1] = element_end(depth + 1)
+        path.pop()
+
+    parser.StartElementHandler = on_start
+    parser.EndElementHandler   = on_end
+    parser.Parse(data, True)
+    return [(attrs, span) for attrs, span in found]
+
+
+def cut_spans(data: bytes, spans: list[Span | None]) -> bytes:
+    """Return *data* with every span removed (spans must be in document order)."""
+    parts, pos = [], 0
+    for span in spans:
+        if span is None:
+            continue
+        parts.append(data[pos:span[0]])
+        pos = span[1]
+    parts.append(data[pos:])
+    return b"".join(parts)
+
+
+class FrozenDict(dict):
+    """Read-only dict for metadata shared between modules.
+
+    Still a dict, so it compares, iterates and serialises like one;
+    ``copy()`` returns a plain, mutable dict.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only; copy() it to modify")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+
+def _hex(value: int | None) -> str | None:
+    return None if value is None else f"0x{value:X}"
+
+
+class _Record(Mapping):
+    """Slotted metadata record that reads like the dict the loaders used to build.
+
+    Numeric fields are stored as ints; the mapping view (``rec["offset"]``,
+    ``rec.get("rw")``, ``to_dict()``) renders them as strings the way the
+    old dicts held them, so ``int(x, 0)`` callers keep working.  Read-only.
+    """
+    __slots__ = ()
+    _VIEW: dict[str, Callable[["_Record"], object]] = {}
+
+    def __getitem__(self, key: str) -> object:
+        try:
+            view = self._VIEW[key]
+        except KeyError:
+            raise KeyError(key) from None
+        return view(self)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._VIEW)
+
+    def __len__(self) -> int:
+        return len(self._VIEW)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is type(self):
+            return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def to_dict(self) -> dict:
+        """Plain nested dicts, as the loaders produced before records existed."""
+        return {key: _plain(value) for key, value in self.items()}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.__slots__ if f not in ("bitfields", "registers", "values"))
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value: object) -> object:
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, Mapping):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+class Bitfield(_Record):
+    """One bitfield; ``mask`` is the bit mask within the register."""
+    __slots__ = ("caption", "mask", "values")
+
+    def __init__(self, caption: str | None, mask: int, values: Mapping[str, dict]) -> None:
+        self.caption = caption
+        self.mask    = mask
+        self.values  = values
+
+    @classmethod
+    def from_range(cls, caption: str | None, msb: int, lsb: int, values: Mapping[str, dict]) -> Bitfield:
+        """Bitfield from an SVD ``[msb:lsb]`` range."""
+        return cls(caption, ((1 << (msb - lsb + 1)) - 1) << lsb, values)
+
+    _VIEW = {
+        "caption": lambda b: b.caption,
+        "mask":    lambda b: _hex(b.mask),
+        "values":  lambda b: b.values,
+    }
+
+
+class Register(_Record):
+    """One register.  ``offset`` is relative to its group's base; ``size`` is
+    as the source gives it (bytes in ATDF, bits in SVD)."""
+    __slots__ = ("caption", "offset", "size", "mask", "rw", "bitfields")
+
+    def __init__(self, caption: str | None, offset: int, size: int | None, mask: int | None,
+                 rw: str | None, bitfields: Mapping[str, Bitfield]) -> None:
+        self.caption   = caption
+        self.offset    = offset
+        self.size      = size
+        self.mask      = mask
+        self.rw        = rw
+        self.bitfields = bitfields
+
+    _VIEW = {
+        "caption":   lambda r: r.caption,
+        "offset":    lambda r: _hex(r.offset),
+        "size":      lambda r: None if r.size is None else str(r.size),
+        "mask":      lambda r: _hex(r.mask),
+        "rw":        lambda r: r.rw,
+        "bitfields": lambda r: r.bitfields,
+    }
+
+
+class RegisterGroup(_Record):
+    """A module's register group; ``offset`` is its base address, if the source gives one."""
+    __slots__ = ("name_in_module", "caption", "offset", "registers")
+
+    def __init__(self, name_in_module: str | None, caption: str | None, offset: int | None,
+                 registers: Mapping[str, Register]) -> None:
+        self.name_in_module = name_in_module
+        self.caption        = caption
+        self.offset         = offset
+        self.registers      = registers
+
+    _VIEW = {
+        "name_in_module": lambda g: g.name_in_module,
+        "caption":        lambda g: g.caption,
+        "offset":         lambda g: _hex(g.offset),
+        "registers":      lambda g: g.registers,
+    }
+
+
+class MemorySegment(_Record):
+    """One memory segment; ``mem_type`` is ``flash``/``ram``/``eeprom``/..."""
+    __slots__ = ("name", "start", "size", "mem_type", "pagesize")
+
+    def __init__(self, name: str, start: int, size: int, mem_type: str | None,
+                 pagesize: str | None = None) -> None:
+        self.name     = name
+        self.start    = start
+        self.size     = size
+        self.mem_type = mem_type
+        self.pagesize = pagesize
+
+    _VIEW = {
+        "start":    lambda m: m.start,
+        "size":     lambda m: m.size,
+        "type":     lambda m: m.mem_type,
+        "pagesize": lambda m: m.pagesize,
+    }
+
+
+class LazyModules(Mapping):
+    """``modules`` mapping whose entries are parsed from the source file on first access.
+
+    Names are known up front; each value is built by ``build(name, info,
+    part)`` from the XML fragment at the module's recorded byte span,
+    then kept.  Iterating ``items()`` therefore parses every module;
+    ``loaded`` tells how many have been so far.  Pickles as source path
+    and spans only, so a cached copy stays small.
+
+    With *parse*, ``part`` is ``parse(element)``, computed once per span:
+    modules whose entries point at the same span (SVD ``derivedFrom``)
+    share one parsed object.
+    """
+
+    def __init__(self, source: str, entries: dict[str, tuple[Span | None, object]],
+                 build: ModuleBuilder, parse: Callable[[ET.Element], object] | None = None) -> None:
+        self.source   = source
+        self._entries = entries
+        self._build   = build
+        self._parse   = parse
+        self._loaded: dict[str, dict] = {}
+        self._parts:  dict[Span, object] = {}
+        self._lock    = threading.Lock()
+
+    def __getitem__(self, name: str) -> dict:
+        module = self._loaded.get(name)
+        if module is not None:
+            return module
+        span, info = self._entries[name]
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = self._build(name, info, self._part(span))
+            return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    @property
+    def loaded(self) -> int:
+        return len(self._loaded)
+
+    def materialize(self) -> dict[str, dict]:
+        """Parse every module and return them as a plain dict."""
+        return {name: self[name] for name in self._entries}
+
+    def _part(self, span: Span | None) -> object:
+        if span is None:
+            return None
+        if self._parse is None:
+            return self._fragment(span)
+        part = self._parts.get(span)
+        if part is None:
+            part = self._parts[span] = self._parse(self._fragment(span))
+        return part
+
+    def _fragment(self, span: Span) -> ET.Element:
+        start, end = span
+        with open(self.source, "rb") as fh:
+            fh.seek(start)
+            data = fh.read(end - start)
+        try:
+            return ET.fromstring(data)
+        except ET.ParseError as exc:
+            raise ValueError(
+                f"'{self.source}' changed since it was indexed (bytes {start}-{end}): {exc}"
+            ) from exc
+
+    def __getstate__(self) -> dict:
+        return {"source": self.source, "entries": self._entries,
+                "build": self._build, "parse": self._parse}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["source"], state["entries"], state["build"], state.get("parse"))
+
+    def __repr__(self) -> str:
+        return f"LazyModules({self.source!r}, {len(self)} modules, {self.loaded} loaded)"
+
+
+class RegisterHit(NamedTuple):
+    """A register located by address: ``validator._find_register``'s result."""
+    module:   str
+    name:     str
+    register: dict
+    start:    int        # absolute address
+    end:      int        # exclusive
+
+
+# mcu_metadata key the index is cached under (like "firmware", added by ConfigLoader)
+_INDEX_KEY = "register_index"
+
+
+def register_index(mcu_metadata: dict) -> RegisterIndex:
+    """Return the ``RegisterIndex`` for *mcu_metadata*, building it on first use.
+
+    The index is kept in the metadata dict itself, so every validator and
+    parser call for a session shares it.  Replacing ``"modules"`` gives a
+    fresh index; editing a module in place does not.
+    """
+    modules = mcu_metadata.get("modules", {})
+    index   = mcu_metadata.get(_INDEX_KEY)
+    if index is None or index.modules is not modules:
+        index = mcu_metadata[_INDEX_KEY] = RegisterIndex(modules)
+    return index
+
+
+class RegisterIndex:
+    """Address and name lookup over the registers of a ``modules`` mapping.
+
+    Offsets and sizes are parsed once.  Address lookup is a ``bisect``
+    over sorted, non-overlapping intervals; where registers overlap (AVR
+    16-bit pairs and their halves) the interval belongs to the register
+    that comes first in module order, as with a linear scan.  Names are
+    matched case-insensitively through dicts.
+
+    Tables are built on first use.  A qualified name (``RCC_CR``) only
+    parses its own module, so a lazily loaded ``modules`` stays mostly
+    unparsed; address and bare-name lookups need every module once.
+    """
+
+    def __init__(self, modules: Mapping[str, dict]) -> None:
+        self.modules = modules
+        self._lock   = threading.Lock()
+        self._starts: list[int] | None = None
+        self._ends:   list[int] = []
+        self._hits:   list[RegisterHit] = []
+        self._bare:   dict[str, int] | None = None
+        self._by_module: dict[str, dict[str, int]] = {}
+
+    # Queries
+    def find(self, address: int) -> RegisterHit | None:
+        """Return the register containing *address*, or None."""
+        if self._starts is None:
+            self._build_intervals()
+        i = bisect_right(self._starts, address) - 1
+        if i < 0 or address >= self._ends[i]:
+            return None
+        return self._hits[i]
+
+    def address_of(self, name: str) -> int | None:
+        """Absolute address of register *name*, qualified (``USART1_SR``) or bare (``SR``).
+
+        A qualified name is split on the first underscore; if that
+        peripheral has no such register the whole name is tried bare.
+        Among several bare matches the first module in order wins.
+        """
+        key = name.upper()
+        if "_" in key:
+            periph, reg = key.split("_", 1)
+            if periph in self.modules:
+                addr = self._module_names(periph).get(reg)
+                if addr is not None:
+                    return addr
+        if self._bare is None:
+            self._build_bare()
+        return self._bare.get(key)
+
+    # Construction
+    def _module_names(self, mod_name: str) -> dict[str, int]:
+        names = self._by_module.get(mod_name)
+        if names is None:
+            names = {}
+            for reg_name, _, start, _ in _iter_registers(self.modules[mod_name]):
+                names.setdefault(reg_name.upper(), start)
+            self._by_module[mod_name] = names
+        return names
+
+    def _build_bare(self) -> None:
+        with self._lock:
+            if self._bare is not None:
+                return
+            bare: dict[str, int] = {}
+            for mod_name in self.modules:
+                for reg_name, start in self._module_names(mod_name).items():
+                    bare.setdefault(reg_name, start)
+            self._bare = bare
+
+    def _build_intervals(self) -> None:
+        with self._lock:
+            if self._starts is not None:
+                return
+            regs = [
+                RegisterHit(mod_name, reg_name, reg, start, end)
+                for mod_name, module in self.modules.items()
+                for reg_name, reg, start, end in _iter_registers(module)
+            ]
+            intervals   = _first_match_intervals(regs)
+            self._ends  = [end for _, end, _ in intervals]
+            self._hits  = [hit for _, _, hit in intervals]
+            self._starts = [start for start, _, _ in intervals]
+
+
+def _first_match_intervals(regs: list[RegisterHit]) -> list[tuple[int, int, RegisterHit]]:
+    """Split overlapping registers into sorted, disjoint ``(start, end, register)``
+    intervals, each owned by the earliest register in *regs* that covers it."""
+    bounds = sorted({r.start for r in regs} | {r.end for r in regs})
+    order  = sorted(range(len(regs)), key=lambda i: regs[i].start)
+    active: list[int] = []          # heap of indices into regs; lowest = first in module order
+    out:    list[tuple[int, int, RegisterHit]] = []
+    j = 0
+    for lo, hi in pairwise(bounds):
+        while j < len(order) and regs[order[j]].start <= lo:
+            heapq.heappush(active, order[j])
+            j += 1
+        while active and regs[active[0]].end <= lo:
+            heapq.heappop(active)
+        if not active:
+            continue
+        owner = regs[active[0]]
+        if out and out[-1][1] == lo and out[-1][2] is owner:
+            out[-1] = (out[-1][0], hi, owner)
+        else:
+            out.append((lo, hi, owner))
+    return out
+
+
+def _iter_registers(module: dict) -> Iterator[tuple[str, dict, int, int]]:
+    """Yield ``(name, register, start, end)`` for every register of *module*.
+
+    A group's base is the offset of the instance using it (ATDF), else the
+    group's own offset (SVD).  Registers without a size count as 8 bits.
+    Loader records are read through their int fields; plain dicts (tests,
+    hand-built metadata) are parsed.
+    """
+    instances = module.get("instances", [])
+    for rg_name, rg in module.get("register_groups", {}).items():
+        base = next(
+            (_int(inst.get("offset")) for inst in instances if inst.get("register_group") == rg_name),
+            None,
+        )
+        if base is None:
+            base = (rg.offset or 0) if isinstance(rg, RegisterGroup) else _int(rg.get("offset"))
+        for reg_name, reg in rg.get("registers", {}).items():
+            if isinstance(reg, Register):
+                offset, bits = reg.offset, reg.size or 8
+            else:
+                offset, bits = _int(reg.get("offset")), _int(reg.get("size") or 8)
+            start = base + offset
+            yield reg_name, reg, start, start + max(1, bits // 8)
+
+
+def _int(value) -> int:
+    if not value:
+        return 0
+    return int(value, 0) if isinstance(value, str) else int(value)
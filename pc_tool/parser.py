@@ -7,16 +7,25 @@ from typing import Callable
 from pc_tool.common.logger import MDTLogger
 from pc_tool.common.terminal import Terminal
 from pc_tool.common.dataclasses import Command, CommandPacket
-from pc_tool.common.protocol import deserialize_command_packet
-from pc_tool.common.elf_symbols import resolve_symbol, check_watchpoint_alignment
+from pc_tool.common.protocol import PacketView
+from pc_tool.common.elf_symbols import resolve_symbol, find_local_statics, check_watchpoint_alignment
+from pc_tool.metadata import register_index
+
+# Imported by the first CLIHistory: script and fleet runs never need line editing
+readline = None
 
-try:
-    import readline
-except ImportError:
-    try:
-        import pyreadline3 as readline
-    except ImportError:
-        readline = None
+
+def _import_readline():
+    global readline
+    if readline is None:
+        try:
+            import readline
+        except ImportError:
+            try:
+                import pyreadline3 as readline
+            except ImportError:
+                readline = None
+    return readline
 
 
 class CLIHistory:
@@ -33,7 +42,7 @@ class CLIHistory:
         # uppercase to match the parser). Empty list = completion disabled.
         self._completions = sorted({c.upper() for c in (completions or [])})
 
-        if readline:
+        if _import_readline():
             readline.set_history_length(self.max_length)
 
             if self.history_file.exists():
@@ -92,26 +101,47 @@ def parse_args():
         default=None,
         help="Path to a script file with commands to execute (exits after completion)",
     )
+    parser.add_argument(
+        "--fleet",
+        type=str,
+        nargs="+",
+        metavar="TARGET",
+        default=None,
+        help="Run --script/--command on several boards at once. Each TARGET is a "
+             "build_info.yaml or a port; bare ports use build_info's MCU config",
+    )
+    parser.add_argument(
+        "--command",
+        type=str,
+        required=False,
+        default=None,
+        help="Single command to run in fleet mode (e.g. \"READ_MEM RAM 0x20000000 16\")",
+    )
+    parser.add_argument(
+        "--report",
+        type=str,
+        required=False,
+        default=None,
+        help="Write the fleet report as JSON to this path",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Print how long each start-up phase took (imports, YAML, metadata, ELF, port, sync)",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        required=False,
+        default=None,
+        help="Record every frame sent and received to this binary trace file "
+             "(inspect or replay it with mcu-mdt-trace)",
+    )
     return parser.parse_args()
 
 
 
 # Register name -> address resolution (used by uint32_or_str handler)
-def _get_reg_group_base(module: dict, rg_name: str, rg: dict) -> int:
-    """Return the absolute base address of a register group.
-
-    For SVD (STM32) the base lives on the module instance (offset field).
-    For ATDF (AVR) it may live on the register group itself.
-    Handles both int and hex-string offsets.
-    """
-    for inst in module.get("instances", []):
-        if inst.get("register_group") == rg_name:
-            offset = inst.get("offset") or 0
-            return int(offset, 0) if isinstance(offset, str) else int(offset)
-    group_offset = rg.get("offset") or 0
-    return int(group_offset, 0) if isinstance(group_offset, str) else int(group_offset)
-
-
 def resolve_register_address(name: str, mcu_metadata: dict) -> int | None:
     """Look up a register by name and return its absolute address.
 
@@ -128,31 +158,7 @@ def resolve_register_address(name: str, mcu_metadata: dict) -> int | None:
        the same bare name exists in multiple peripherals the first match wins
        (use the qualified form to be precise).
     """
-    name_upper = name.upper()
-    modules    = mcu_metadata.get("modules", {})
-
-    def _reg_offset(reg: dict) -> int:
-        off = reg.get("offset") or 0
-        return int(off, 0) if isinstance(off, str) else int(off)
-
-    if "_" in name_upper:
-        periph, reg_part = name_upper.split("_", 1)
-        if periph in modules:
-            module = modules[periph]
-            for rg_name, rg in module.get("register_groups", {}).items():
-                base = _get_reg_group_base(module, rg_name, rg)
-                for reg_name, reg in rg.get("registers", {}).items():
-                    if reg_name.upper() == reg_part:
-                        return base + _reg_offset(reg)
-
-    for module in modules.values():
-        for rg_name, rg in module.get("register_groups", {}).items():
-            base = _get_reg_group_base(module, rg_name, rg)
-            for reg_name, reg in rg.get("registers", {}).items():
-                if reg_name.upper() == name_upper:
-                    return base + _reg_offset(reg)
-
-    return None
+    return register_index(mcu_metadata).address_of(name)
 
 
 # Parameter type handlers
@@ -193,10 +199,7 @@ def _parse_symbol_or_uint32(ctx: _ParseContext) -> int:
 
     if sym is None:
         # Compiler-mangled local statics appear as  varname.N  in the symbol table
-        candidates = [
-            s for k, s in ctx.elf_symbols.items()
-            if k == ctx.pvalue or k.startswith(ctx.pvalue + ".")
-        ]
+        candidates = find_local_statics(ctx.pvalue, ctx.elf_symbols)
         if len(candidates) == 1:
             sym = candidates[0]
             MDTLogger.info(f"Resolved '{ctx.pvalue}' -> '{sym.name}' (local static)")
@@ -381,5 +384,7 @@ def parse_line(
 
 def parse_packet(packet: bytes) -> None:
     """Print the contents of a received packet in human-readable form."""
-    cmd = deserialize_command_packet(packet)
-    Terminal.packet(cmd, raw=packet)
\ No newline at end of file
+    view = PacketView(packet)
+    if not view.valid:
+        raise ValueError(view.error)
+    Terminal.packet(view)
\ No newline at end of file
@@ -0,0 +1,218 @@
+import argparse
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from pc_tool.event import EventHandler
+from pc_tool.common.enums import CommandId, EventType
+from pc_tool.common.protocol import PacketView
+from pc_tool.common.trace import TraceDirection, TraceReader, TraceRecord
+from pc_tool.common.uart_io import MCUSerialLink
+
+
+class ReplayLink(MCUSerialLink):
+    """Stand-in ``MCUSerialLink`` that answers from a recorded trace.
+
+    Each received frame is released by ``read_packet`` only once as many
+    frames have been sent as had been sent before it was recorded, so
+    replies never overtake the commands that caused them.  ``speed``
+    replays the recorded gaps (1.0 = real time, 2.0 = twice as fast);
+    0 delivers every frame as soon as it is released.  Frames sent that
+    differ from the recording are counted in ``mismatches``.
+    """
+
+    def __init__(self, records: list[TraceRecord], speed: float = 0.0, **link_kwargs) -> None:
+        super().__init__(port="replay://", reset_delay=0, **link_kwargs)
+        self.speed      = speed
+        self.tx_frames  = [r.frame for r in records if r.direction == TraceDirection.TX]
+        self.sent       = 0
+        self.mismatches = 0
+        self._rx: deque = deque()
+        gate = 0
+        for r in records:
+            if r.direction == TraceDirection.TX:
+                gate += 1
+            else:
+                self._rx.append((gate, r.time_ns, r.frame))
+        self.received = 0
+        self._cond    = threading.Condition()
+        self._t0      = None      # (wall clock, recorded ns) of the first delivered frame
+
+    @property
+    def drained(self) -> bool:
+        """Every recorded frame has been delivered."""
+        return not self._rx
+
+    def open(self, sync: bool = True) -> None:
+        pass
+
+    def close(self) -> None:
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+
+    def send_packet(self, packet: bytes) -> None:
+        with self._cond:
+            if self.sent >= len(self.tx_frames) or bytes(packet) != self.tx_frames[self.sent]:
+                self.mismatches += 1
+            self.sent += 1
+            self._cond.notify_all()
+
+    def wait_delivered(self, timeout: float | None = None) -> bool:
+        """Wait until every frame released by the frames sent so far has been read."""
+        def delivered() -> bool:
+            return not (self._rx and self._rx[0][0] <= self.sent)
+
+        with self._cond:
+            return self._cond.wait_for(delivered, timeout)
+
+    def _pace(self, recorded_ns: int) -> None:
+        if not self.speed:
+            return
+        if self._t0 is None:
+            self._t0 = (time.monotonic(), recorded_ns)
+        due = self._t0[0] + (recorded_ns - self._t0[1]) / 1e9 / self.speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def read_packet(self, timeout: float = 1.0) -> bytes | None:
+        def released() -> bool:
+            return not self.running or bool(self._rx and self._rx[0][0] <= self.sent)
+
+        with self._cond:
+            if not self._cond.wait_for(released, timeout) or not self._rx or not self.running:
+                return None
+            _, recorded_ns, frame = self._rx.popleft()
+            self._cond.notify_all()
+        self._pace(recorded_ns)
+        self.received += 1
+        return frame
+
+
+@dataclass
+class ReplayReport:
+    frames_tx:      int
+    frames_rx:      int
+    responses:      int
+    nacks:          int
+    events:         int
+    invalid:        int
+    mismatches:     int
+    recorded_time:  float
+    replay_time:    float
+
+    def lines(self) -> list[str]:
+        rate = (self.frames_tx + self.frames_rx) / self.replay_time if self.replay_time else 0.0
+        return [
+            f"Frames:    {self.frames_tx} sent, {self.frames_rx} received "
+            f"({self.mismatches} sent frame(s) differ from the trace)",
+            f"Responses: {self.responses} ({self.nacks} NACK), events: {self.events}, "
+            f"invalid frames: {self.invalid}",
+            f"Time:      recorded {self.recorded_time:.3f}s, replayed {self.replay_time:.3f}s "
+            f"({rate:,.0f} frames/s)",
+        ]
+
+
+def replay_trace(path: str, speed: float = 0.0, timeout: float = 5.0) -> ReplayReport:
+    """Feed a recorded session back through ``EventHandler.rx_worker`` and a ``ReplayLink``.
+
+    The recorded commands are sent in order, each after the replies to the
+    previous one (as the Commander would wait for them), and every reply
+    goes through the same routing, validation and event buffer as a live
+    session.  Nothing is printed per frame.
+    """
+    trace   = TraceReader(path)
+    records = list(trace.records())
+    link    = ReplayLink(records, speed=speed)
+    handler = EventHandler(link)
+    worker  = threading.Thread(target=handler.rx_worker, daemon=True)
+
+    responses = nacks = invalid = 0
+
+    def take_responses():
+        nonlocal responses, nacks, invalid
+        while True:
+            raw = link.get_response_packet(timeout=0)
+            if raw is None:
+                return
+            view = PacketView(raw)
+            responses += 1
+            nacks     += view.is_nack
+            invalid   += not view.valid
+
+    t0 = time.perf_counter()
+    worker.start()
+    for frame in link.tx_frames:
+        link.send_packet(frame)
+        # Replies recorded before the next command are read before it is sent
+        link.wait_delivered(timeout)
+        take_responses()
+    link.close()
+    worker.join(timeout=2.0)
+    elapsed = time.perf_counter() - t0
+    take_responses()
+
+    events = link.event_queue.stats()
+    return ReplayReport(
+        frames_tx=link.sent, frames_rx=link.received, responses=responses, nacks=nacks,
+        events=events["received"], invalid=invalid, mismatches=link.mismatches,
+        recorded_time=trace.duration_ns / 1e9, replay_time=elapsed,
+    )
+
+
+def _describe(frame: bytes) -> str:
+    view = PacketView(frame)
+    if view.is_event:
+        try:
+            what = EventType(view.mem_byte).name
+        except ValueError:
+            what = f"event {view.mem_byte}"
+    else:
+        try:
+            what = CommandId(view.cmd_id).name
+        except ValueError:
+            what = f"cmd 0x{view.cmd_id:02X}"
+        what += " NACK" if view.is_nack else " ACK" if view.is_ack else ""
+    status = "" if view.valid else f"  !{view.error}"
+    return f"{what:<32} seq={view.seq:<3} addr=0x{view.address:08X} {frame.hex()}{status}"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="mcu-mdt-trace", description="MCU-MDT session trace tools")
+    sub    = parser.add_subparsers(dest="cmd", required=True)
+
+    p_dump = sub.add_parser("dump", help="Print the frames of a trace")
+    p_dump.add_argument("--start", type=float, default=None, help="First second to print")
+    p_dump.add_argument("--end",   type=float, default=None, help="Last second to print")
+    p_replay = sub.add_parser("replay", help="Replay a trace through a stand-in link and report")
+    p_replay.add_argument("--speed", type=float, default=0.0,
+                          help="1.0 replays the recorded timing; 0 (default) runs flat out")
+    for p in (p_dump, p_replay):
+        p.add_argument("trace", help="Trace file written with mcu-mdt --trace")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "dump":
+            def ns(seconds: float | None) -> int | None:
+                return int(seconds * 1e9) if seconds is not None else None
+
+            trace = TraceReader(args.trace)
+            for rec in trace.records(ns(args.start), ns(args.end)):
+                print(f"{rec.time_ns / 1e9:12.6f}  {rec.direction.name}  {_describe(rec.frame)}")
+            if not trace.complete:
+                print("(trace was not closed cleanly; index rebuilt from block headers)")
+            return 0
+
+        report = replay_trace(args.trace, speed=args.speed)
+    except (OSError, ValueError) as exc:
+        print(f"ERROR: {exc}")
+        return 1
+    print("\n".join(report.lines()))
+    return 0 if not report.mismatches else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+
+from pc_tool.common.enums import MemType
+from pc_tool.common.logger import MDTLogger
+
+# MemType -> memory segment type string in MCU metadata (same mapping as the validator)
+_MEM_TYPE_STR = {
+    MemType.RAM:    "ram",
+    MemType.FLASH:  "flash",
+    MemType.EEPROM: "eeprom",
+}
+
+DEFAULT_BLOCK_SIZE = 64
+DEFAULT_MAX_BLOCKS = 256
+
+
+class ShadowMemory:
+    """PC-side cache of target memory, in fixed-size blocks with LRU eviction.
+
+    Only memory types listed in ``max_age`` are cached, and a cached block
+    is served for at most ``max_age[mem]`` seconds after it was read; the
+    target keeps running between reads, so this bound is what keeps the
+    shadow honest.  Blocks never extend past the memory segment they were
+    read from (``regions``), so a block-aligned refill cannot touch an
+    address the validator would have rejected.
+
+    Writes that went through ``Commander`` patch the blocks they cover;
+    ``invalidate`` drops everything (RESET, breakpoint/watchpoint hits).
+    Safe to share between the CLI thread and the event listener thread.
+
+    Usage::
+
+        shadow = ShadowMemory.from_config(loader.mcu_metadata, {"max_age": {"RAM": 0.25}})
+        commander = Commander(serial_link, shadow=shadow)
+    """
+
+    def __init__(
+        self,
+        regions:    dict[int, list[tuple[int, int]]],
+        max_age:    dict[int, float],
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_blocks: int = DEFAULT_MAX_BLOCKS,
+        clock:      Callable[[], float] = time.monotonic,
+    ) -> None:
+        if block_size <= 0 or block_size & (block_size - 1):
+            raise ValueError(f"Shadow block size must be a power of two, got {block_size}.")
+        self.regions    = regions          # mem -> [(start, end_exclusive), ...]
+        self.max_age    = max_age          # mem -> seconds
+        self.block_size = block_size
+        self.max_blocks = max(1, max_blocks)
+        self.hits       = 0
+        self.misses     = 0
+        self._clock     = clock
+        self._lock      = threading.Lock()
+        # (mem, block base) -> [data, valid_lo, valid_hi, read time]
+        self._blocks: OrderedDict[tuple[int, int], list] = OrderedDict()
+
+    @classmethod
+    def from_config(cls, mcu_metadata: dict, config: dict | None) -> "ShadowMemory | None":
+        """Build a shadow from the ``shadow:`` section of build_info.yaml; None if absent.
+
+        ``max_age`` maps memory names (RAM, EEPROM, FLASH) to seconds::
+
+            shadow:
+              block_size: 64
+              max_blocks: 256
+              max_age: {RAM: 0.25, EEPROM: 5.0}
+        """
+        if not config:
+            return None
+
+        max_age = {}
+        for name, seconds in (config.get("max_age") or {"RAM": 0.25}).items():
+            try:
+                max_age[MemType[str(name).upper()]] = float(seconds)
+            except KeyError:
+                MDTLogger.warning(f"Ignoring unknown shadow memory type '{name}'.")
+
+        regions: dict[int, list[tuple[int, int]]] = {}
+        for mem in max_age:
+            wanted = _MEM_TYPE_STR.get(mem)
+            for seg in mcu_metadata.get("memories", {}).values():
+                if seg.get("type") != wanted:
+                    continue
+                start = _int(seg.get("start"))
+                regions.setdefault(mem, []).append((start, start + _int(seg.get("size"))))
+
+        return cls(
+            regions    = regions,
+            max_age    = max_age,
+            block_size = int(config.get("block_size", DEFAULT_BLOCK_SIZE)),
+            max_blocks = int(config.get("max_blocks", DEFAULT_MAX_BLOCKS)),
+        )
+
+    # Queries
+    def _region(self, mem: int, address: int, length: int) -> tuple[int, int] | None:
+        for start, end in self.regions.get(mem, ()):
+            if start <= address and address + length <= end:
+                return start, end
+        return None
+
+    def cacheable(self, mem: int | None, address: int, length: int) -> bool:
+        """True if a read of this range may be served from (and fill) the shadow."""
+        if mem not in self.max_age or length <= 0:
+            return False
+        if self._region(mem, address, length) is None:
+            return False
+        first = address - address % self.block_size
+        return (address + length - first) <= self.max_blocks * self.block_size
+
+    def lookup(self, mem: int, address: int, length: int, record: bool = True) -> bytearray | None:
+        """Return the cached bytes for the range, or None unless every byte is fresh.
+
+        *record* counts the call in ``hits``/``misses``.
+        """
+        bs, limit = self.block_size, self.max_age.get(mem)
+        if limit is None:
+            return None
+
+        with self._lock:
+            now = self._clock()
+            out = bytearray(length)
+            pos, end = address, address + length
+            keys = []
+            while pos < end:
+                base  = pos - pos % bs
+                entry = self._blocks.get((mem, base))
+                if entry is None or now - entry[3] > limit:
+                    self.misses += record
+                    return None
+                data, lo, hi, _ = entry
+                off = pos - base
+                n   = min(end, base + hi) - pos
+                if off < lo or n <= 0:
+                    self.misses += record
+                    return None
+                out[pos - address : pos - address + n] = data[off : off + n]
+                keys.append((mem, base))
+                pos += n
+
+            for key in keys:
+                self._blocks.move_to_end(key)
+            self.hits += record
+            return out
+
+    def missing(self, mem: int, address: int, length: int) -> list[tuple[int, int]]:
+        """Block-aligned ``(address, length)`` runs to read so the range becomes cached.
+
+        Adjacent missing or stale blocks are merged into one run, and runs
+        are clipped to the memory segment that holds the request.
+        """
+        region = self._region(mem, address, length)
+        if region is None:
+            return [(address, length)]
+        rs, re = region
+        bs     = self.block_size
+        limit  = self.max_age[mem]
+
+        runs: list[list[int]] = []
+        with self._lock:
+            now  = self._clock()
+            base = address - address % bs
+            while base < address + length:
+                entry = self._blocks.get((mem, base))
+                lo, hi = max(base, rs), min(base + bs, re)
+                fresh = (
+                    entry is not None and now - entry[3] <= limit
+                    and entry[1] <= lo - base and entry[2] >= hi - base
+                )
+                if not fresh:
+                    if runs and runs[-1][1] == lo:
+                        runs[-1][1] = hi
+                    else:
+                        runs.append([lo, hi])
+                base += bs
+
+        return [(lo, hi - lo) for lo, hi in runs]
+
+    # Updates
+    def store(self, mem: int, address: int, data: bytes) -> None:
+        """Cache *data* read from the target at *address* (block-aligned runs from ``missing``)."""
+        bs  = self.block_size
+        end = address + len(data)
+        with self._lock:
+            now = self._clock()
+            pos = address
+            while pos < end:
+                base = pos - pos % bs
+                lo   = pos - base
+                hi   = min(end - base, bs)
+                key  = (mem, base)
+                entry = self._blocks.get(key)
+                if (entry is None or now - entry[3] > self.max_age[mem]
+                        or hi < entry[1] or lo > entry[2]):
+                    entry = [bytearray(bs), lo, hi, now]
+                    self._blocks[key] = entry
+                else:
+                    # Overlapping or adjacent span: widen it
+                    entry[1], entry[2], entry[3] = min(entry[1], lo), max(entry[2], hi), now
+                entry[0][lo:hi] = data[pos - address : pos - address + (hi - lo)]
+                self._blocks.move_to_end(key)
+                pos = base + hi
+
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+
+    def update(self, mem: int, address: int, data: bytes) -> None:
+        """Write-through: patch the cached blocks a successful write covered.
+
+        Blocks that are not cached stay uncached; the read time is not
+        refreshed, since the rest of the block is as old as it was.
+        """
+        if mem not in self.max_age:
+            return
+        bs  = self.block_size
+        end = address + len(data)
+        with self._lock:
+            pos = address
+            while pos < end:
+                base  = pos - pos % bs
+                stop  = min(end, base + bs)
+                entry = self._blocks.get((mem, base))
+                if entry is not None:
+                    # Bytes outside the block's valid span are never served; skip them
+                    lo, hi = max(pos - base, entry[1]), min(stop - base, entry[2])
+                    if lo < hi:
+                        entry[0][lo:hi] = data[base + lo - address : base + hi - address]
+                pos = stop
+
+    def invalidate(self, mem: int | None = None, address: int | None = None, length: int | None = None) -> None:
+        """Drop cached blocks: all of them, one memory type, or one range of it."""
+        with self._lock:
+            if mem is None:
+                self._blocks.clear()
+                return
+            if address is None:
+                for key in [k for k in self._blocks if k[0] == mem]:
+                    del self._blocks[key]
+                return
+            bs   = self.block_size
+            base = address - address % bs
+            while base < address + (length or 1):
+                self._blocks.pop((mem, base), None)
+                base += bs
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+
+def _int(value) -> int:
+    return int(value, 0) if isinstance(value, str) else (value or 0)
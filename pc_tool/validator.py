@@ -4,6 +4,7 @@ from pc_tool.common.enums import (
     MDT_MAX_BREAKPOINTS, MDT_MAX_WATCHPOINTS,
 )
 from pc_tool.common.logger import MDTLogger
+from pc_tool.metadata import RegisterHit, register_index
 
 # Map MemType enum - ATDF/SVD type string used in metadata
 _MEM_TYPE_STR = {
@@ -19,19 +20,6 @@ def _int(value) -> int:
     return int(value, 0) if isinstance(value, str) else (value or 0)
 
 
-def _resolve_group_base(module: dict, rg_name: str, rg: dict) -> int:
-    """Return the absolute base address of a register group.
-
-    For ATDF (AVR) the true base lives on the module instance, not on the
-    register group.  For SVD (STM32) there are no instances, so the base
-    is stored directly on the register group's offset field.
-    """
-    for inst in module.get("instances", []):
-        if inst.get("register_group") == rg_name:
-            return _int(inst.get("offset") or 0)
-    return _int(rg.get("offset") or 0)
-
-
 def _find_mem_segment(mcu_metadata: dict, mem_type: MemType, addr: int, length: int):
     """Return the matching memory segment dict, or None if out of range."""
     wanted = _MEM_TYPE_STR.get(mem_type)
@@ -61,24 +49,10 @@ def _find_mem_segment(mcu_metadata: dict, mem_type: MemType, addr: int, length:
     return None
 
 
-def _find_register(mcu_metadata: dict, addr: int):
+def _find_register(mcu_metadata: dict, addr: int) -> RegisterHit | None:
     """Return (module_name, reg_name, reg, absolute_start, absolute_end) for the
     register that contains ``addr``, or None if not found."""
-    for module_name, module in mcu_metadata.get("modules", {}).items():
-        for rg_name, rg in module.get("register_groups", {}).items():
-            base = _resolve_group_base(module, rg_name, rg)
-
-            for reg_name, reg in rg.get("registers", {}).items():
-                offset        = _int(reg.get("offset") or 0)
-                size_bits     = _int(reg.get("size") or 8)
-                size_bytes    = max(1, size_bits // 8)
-                abs_start     = base + offset
-                abs_end       = abs_start + size_bytes
-
-                if abs_start <= addr < abs_end:
-                    return module_name, reg_name, reg, abs_start, abs_end
-
-    return None
+    return register_index(mcu_metadata).find(addr)
 
 
 # Memory validators
@@ -1,4 +1,6 @@
 # Fixtures
+import struct
+
 from pc_tool.common.enums import MDT_PACKET_SIZE
 
 
@@ -186,6 +188,25 @@ def _reg_meta(base=0x40013800, reg_offset=0x00, reg_size_bits=32, rw="read-write
     }
 
 
+def write_elf32(path: str, segments: list[tuple[int, int, bytes]]) -> None:
+    """Write a minimal little-endian ARM ELF32 with one PT_LOAD per (vaddr, paddr, data)."""
+    header_size, phdr_size = 52, 32
+    offset  = header_size + phdr_size * len(segments)
+    phdrs   = b""
+    payload = b""
+    for vaddr, paddr, data in segments:
+        phdrs   += struct.pack("<8I", 1, offset + len(payload), vaddr, paddr, len(data), len(data), 5, 4)
+        payload += data
+
+    ident  = b"\x7fELF" + bytes([1, 1, 1]) + bytes(9)
+    header = ident + struct.pack(
+        "<HHIIIIIHHHHHH", 2, 40, 1, 0, header_size, 0, 0,
+        header_size, phdr_size, len(segments), 40, 0, 0,
+    )
+    with open(path, "wb") as f:
+        f.write(header + phdrs + payload)
+
+
 # Mock infrastructure
 class MockUART:
     """Perfect byte-level loopback, bytes written are instantly readable."""
@@ -206,4 +227,158 @@ class MockUART:
 
     @property
     def pending(self) -> int:
-        return len(self._buf)
\ No newline at end of file
+        return len(self._buf)
+
+class FakeSerialLink:
+    """In-memory stand-in for ``MCUSerialLink`` that answers like the firmware.
+
+    Every packet handed to ``send_packet`` is ACKed into ``response_queue``
+    the way ``mdt_handle_packet`` does it: the request is echoed with the
+    ACK flag set and, for reads, DATA filled from ``memory`` (a bytearray
+    mapped at ``base``).  Writes land in ``memory`` as well.
+
+    Knobs for failure injection:
+      rx_capacity  frames the MCU can hold before its RX ring overflows;
+                   packets sent while that many are unanswered are dropped.
+                   ``None`` means unlimited.
+      nack_once    set of SEQ values NACKed the first time they are seen.
+      drop_once    set of SEQ values silently dropped the first time.
+      hold_once    set of SEQ values whose first ACK is held back until that
+                   SEQ is sent again, then delivered ahead of the new answer.
+    """
+
+    def __init__(self, base=0x20000000, size=0x400, rx_capacity=None):
+        self.base        = base
+        self.memory      = bytearray(size)
+        self.rx_capacity = rx_capacity
+        self.nack_once   = set()
+        self.drop_once   = set()
+        self.hold_once   = set()
+        self.sent        = []       # every packet handed to send_packet, in order
+        self.running     = True
+        self._responses  = []
+        self._held       = {}
+
+    def _ack(self, pkt: bytes) -> bytes:
+        from pc_tool.common.enums import MDTOffset, MDTFlags, CommandId
+        from pc_tool.common.protocol import calculate_crc16
+
+        out    = bytearray(pkt)
+        cmd_id = pkt[MDTOffset.CMD_ID]
+        addr   = int.from_bytes(pkt[MDTOffset.ADDRESS:MDTOffset.ADDRESS + 4], "little")
+        length = int.from_bytes(pkt[MDTOffset.LENGTH:MDTOffset.LENGTH + 2], "little")
+        off    = addr - self.base
+
+        if cmd_id in (CommandId.READ_MEM, CommandId.READ_REG):
+            out[MDTOffset.DATA:MDTOffset.DATA + length] = self.memory[off:off + length]
+        elif cmd_id in (CommandId.WRITE_MEM, CommandId.WRITE_REG):
+            self.memory[off:off + length] = pkt[MDTOffset.DATA:MDTOffset.DATA + length]
+
+        out[MDTOffset.FLAGS] |= MDTFlags.ACK_NACK
+        crc = calculate_crc16(bytes(out[MDTOffset.CMD_ID:MDTOffset.CRC]))
+        out[MDTOffset.CRC:MDTOffset.CRC + 2] = crc.to_bytes(2, "little")
+        return bytes(out)
+
+    def _nack(self, pkt: bytes) -> bytes:
+        from pc_tool.common.enums import MDTOffset, MDTFlags
+        from pc_tool.common.protocol import calculate_crc16
+
+        out = bytearray(MDT_PACKET_SIZE)
+        out[MDTOffset.START] = 0xAA
+        out[MDTOffset.FLAGS] = MDTFlags.ACK_NACK | MDTFlags.STATUS_ERROR
+        out[MDTOffset.SEQ]   = pkt[MDTOffset.SEQ]
+        out[MDTOffset.END]   = 0x55
+        crc = calculate_crc16(bytes(out[MDTOffset.CMD_ID:MDTOffset.CRC]))
+        out[MDTOffset.CRC:MDTOffset.CRC + 2] = crc.to_bytes(2, "little")
+        return bytes(out)
+
+    def send_packet(self, packet: bytes) -> None:
+        from pc_tool.common.enums import MDTOffset
+
+        packet = bytes(packet)
+        self.sent.append(packet)
+        seq = packet[MDTOffset.SEQ]
+
+        if seq in self._held:
+            self._responses.append(self._held.pop(seq))
+        if self.rx_capacity is not None and len(self._responses) >= self.rx_capacity:
+            return
+        if seq in self.drop_once:
+            self.drop_once.discard(seq)
+            return
+        if seq in self.nack_once:
+            self.nack_once.discard(seq)
+            self._responses.append(self._nack(packet))
+            return
+        if seq in self.hold_once:
+            self.hold_once.discard(seq)
+            self._held[seq] = self._ack(packet)
+            return
+        self._responses.append(self._ack(packet))
+
+    def get_response_packet(self, timeout: float = 1.0) -> bytes | None:
+        return self._responses.pop(0) if self._responses else None
+
+    def push_back_packet(self, pkt: bytes) -> None:
+        self._responses.append(pkt)
+
+class FakeMCUServer:
+    """``FakeSerialLink`` served over TCP, for ``socket://`` links.
+
+    Frames written by the client are answered by ``board`` (a
+    ``FakeSerialLink``), so all its knobs and ``memory`` work unchanged.
+    ``emit(pkt)`` pushes an unsolicited frame (e.g. an event) to the client.
+
+    Usage::
+
+        server = FakeMCUServer()
+        link   = AsyncMCUSerialLink(server.url, reset_delay=0)
+    """
+
+    def __init__(self, board: FakeSerialLink | None = None):
+        import socket
+        import threading
+
+        self.board = board if board is not None else FakeSerialLink()
+        self._srv  = socket.socket()
+        self._srv.bind(("127.0.0.1", 0))
+        self._srv.listen(1)
+        self.url   = f"socket://127.0.0.1:{self._srv.getsockname()[1]}"
+        self._conn = None
+        self._lock = threading.Lock()
+        self._accepted = threading.Event()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        try:
+            conn, _ = self._srv.accept()
+        except OSError:
+            return
+        self._conn = conn
+        self._accepted.set()
+        buf = b''
+        with conn:
+            while True:
+                try:
+                    chunk = conn.recv(4096)
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                buf += chunk
+                while len(buf) >= MDT_PACKET_SIZE:
+                    frame, buf = buf[:MDT_PACKET_SIZE], buf[MDT_PACKET_SIZE:]
+                    self.board.send_packet(frame)
+                    while (resp := self.board.get_response_packet()) is not None:
+                        self.emit(resp)
+        self._srv.close()
+
+    def emit(self, pkt: bytes) -> None:
+        self._accepted.wait(timeout=2.0)
+        with self._lock:
+            self._conn.sendall(pkt)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        self._srv.close()
@@ -251,7 +251,7 @@ def _send_parsed(link: MCUSerialLink, cmd: Command, **kw):
     except ValueError:
         return None
 
-# CMD_ID=0 packet — identical to what _event_poll_worker sends every 500 ms.
+# CMD_ID=0 packet — identical to what _event_poll_worker sends.
 _POLL_PKT = serialize_command_packet(
     Command(name="POLL", id=0x00, mem=None, address=0, data=None),
     seq=0, multi=False, last=False,
@@ -266,7 +266,7 @@ def _read_event(link: MCUSerialLink) -> bytes | None:
 
     - **UART idle / interrupt mode** (uart_idle=True, STM32 default): the MCU
       holds the event until a CMD_ID=0 poll packet arrives, exactly as the
-      production _event_poll_worker does every 500 ms. Send the poll first.
+      production _event_poll_worker does. Send the poll first.
     """
     if HW.uart_idle:
         link.send_packet(_POLL_PKT)
@@ -0,0 +1,219 @@
+"""
+ASYNCIO TRANSPORT TESTS FOR MCU-MDT
+
+Validates ``AsyncMCUSerialLink`` and ``AsyncCommander`` over real ``socket://``
+connections, with ``FakeMCUServer`` answering like the firmware.
+
+Coverage:
+1. Ping, write and read round trips, stop-and-wait and windowed; open skips needless reset waits
+2. NACK retransmission, timeout fallback to window=1, no SEQ reuse past a stuck chunk
+3. Event packets are delivered through the events() async iterator
+4. Clean poll ACKs never reach the response queue
+5. One event loop drives several boards concurrently without extra threads
+
+Assumptions:
+1. pyserial is installed (socket:// URL handler).
+2. The loopback interface is available.
+3. FakeSerialLink mirrors mdt_handle_packet (validated in test_commander.py).
+
+Goal:
+Ensure the asyncio path puts the same frames on the wire and returns the same
+data as the threaded Commander.
+"""
+
+import asyncio
+import threading
+import time
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.commander import AsyncCommander
+from pc_tool.common.async_io import AsyncMCUSerialLink
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.enums import CommandId, EventType, MDTFlags, MDTOffset, MemType, MDT_PACKET_SIZE
+from pc_tool.common.protocol import calculate_crc16, serialize_command_packet
+from test.common.mdtfixtures import FakeMCUServer
+
+
+def _write(address=0x20000000, data=bytes(range(16))):
+    return Command(name="WRITE_MEM", id=CommandId.WRITE_MEM,
+                   mem=MemType.RAM, address=address, data=data, length=len(data))
+
+def _read(address=0x20000000, length=16):
+    return Command(name="READ_MEM", id=CommandId.READ_MEM,
+                   mem=MemType.RAM, address=address, data=None, length=length)
+
+def _ping():
+    return Command(name="PING", id=CommandId.PING, mem=None, address=0, data=None, length=0)
+
+def _ping_packet():
+    return serialize_command_packet(_ping(), seq=0, multi=False, last=False)
+
+def _event(event_type=EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT, slot=1, data=7) -> bytes:
+    pkt = bytearray(MDT_PACKET_SIZE)
+    pkt[MDTOffset.START]  = 0xAA
+    pkt[MDTOffset.FLAGS]  = MDTFlags.EVENT_PACKET
+    pkt[MDTOffset.SEQ]    = slot
+    pkt[MDTOffset.MEM_ID] = event_type
+    pkt[MDTOffset.DATA:MDTOffset.DATA + 4] = data.to_bytes(4, "little")
+    pkt[MDTOffset.CRC:MDTOffset.CRC + 2]   = calculate_crc16(bytes(pkt[1:15])).to_bytes(2, "little")
+    pkt[MDTOffset.END]    = 0x55
+    return bytes(pkt)
+
+def _run(coro_fn, server=None, reset_delay=0, **link_kwargs):
+    """Open a link to *server*, run ``coro_fn(link, server)``, close the link."""
+    server = server or FakeMCUServer()
+
+    async def main():
+        async with AsyncMCUSerialLink(server.url, reset_delay=reset_delay, **link_kwargs) as link:
+            return await coro_fn(link, server)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+def _link_threads() -> int:
+    """Live threads, not counting the event loop's executor (port open/close run there)."""
+    return sum(not t.name.startswith("asyncio_") for t in threading.enumerate())
+
+
+def test_ping():
+    async def body(link, _):
+        return await AsyncCommander(link).ping(_ping())
+    assert_eq(_run(body), True)
+
+@parametrize("window", [(1,), (4,)])
+def test_write_then_read(window):
+    """Data written through AsyncCommander reads back identically."""
+    payload = bytes((i * 3) & 0xFF for i in range(40))
+
+    async def body(link, server):
+        commander = AsyncCommander(link, window=window)
+        assert_eq(await commander.write(_write(data=payload)), True)
+        assert_eq(bytes(server.board.memory[:40]), payload)
+        return await commander.read(_read(length=40))
+
+    assert_eq(bytes(_run(body)), payload)
+
+@parametrize("startup_ping", [(None,), (bytes(_ping_packet()),)])
+def test_open_skips_reset_delay_when_not_needed(startup_ping):
+    """socket:// has no reset line and an answered ping means the MCU is up: no 5 s wait."""
+    async def body(link, _):
+        return link.response_queue.qsize()
+
+    t0 = time.monotonic()
+    assert_eq(_run(body, reset_delay=5.0, startup_ping=startup_ping), 0)
+    assert_eq(time.monotonic() - t0 < 2.0, True)
+
+def test_nack_is_retransmitted():
+    server = FakeMCUServer()
+    server.board.nack_once = {1}
+
+    async def body(link, server):
+        return await AsyncCommander(link, window=3).write(_write(data=bytes(range(16))))
+
+    assert_eq(_run(body, server), True)
+    assert_eq([p[MDTOffset.SEQ] for p in server.board.sent], [0, 1, 2, 3, 1])
+
+def test_timeout_falls_back_to_window_one():
+    server = FakeMCUServer()
+    server.board.drop_once = {2}
+
+    async def body(link, server):
+        commander = AsyncCommander(link, window=4, timeout=0.2)
+        ok = await commander.write(_write(data=bytes(range(24))))
+        return ok, commander.window
+
+    assert_eq(_run(body, server), (True, 1))
+    assert_eq(bytes(server.board.memory[:24]), bytes(range(24)))
+
+def test_window_does_not_run_past_stuck_chunk():
+    """A held-up chunk stops the window from sending 255 chunks on and reusing its SEQ."""
+    server = FakeMCUServer()
+    server.board.hold_once = {0}
+    memory = server.board.memory
+    memory[:] = bytes(i % 251 for i in range(len(memory)))
+
+    async def body(link, server):
+        return await AsyncCommander(link, window=4, timeout=0.2).read(_read(length=len(memory)))
+
+    assert_eq(bytes(_run(body, server)), bytes(memory))
+    assert_eq([p[MDTOffset.SEQ] for p in server.board.sent][:5], [0, 1, 2, 3, 0])
+
+def test_read_rejects_non_read_command():
+    async def body(link, _):
+        try:
+            await AsyncCommander(link).read(_write())
+        except ValueError:
+            return True
+        return False
+    assert_eq(_run(body), True)
+
+
+# Events
+def test_events_async_iterator():
+    """Unsolicited event frames come out of events() in order."""
+    async def body(link, server):
+        server.emit(_event(slot=1, data=10) + _event(slot=2, data=20))
+        seen = []
+        async for ev in link.events():
+            seen.append((ev.seq, ev.data_word))
+            if len(seen) == 2:
+                break
+        return seen
+
+    assert_eq(_run(body), [(1, 10), (2, 20)])
+
+def test_events_and_responses_are_separated():
+    """An event arriving mid-transfer does not disturb the transfer."""
+    async def body(link, server):
+        server.emit(_event())
+        data = await AsyncCommander(link).read(_read(length=8))
+        ev   = await link.get_event_packet(timeout=1.0)
+        return bytes(data), ev[MDTOffset.MEM_ID]
+
+    assert_eq(_run(body), (bytes(8), EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT))
+
+def test_poll_acks_are_discarded():
+    """With polling on, clean poll ACKs never land in the response queue."""
+    async def body(link, server):
+        await asyncio.sleep(0.3)
+        return len(server.board.sent), link.response_queue.qsize()
+
+    polls, queued = _run(body, poll_interval=0.05)
+    assert_eq(polls >= 2, True, polls=polls)
+    assert_eq(queued, 0)
+
+
+# Many boards, one loop
+def test_many_boards_one_loop():
+    """Eight boards are driven concurrently and no link starts a thread."""
+    servers = [FakeMCUServer() for _ in range(8)]
+    for i, server in enumerate(servers):
+        server.board.memory[:8] = bytes([i] * 8)
+    threads_before = _link_threads()
+
+    async def main():
+        links = [AsyncMCUSerialLink(s.url, reset_delay=0) for s in servers]
+        await asyncio.gather(*(link.open() for link in links))
+        try:
+            threads_open = _link_threads()
+            results = await asyncio.gather(
+                *(AsyncCommander(link).read(_read(length=8)) for link in links)
+            )
+            return threads_open, [bytes(r) for r in results]
+        finally:
+            await asyncio.gather(*(link.close() for link in links))
+
+    try:
+        threads_open, results = asyncio.run(main())
+    finally:
+        for server in servers:
+            server.close()
+
+    assert_eq(results, [bytes([i] * 8) for i in range(8)])
+    assert_eq(threads_open <= threads_before, True,
+              before=threads_before, after=threads_open)
@@ -0,0 +1,312 @@
+"""
+COMMANDER TESTS FOR MCU-MDT
+
+Validates the chunked transfer logic in ``Commander`` against ``FakeSerialLink``,
+an in-memory stand-in that ACKs packets the way the firmware does.
+
+Coverage:
+1. Stop-and-wait transfers (window=1) send one chunk per ACK
+2. Windowed transfers keep several chunks in flight, match ACKs by SEQ and never reuse an unACKed SEQ
+3. NACKed chunks are retransmitted alone
+4. A window the firmware cannot buffer falls back to window=1; late ACKs are matched by SEQ
+5. Retry exhaustion or a STATUS_ERROR chunk fails the transfer
+6. Shadow memory serves repeated reads and stays coherent with writes and RESET
+7. FLASH reads inside the firmware come from the ELF image once sampled words match
+8. Armed watchpoints are tracked per slot and named by the event listener
+9. Event polls are held while a transfer or ping is in flight
+
+Assumptions:
+1. FakeSerialLink mirrors mdt_handle_packet: ACKs echo the request, NACKs echo SEQ.
+2. CRC16 implementation is correct (validated separately in test_crc.py).
+
+Goal:
+Ensure that pipelining never changes what lands on the wire, only how many
+chunks are outstanding at once.
+"""
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.commander import Commander
+from pc_tool.shadow import ShadowMemory
+from pc_tool.common.elf_image import FirmwareImage
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.elf_symbols import SymbolInfo, SymbolTable
+from pc_tool.common.enums import CommandId, MemType, MDTOffset, UtilEnum, WatchpointControl, EventType, MDTFlags
+from pc_tool.common.protocol import calculate_crc16
+from pc_tool.common.poll_scheduler import PollScheduler
+from pc_tool.event import EventHandler
+from test.common.mdtfixtures import FakeSerialLink
+
+
+def _write(address=0x20000000, data=bytes(range(16))):
+    return Command(name="WRITE_MEM", id=CommandId.WRITE_MEM,
+                   mem=MemType.RAM, address=address, data=data, length=len(data))
+
+def _read(address=0x20000000, length=16):
+    return Command(name="READ_MEM", id=CommandId.READ_MEM,
+                   mem=MemType.RAM, address=address, data=None, length=length)
+
+def _seqs(link):
+    return [pkt[MDTOffset.SEQ] for pkt in link.sent]
+
+
+@parametrize("window", [(1,), (2,), (3,), (8,)])
+def test_write_lands_in_memory(window):
+    """Every window size must deliver the full payload exactly once."""
+    link    = FakeSerialLink()
+    payload = bytes(range(64))
+    Commander(link, window=window).execute(_write(data=payload))
+    assert_eq(bytes(link.memory[:64]), payload)
+    assert_eq(_seqs(link), list(range(16)))
+
+def test_window_one_is_stop_and_wait():
+    """With window=1 the response queue never holds more than one ACK."""
+    link = FakeSerialLink(rx_capacity=1)
+    Commander(link, window=1).execute(_read(length=32))
+    assert_eq(len(link.sent), 8)
+
+def test_windowed_nack_retransmits_only_that_chunk():
+    """A NACK for one SEQ resends that chunk and nothing else."""
+    link = FakeSerialLink()
+    link.nack_once = {2}
+    Commander(link, window=4).execute(_write(data=bytes(range(24))))
+    assert_eq(_seqs(link), [0, 1, 2, 3, 4, 5, 2])
+    assert_eq(bytes(link.memory[:24]), bytes(range(24)))
+
+def test_windowed_falls_back_when_firmware_cannot_buffer():
+    """Dropped frames time out; the Commander drops to window=1 and finishes."""
+    link      = FakeSerialLink(rx_capacity=2)
+    commander = Commander(link, window=4)
+    payload   = bytes(range(32))
+    commander.execute(_write(data=payload))
+    assert_eq(commander.window, 1)
+    assert_eq(bytes(link.memory[:32]), payload)
+
+def test_fallback_does_not_resend_acked_chunks():
+    """Only chunks without an ACK are resent after the fallback."""
+    link = FakeSerialLink()
+    link.drop_once = {1}
+    Commander(link, window=3).execute(_write(data=bytes(range(16))))
+    assert_eq(_seqs(link), [0, 1, 2, 3, 1])
+
+def test_late_ack_after_fallback_is_not_misattributed():
+    """An ACK arriving after the window timed out must not be taken for another chunk's."""
+
+    class LateLink(FakeSerialLink):
+        """Holds chunk 1's ACK back until the Commander has timed out once."""
+        def send_packet(self, packet):
+            super().send_packet(packet)
+            if packet[MDTOffset.SEQ] == 1 and not hasattr(self, "late"):
+                self.late = self._responses.pop()
+
+        def get_response_packet(self, timeout=1.0):
+            if not self._responses and getattr(self, "late", None):
+                self._responses.append(self.late)
+                self.late = False
+                return None
+            return super().get_response_packet(timeout)
+
+    link = LateLink()
+    link.memory[:16] = bytes(range(0x40, 0x50))
+    link.drop_once   = {2}
+    data = Commander(link, window=3).read(_read(length=16))
+    assert_eq(bytes(data), bytes(link.memory[:16]))
+    assert_eq(_seqs(link), [0, 1, 2, 3, 1, 2])
+
+def test_window_does_not_run_past_stuck_chunk():
+    """Chunks stay within one window of the oldest unACKed one, so SEQs never collide."""
+    link = FakeSerialLink()
+    link.hold_once = {0}        # chunk 0's ACK turns up only when SEQ 0 is next sent
+    link.memory[:] = bytes(i % 251 for i in range(len(link.memory)))
+    data = Commander(link, window=4).read(_read(length=len(link.memory)))
+    assert_eq(bytes(data), bytes(link.memory))
+    assert_eq(_seqs(link)[:5], [0, 1, 2, 3, 0])
+
+def test_windowed_aborts_after_max_retries():
+    """A chunk NACKed on every attempt aborts the transfer."""
+    link = FakeSerialLink()
+
+    class _AlwaysNack(set):
+        def discard(self, _):
+            pass
+
+    link.nack_once = _AlwaysNack({0})
+    Commander(link, window=2).execute(_write(data=bytes(range(8))))
+    nacked = [s for s in _seqs(link) if s == 0]
+    assert_eq(len(nacked), UtilEnum.MDT_MAX_RETRIES)
+
+def test_window_is_clamped_below_seq_wrap():
+    """SEQ wraps at 0xFF, so the window cannot exceed 0xFE."""
+    assert_eq(Commander(FakeSerialLink(), window=1000).window, 0xFE)
+    assert_eq(Commander(FakeSerialLink(), window=0).window, 1)
+
+
+# Assembled read data
+@parametrize("length,window", [(1, 1), (4, 1), (6, 1), (16, 1), (16, 3), (30, 4)])
+def test_read_returns_assembled_bytes(length, window):
+    """read() returns exactly ``length`` bytes in address order."""
+    link = FakeSerialLink()
+    link.memory[:64] = bytes((i * 7) & 0xFF for i in range(64))
+    data = Commander(link, window=window).read(_read(length=length))
+    assert_eq(bytes(data), bytes(link.memory[:length]))
+
+def test_execute_returns_read_data():
+    """execute() hands back the same buffer read() would for READ_MEM."""
+    link = FakeSerialLink()
+    link.memory[8:16] = b'\xDE\xAD\xBE\xEF\xCA\xFE\xBA\xBE'
+    data = Commander(link).execute(_read(address=0x20000008, length=8))
+    assert_eq(bytes(data), b'\xDE\xAD\xBE\xEF\xCA\xFE\xBA\xBE')
+
+def test_execute_returns_none_for_writes():
+    """Writes carry no data back."""
+    assert_eq(Commander(FakeSerialLink()).execute(_write()), None)
+
+def test_execute_returns_none_on_status_error():
+    """A read whose chunk came back with STATUS_ERROR yields None, not a partly garbage buffer."""
+    class ErrorLink(FakeSerialLink):
+        def _ack(self, pkt):
+            out = bytearray(super()._ack(pkt))
+            if out[MDTOffset.SEQ] == 1:
+                out[MDTOffset.FLAGS] |= MDTFlags.STATUS_ERROR
+                crc = calculate_crc16(bytes(out[MDTOffset.CMD_ID:MDTOffset.CRC]))
+                out[MDTOffset.CRC:MDTOffset.CRC + 2] = crc.to_bytes(2, "little")
+            return bytes(out)
+
+    assert_eq(Commander(ErrorLink()).execute(_read(length=8)), None)
+
+def test_read_reg_defaults_to_one_word():
+    """READ_REG has no length parameter; one word comes back."""
+    link = FakeSerialLink()
+    link.memory[:4] = b'\x01\x02\x03\x04'
+    cmd  = Command(name="READ_REG", id=CommandId.READ_REG, address=0x20000000)
+    assert_eq(bytes(Commander(link).read(cmd)), b'\x01\x02\x03\x04')
+
+def test_read_returns_none_on_failure():
+    """A transfer that never gets an ACK yields None, not a partial buffer."""
+    link = FakeSerialLink(rx_capacity=0)
+    assert_eq(Commander(link).read(_read(length=8)), None)
+
+def test_read_rejects_non_read_command():
+    """read() is only defined for READ_MEM/READ_REG."""
+    try:
+        Commander(FakeSerialLink()).read(_write())
+    except ValueError:
+        return
+    raise AssertionError("read() accepted a WRITE_MEM command")
+
+
+# Shadow memory
+def _shadowed(link):
+    shadow = ShadowMemory({MemType.RAM: [(0x20000000, 0x20000400)]}, {MemType.RAM: 60.0}, block_size=16)
+    return Commander(link, shadow=shadow), shadow
+
+def test_shadow_serves_repeated_reads():
+    """A second read of a cached range sends nothing."""
+    link = FakeSerialLink()
+    link.memory[:16] = bytes(range(16))
+    commander, shadow = _shadowed(link)
+    first = commander.read(_read(address=0x20000004, length=8))
+    sent  = len(link.sent)
+    again = commander.execute(_read(address=0x20000002, length=4))
+    assert_eq(bytes(first), bytes(range(4, 12)))
+    assert_eq(bytes(again), bytes(range(2, 6)))
+    assert_eq(len(link.sent), sent)
+    assert_eq(shadow.hits, 1)
+
+def test_shadow_is_updated_by_writes():
+    """WRITE_MEM patches the shadow, so a read-back stays off the wire."""
+    link = FakeSerialLink()
+    commander, _ = _shadowed(link)
+    commander.read(_read(length=16))
+    commander.execute(_write(address=0x20000004, data=b'\xDE\xAD\xBE\xEF'))
+    sent = len(link.sent)
+    assert_eq(bytes(commander.read(_read(address=0x20000004, length=4))), b'\xDE\xAD\xBE\xEF')
+    assert_eq(len(link.sent), sent)
+
+def test_shadow_is_invalidated_by_reset():
+    link = FakeSerialLink()
+    commander, shadow = _shadowed(link)
+    commander.read(_read(length=16))
+    commander.execute(Command(name="RESET", id=CommandId.RESET, address=0))
+    assert_eq(len(shadow), 0)
+
+
+# Firmware image
+def _flash_read(address=0x08000000, length=8):
+    return Command(name="READ_MEM", id=CommandId.READ_MEM,
+                   mem=MemType.FLASH, address=address, data=None, length=length)
+
+def _flash_board(image_bytes, device_bytes):
+    link  = FakeSerialLink(base=0x08000000)
+    link.memory[:len(device_bytes)] = device_bytes
+    image = FirmwareImage([(0x08000000, image_bytes)], 0x08000000, 0x08000000 + len(image_bytes))
+    return link, image
+
+def test_flash_reads_served_from_verified_image():
+    """After the sampled verify, firmware reads send nothing."""
+    firmware    = bytes(range(64))
+    link, image = _flash_board(firmware, firmware)
+    commander   = Commander(link, image=image, image_samples=2)
+    data = commander.execute(_flash_read(address=0x08000010, length=16))
+    sent = len(link.sent)
+    assert_eq(bytes(data), firmware[16:32])
+    assert_eq((image.verified, sent), (True, 2))
+    assert_eq(bytes(commander.read(_flash_read(length=64))), firmware)
+    assert_eq(len(link.sent), sent)
+
+def test_mismatched_build_falls_back_to_uart():
+    """A sample that differs disables the image; data comes from the device."""
+    device      = bytes(range(64))
+    link, image = _flash_board(bytes(64), device)
+    data = Commander(link, image=image, image_samples=2).read(_flash_read(length=8))
+    assert_eq(image.verified, False)
+    assert_eq(bytes(data), device[:8])
+
+def test_flash_reads_outside_image_use_uart():
+    link, image = _flash_board(bytes(16), bytes(64))
+    Commander(link, image=image, image_samples=0).read(_flash_read(address=0x08000020, length=4))
+    assert_eq(len(link.sent), 1)
+    assert_eq(image.verified, None)
+
+
+# Watchpoints
+def _watch(slot, control, address=None):
+    data = address.to_bytes(4, "little") if address is not None else None
+    return Command(name="WATCHPOINT", id=CommandId.WATCHPOINT, mem=control,
+                   address=slot, data=data, length=len(data or b""))
+
+def test_watchpoints_are_tracked_and_named():
+    symbols   = SymbolTable([SymbolInfo("counter", 0x20000010, 4, 0xFFFFFFFF)])
+    commander = Commander(FakeSerialLink(), symbols=symbols)
+    commander.execute(_watch(0, WatchpointControl.ENABLED, 0x20000012))
+    commander.execute(_watch(1, WatchpointControl.ENABLED, 0x20000100))
+    assert_eq(commander.watches, {0: 0x20000012, 1: 0x20000100})
+
+    handler = EventHandler(FakeSerialLink(), symbols=symbols, watches=commander.watches)
+    assert_eq(handler._watch_location(0), "0x20000012 <counter+0x2>")
+    assert_eq(handler._watch_location(1), "0x20000100")
+    msg = EventHandler._format_event(EventType.INTERNAL_MDT_EVENT_WATCHPOINT_HIT, 0, 1, 4, 2,
+                                     handler._watch_location(0))
+    assert_eq(msg.endswith("width=4) at 0x20000012 <counter+0x2>"), True)
+
+    commander.execute(_watch(0, WatchpointControl.DISABLED))
+    assert_eq(commander.watches, {1: 0x20000100})
+    commander.execute(Command(name="RESET", id=CommandId.RESET, address=0))
+    assert_eq(commander.watches, {})
+
+@parametrize("window", [(1,), (4,)])
+def test_polls_held_during_transfer(window):
+    poll = PollScheduler()
+
+    class Link(FakeSerialLink):
+        def send_packet(self, packet):
+            self.busy.append(poll.busy)
+            super().send_packet(packet)
+
+    link = Link()
+    link.busy = []
+    commander = Commander(link, window=window, poll=poll)
+    commander.execute(_write())
+    commander.ping(Command(name="PING", id=CommandId.PING, address=0))
+    assert_eq((link.busy, poll.busy), ([True] * 5, False))
@@ -0,0 +1,112 @@
+"""
+CONFIG LOADER TESTS FOR MCU-MDT
+
+Validates that ``ConfigLoader`` runs its independent loading steps side by
+side and reports every failure at the ``ready()`` barrier.
+
+Coverage:
+1. A deferred load (wait=False) publishes the same data after ready()
+2. Firmware boundaries from build_info and FLASH_PAGE_SIZE from mcu.h are merged
+3. Independent steps overlap: the wall time is near the slowest step, not the sum
+4. Several failing steps raise one ConfigLoadError naming all of them
+
+Assumptions:
+1. The STM32F103 SVD/YAML in pc_tool/mcu_db are present.
+2. No ELF is configured, so symbols and the firmware image are empty.
+
+Goal:
+Ensure parallel loading changes how long start-up takes, never what it loads.
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+
+import pc_tool.loader as loader_mod
+from pc_tool.common import disk_cache
+from pc_tool.loader import ConfigLoader, ConfigLoadError
+
+_COMMANDS = str(Path(loader_mod.__file__).parent / "configs" / "commands.yaml")
+
+_BUILD_INFO = """\
+platform: {platform}
+mcu: F103C8
+port: /dev/null
+firmware_start_address: 0x08000000
+firmware_end_address: 0x08003000
+firmware_size: 0x3000
+"""
+
+
+@contextmanager
+def _build_dir(platform="STM32", header="#define FLASH_PAGE_SIZE 0x400UL\n"):
+    old_env = os.environ.get(disk_cache.CACHE_DIR_ENV)
+    os.environ[disk_cache.CACHE_DIR_ENV] = ""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "build_info.yaml").write_text(_BUILD_INFO.format(platform=platform))
+        if header is not None:
+            (Path(tmp) / "mcu.h").write_text(header)
+        try:
+            yield str(Path(tmp) / "build_info.yaml")
+        finally:
+            if old_env is None:
+                os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+            else:
+                os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+@contextmanager
+def _patched(**methods):
+    saved = {name: ConfigLoader.__dict__[name] for name in methods}
+    for name, fn in methods.items():
+        setattr(ConfigLoader, name, fn)
+    try:
+        yield
+    finally:
+        for name, fn in saved.items():
+            setattr(ConfigLoader, name, fn)
+
+
+def test_deferred_load_matches_eager():
+    with _build_dir() as path:
+        eager    = ConfigLoader(path, commands_path=_COMMANDS)
+        deferred = ConfigLoader(path, commands_path=_COMMANDS, wait=False)
+        assert_eq(hasattr(deferred, "mcu_metadata"), False)
+        assert_eq(deferred.ready() is deferred, True)
+        deferred.ready()
+
+    assert_eq(deferred.mcu_metadata, eager.mcu_metadata)
+    assert_eq(eager.mcu_metadata["firmware"],
+              {"start": 0x08000000, "end": 0x08003000, "size": 0x3000, "page_size": 0x400})
+    assert_eq((eager.elf_symbols, eager.firmware_image), ({}, None))
+    assert_eq("PING" in eager.yaml_command_data["commands"], True)
+
+def test_steps_run_concurrently():
+    def slow(result):
+        def step(self, build_info_path):
+            time.sleep(0.3)
+            return result
+        return step
+
+    with _build_dir() as path, _patched(_load_elf=slow(({}, None)), _load_mcu_header=slow({})):
+        t0 = time.monotonic()
+        ConfigLoader(path, commands_path=_COMMANDS)
+        elapsed = time.monotonic() - t0
+    assert_eq(elapsed < 0.75, True, elapsed=elapsed)
+
+def test_failures_are_aggregated():
+    def broken(self, build_info_path):
+        raise OSError("mcu.h unreadable")
+
+    with _build_dir(platform="PIC") as path, _patched(_load_mcu_header=broken):
+        loader = ConfigLoader(path, commands_path=_COMMANDS, wait=False)
+        try:
+            loader.ready()
+        except ConfigLoadError as exc:
+            assert_eq(sorted(exc.errors), ["mcu.h", "metadata"])
+            assert_eq("NotImplementedError" in str(exc) and "mcu.h unreadable" in str(exc), True)
+        else:
+            raise AssertionError("ready() did not raise")
@@ -0,0 +1,111 @@
+"""
+DEVICE BUNDLE TESTS FOR MCU-MDT
+
+Validates ``mcu-mdt-db build`` and loading metadata from the compiled,
+memory-mapped bundle, against a small copy of the device database.
+
+Coverage:
+1. Bundle metadata equals the XML loaders' output (ATDF and SVD, several variants)
+2. Modules decode on first access; derivedFrom peripherals share one table
+3. An entry whose source changed after the build falls back to the XML
+4. A damaged bundle is ignored with a warning
+5. BundleModules pickles as a reference into the bundle
+6. The CLI writes the bundle into the database root
+
+Assumptions:
+1. The ATmega328P ATDF and the STM32F103/F0x0 SVDs and YAMLs in pc_tool/mcu_db are present.
+
+Goal:
+Ensure the bundle only changes how fast metadata loads, never what it contains.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+import pc_tool.loader as loader_mod
+from pc_tool.bundle import BUNDLE_FILE, BundleModules
+from pc_tool.common import disk_cache
+from pc_tool.device_index import main as db_main
+from pc_tool.loader import _ATDFLoader, _SVDLoader, compile_bundle, load_mcu_metadata
+from pc_tool.metadata import LazyModules
+
+_FILES = ("avr/atmega/ATmega328P.atdf",
+          "stm32/cortex-m3/STM32F103.svd", "stm32/cortex-m3/STM32F103.yaml",
+          "stm32/cortex-m0/STM32F0x0.svd", "stm32/cortex-m0/STM32F0x0.yaml")
+_LOADERS = {"avr": _ATDFLoader(), "stm32": _SVDLoader()}
+
+
+@contextmanager
+def _database(build: bool = True):
+    """A copy of a few database files as _DB_ROOT (bundle compiled), with the metadata cache off."""
+    old_env, old_root = os.environ.get(disk_cache.CACHE_DIR_ENV), loader_mod._DB_ROOT
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for rel in _FILES:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(old_root / rel, root / rel)
+        if build:
+            compile_bundle(root)
+        os.environ[disk_cache.CACHE_DIR_ENV] = ""
+        loader_mod._DB_ROOT = root
+        try:
+            yield root
+        finally:
+            loader_mod._DB_ROOT = old_root
+            loader_mod._BUNDLES.pop(str(root), None)
+            if old_env is None:
+                os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+            else:
+                os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+
+@parametrize("mcu,platform", [("atmega328p", "avr"), ("stm32f103c8", "stm32"),
+                              ("stm32f103rb", "stm32"), ("stm32f030f4", "stm32")])
+def test_bundle_matches_xml(mcu, platform):
+    with _database() as root:
+        bundled = load_mcu_metadata(mcu, platform)
+        xml     = _LOADERS[platform].load(mcu, str(root), lazy=False).to_dict()
+        assert_eq((type(bundled["modules"]), bundled["modules"].loaded), (BundleModules, 0))
+        bundled["modules"] = bundled["modules"].materialize()
+    assert_eq(bundled, xml, mcu=mcu)
+
+def test_derived_peripherals_share_table():
+    with _database():
+        modules = load_mcu_metadata("stm32f103c8", "stm32")["modules"]
+        usart1  = modules["USART1"]["register_groups"]["USART1"]["registers"]
+        usart2  = modules["USART2"]["register_groups"]["USART2"]["registers"]
+        assert_eq((usart2 is usart1, modules.loaded), (True, 2))
+        assert_eq(modules["USART2"]["register_groups"]["USART2"]["offset"], "0x40004400")
+
+def test_changed_source_falls_back_to_xml():
+    with _database() as root:
+        atdf = root / _FILES[0]
+        atdf.write_bytes(atdf.read_bytes() + b"<!-- edited -->\n")
+        assert_eq(type(load_mcu_metadata("atmega328p", "avr")["modules"]), LazyModules)
+        assert_eq(type(load_mcu_metadata("stm32f103c8", "stm32")["modules"]), BundleModules)
+
+def test_damaged_bundle_is_ignored():
+    with _database() as root:
+        bundle = root / BUNDLE_FILE
+        bundle.write_bytes(bundle.read_bytes()[:100])
+        assert_eq(type(load_mcu_metadata("atmega328p", "avr")["modules"]), LazyModules)
+
+def test_pickle_references_bundle():
+    with _database():
+        modules = load_mcu_metadata("atmega328p", "avr")["modules"]
+        modules["PORT"]
+        clone = pickle.loads(pickle.dumps(modules))
+        assert_eq((type(clone), clone.loaded, len(clone)), (BundleModules, 0, len(modules)))
+        assert_eq(clone["PORT"], modules["PORT"])
+
+def test_cli_build():
+    with _database(build=False) as root:
+        assert_eq(db_main(["build", "--db", str(root)]), 0)
+        assert_eq((root / BUNDLE_FILE).is_file(), True)
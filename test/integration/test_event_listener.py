@@ -0,0 +1,130 @@
+"""
+EVENT LISTENER TESTS FOR MCU-MDT
+
+Validates how ``EventHandler`` moves event packets from ``rx_worker`` through
+the link's ``EventBuffer`` to the terminal.
+
+Coverage:
+1. A watchpoint storm prints as one line with the run length and first/last values
+2. Events the full buffer dropped are reported as a count
+3. A corrupt event is not folded into valid ones and is never printed
+4. Breakpoint/watchpoint hits still invalidate the shadow memory, once per batch
+5. An unknown event type prints generically without losing the rest of its batch
+
+Assumptions:
+1. The link is never opened; packets are pushed straight into its event buffer.
+
+Goal:
+Ensure an event storm turns into a few terminal redraws without losing track of what happened.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from test.common.asserts import assert_eq
+
+import pc_tool.event as event_mod
+from pc_tool.common.enums import MDT_PACKET_SIZE, EventType, MDTFlags, MDTOffset
+from pc_tool.common.protocol import calculate_crc16
+from pc_tool.common.terminal import Terminal
+from pc_tool.common.uart_io import MCUSerialLink
+from pc_tool.event import EventHandler
+
+
+def _event(event_type=EventType.INTERNAL_MDT_EVENT_WATCHPOINT_HIT, slot=0, old=0, new=0) -> bytes:
+    pkt = bytearray(MDT_PACKET_SIZE)
+    pkt[MDTOffset.START]  = 0xAA
+    pkt[MDTOffset.FLAGS]  = MDTFlags.EVENT_PACKET
+    pkt[MDTOffset.SEQ]    = slot
+    pkt[MDTOffset.MEM_ID] = event_type
+    pkt[MDTOffset.ADDRESS:MDTOffset.ADDRESS + 4] = old.to_bytes(4, "little")
+    pkt[MDTOffset.LENGTH:MDTOffset.LENGTH + 2]   = (4).to_bytes(2, "little")
+    pkt[MDTOffset.DATA:MDTOffset.DATA + 4]       = new.to_bytes(4, "little")
+    pkt[MDTOffset.CRC:MDTOffset.CRC + 2]         = calculate_crc16(bytes(pkt[1:15])).to_bytes(2, "little")
+    pkt[MDTOffset.END]    = 0x55
+    return bytes(pkt)
+
+
+class _Shadow:
+    def __init__(self):
+        self.invalidations = 0
+
+    def invalidate(self):
+        self.invalidations += 1
+
+
+@contextmanager
+def _listening(link, shadow=None):
+    """Run the event listener over *link* (packets pushed beforehand), capturing printouts."""
+    printed, old_event, old_interval = [], Terminal.event, event_mod._EVENT_REDRAW_INTERVAL
+    Terminal.event = printed.append
+    event_mod._EVENT_REDRAW_INTERVAL = 0
+    handler = EventHandler(link, shadow=shadow)
+    thread  = threading.Thread(target=handler._event_listener, daemon=True)
+    try:
+        yield printed, thread
+    finally:
+        link.running = False
+        thread.join(timeout=2.0)
+        Terminal.event = old_event
+        event_mod._EVENT_REDRAW_INTERVAL = old_interval
+
+
+def _settle(printed, thread):
+    thread.start()
+    deadline = time.monotonic() + 1.0
+    while not printed and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_storm_prints_one_line():
+    link = MCUSerialLink("socket://unused")
+    for i in range(500):
+        link.push_back_event_packet(_event(slot=1, old=i, new=i + 1))
+    with _listening(link) as (printed, thread):
+        _settle(printed, thread)
+    assert_eq(len(printed), 1)
+    assert_eq(printed[0].count("\n"), 0)
+    assert_eq("old=0x00000000, new=0x000001F4" in printed[0] and " x500 in " in printed[0], True,
+              line=printed[0])
+
+def test_dropped_events_are_reported():
+    link = MCUSerialLink("socket://unused", event_capacity=2)
+    for slot in range(5):
+        link.push_back_event_packet(_event(slot=slot))
+    with _listening(link) as (printed, thread):
+        _settle(printed, thread)
+    lines = printed[0].split("\n")
+    assert_eq((len(lines), lines[-1]), (3, "[Event] 3 event(s) dropped: event buffer full"))
+
+def test_corrupt_event_is_not_folded():
+    link = MCUSerialLink("socket://unused")
+    corrupt = bytearray(_event(slot=1))
+    corrupt[MDTOffset.CRC] ^= 0xFF
+    link.push_back_event_packet(_event(slot=1, new=5))
+    link.push_back_event_packet(bytes(corrupt), coalesce=False)
+    with _listening(link) as (printed, thread):
+        _settle(printed, thread)
+    assert_eq((len(printed), "x2" in printed[0], "new=0x00000005" in printed[0]), (1, False, True))
+
+def test_hits_invalidate_shadow_once_per_batch():
+    link, shadow = MCUSerialLink("socket://unused"), _Shadow()
+    link.push_back_event_packet(_event(slot=0))
+    link.push_back_event_packet(_event(EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT, slot=2))
+    with _listening(link, shadow) as (printed, thread):
+        _settle(printed, thread)
+    assert_eq((len(printed[0].split("\n")), shadow.invalidations), (2, 1))
+
+def test_unknown_type_keeps_batch():
+    link, shadow = MCUSerialLink("socket://unused", event_capacity=3), _Shadow()
+    link.push_back_event_packet(_event(0x7E, slot=4))
+    link.push_back_event_packet(_event(slot=0))
+    link.push_back_event_packet(_event(EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT, slot=2))
+    link.push_back_event_packet(_event(slot=5))           # dropped: buffer full
+    with _listening(link, shadow) as (printed, thread):
+        _settle(printed, thread)
+    lines = printed[0].split("\n")
+    assert_eq(len(lines), 4)
+    assert_eq(lines[0].startswith("[Event] event 126 (slot=4,"), True, line=lines[0])
+    assert_eq((lines[-1], shadow.invalidations), ("[Event] 1 event(s) dropped: event buffer full", 1))
@@ -0,0 +1,160 @@
+"""
+FLEET SESSION TESTS FOR MCU-MDT
+
+Validates ``FleetSession`` against several ``FakeMCUServer`` boards reached
+over ``socket://`` URLs, each described by a throwaway build_info.yaml.
+
+Coverage:
+1. Target resolution from build_info files and from bare ports
+2. The same script runs on every board and per-board data is reported
+3. A failing board does not stop the others
+4. Lines rejected by the parser/validator fail the board before any I/O
+5. Boards run concurrently, not one after another
+6. JSON report shape
+
+Assumptions:
+1. pyserial is installed (socket:// URL handler).
+2. The STM32F103 SVD and memory YAML in pc_tool/mcu_db are present.
+3. The metadata disk cache is disabled (MCU_MDT_CACHE_DIR="") so runs leave ~/.cache alone.
+
+Goal:
+Ensure a production-line run over many boards reports exactly what each
+board did, in about the time of the slowest board.
+"""
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+from test.common.asserts import assert_eq
+from test.common.mdtfixtures import FakeMCUServer
+
+from pc_tool.fleet import FleetSession, resolve_targets
+from pc_tool.common import disk_cache
+
+
+_SCRIPT = [
+    (1, "PING"),
+    (2, "WRITE_MEM RAM 0x20000000 4 DEADBEEF"),
+    (3, "READ_MEM RAM 0x20000000 4"),
+]
+
+
+@contextmanager
+def _workdir():
+    """A throwaway directory for build_info files, with the metadata cache off."""
+    old_env = os.environ.get(disk_cache.CACHE_DIR_ENV)
+    os.environ[disk_cache.CACHE_DIR_ENV] = ""
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            yield tmp
+    finally:
+        if old_env is None:
+            os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+        else:
+            os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+def _build_info(port: str, directory: str, name: str = "build_info.yaml") -> str:
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        f.write(f"mcu: stm32f103x8\nplatform: stm32\nport: {port}\nbaudrate: 115200\n")
+    return path
+
+def _fleet(servers, tmp):
+    paths = [_build_info(s.url, tmp, f"b{i}.yaml") for i, s in enumerate(servers)]
+    return resolve_targets(paths)
+
+def _close(servers):
+    for s in servers:
+        s.close()
+
+
+def test_resolve_targets_from_build_info_and_ports():
+    with _workdir() as tmp:
+        template = _build_info("socket://127.0.0.1:1", tmp)
+        targets  = resolve_targets([template, "socket://127.0.0.1:2"], template=template)
+    assert_eq([t.port for t in targets], ["socket://127.0.0.1:1", "socket://127.0.0.1:2"])
+    assert_eq({t.build_info for t in targets}, {template})
+    assert_eq(targets[0].baudrate, 115200)
+
+def test_bare_port_needs_template():
+    try:
+        resolve_targets(["socket://127.0.0.1:2"])
+    except ValueError:
+        return
+    raise AssertionError("a bare port was accepted without a template build_info")
+
+def test_script_runs_on_every_board():
+    servers = [FakeMCUServer() for _ in range(3)]
+    try:
+        with _workdir() as tmp:
+            report = FleetSession(_fleet(servers, tmp), reset_delay=0).run(_SCRIPT)
+    finally:
+        _close(servers)
+
+    assert_eq(report.ok, True, rows=report.lines())
+    assert_eq([len(b.steps) for b in report.boards], [3, 3, 3])
+    assert_eq([b.steps[-1].data for b in report.boards], [b'\xDE\xAD\xBE\xEF'] * 3)
+    assert_eq([bytes(s.board.memory[:4]) for s in servers], [b'\xDE\xAD\xBE\xEF'] * 3)
+
+def test_failing_board_does_not_stop_others():
+    servers = [FakeMCUServer() for _ in range(2)]
+    try:
+        with _workdir() as tmp:
+            targets = _fleet(servers, tmp)
+            dead    = _build_info("socket://127.0.0.1:1", tmp, "dead.yaml")
+            targets += resolve_targets([dead])
+            report  = FleetSession(targets, reset_delay=0).run(_SCRIPT)
+    finally:
+        _close(servers)
+
+    assert_eq([b.ok for b in report.boards], [True, True, False])
+    assert_eq(report.failed[0].error.startswith("open failed"), True, error=report.failed[0].error)
+
+def test_rejected_line_fails_board_without_io():
+    server = FakeMCUServer()
+    try:
+        with _workdir() as tmp:
+            report = FleetSession(_fleet([server], tmp), reset_delay=0).run(
+                [(1, "READ_MEM RAM 0x10000000 4"), (2, "PING")]
+            )
+    finally:
+        server.close()
+
+    board = report.boards[0]
+    assert_eq(board.ok, False)
+    assert_eq(board.error.startswith("line 1"), True, error=board.error)
+    assert_eq(len(server.board.sent), 0)
+
+def test_boards_run_concurrently():
+    """Every board stalls on one dropped frame; the fleet pays for it only once."""
+    servers = [FakeMCUServer() for _ in range(4)]
+    for s in servers:
+        s.board.drop_once = {1}     # second chunk; SEQ 0 is also the startup ping
+    try:
+        with _workdir() as tmp:
+            report = FleetSession(_fleet(servers, tmp), reset_delay=0).run([(1, "READ_MEM RAM 0x20000000 8")])
+    finally:
+        _close(servers)
+
+    assert_eq(report.ok, True, rows=report.lines())
+    stalled = sum(b.run_time for b in report.boards)
+    assert_eq(stalled >= 4.0, True, stalled=stalled)
+    assert_eq(report.total_time < 2.0, True, total=report.total_time)
+
+def test_report_json():
+    server = FakeMCUServer()
+    try:
+        with _workdir() as tmp:
+            report = FleetSession(_fleet([server], tmp), reset_delay=0).run(_SCRIPT)
+            path   = os.path.join(tmp, "report.json")
+            report.write_json(path)
+            with open(path) as f:
+                data = json.load(f)
+    finally:
+        server.close()
+
+    assert_eq(data["ok"], True)
+    assert_eq(data["boards"][0]["steps"][2]["data"], "deadbeef")
+    assert_eq(len(report.lines()), 3)   # header, one board, summary
@@ -0,0 +1,119 @@
+"""
+LAZY METADATA TESTS FOR MCU-MDT
+
+Validates the lazy ``modules`` mapping produced by the ATDF/SVD loaders and
+the expat span scanner it is built on.
+
+Coverage:
+1. Nothing is parsed until a module is looked up, and then only that module
+2. Lazy and eager loads produce identical metadata (AVR and STM32)
+3. Register name resolution touches only the named peripheral
+4. A pickled LazyModules carries spans, not parsed modules
+5. scan_spans handles nested, empty and namespace-prefixed elements
+6. derivedFrom peripherals share one read-only register table, also after pickling
+
+Assumptions:
+1. The ATmega328P ATDF and the STM32F103 SVD in pc_tool/mcu_db are present.
+
+Goal:
+Ensure laziness changes when registers are parsed, never what they contain.
+"""
+
+import operator
+import pickle
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.loader import _ATDFLoader, _SVDLoader, _DB_ROOT
+from pc_tool.metadata import LazyModules, scan_spans, cut_spans
+from pc_tool.parser import resolve_register_address
+
+_LOADERS = {"avr": _ATDFLoader(), "stm32": _SVDLoader()}
+
+
+def _load(mcu, platform, lazy=True):
+    return _LOADERS[platform].load(mcu, str(_DB_ROOT), lazy=lazy)
+
+
+def test_modules_are_parsed_on_first_access():
+    modules = _load("stm32f103c8", "stm32").modules
+    assert_eq((isinstance(modules, LazyModules), modules.loaded), (True, 0))
+    assert_eq("USART2" in modules, True)
+    usart2 = modules["USART2"]
+    assert_eq(modules.loaded, 1)
+    assert_eq(usart2["register_groups"]["USART2"]["offset"], "0x40004400")
+    assert_eq(modules["USART2"] is usart2, True)
+
+@parametrize("mcu,platform", [("atmega328p", "avr"), ("stm32f103c8", "stm32")])
+def test_lazy_matches_eager(mcu, platform):
+    lazy, eager = _load(mcu, platform), _load(mcu, platform, lazy=False)
+    assert_eq(type(eager.modules), dict)
+    assert_eq(lazy.modules.materialize(), eager.modules)
+    assert_eq((lazy.memories, lazy.interrupts, lazy.peripherals),
+              (eager.memories, eager.interrupts, eager.peripherals))
+
+def _registers(modules, name):
+    return modules[name]["register_groups"][name]["registers"]
+
+@parametrize("lazy", [(True,), (False,)])
+def test_derived_peripherals_share_register_table(lazy):
+    modules = _load("stm32f103c8", "stm32", lazy=lazy).modules
+    usart1  = _registers(modules, "USART1")
+    assert_eq((_registers(modules, "USART2") is usart1, _registers(modules, "USART3") is usart1), (True, True))
+    assert_eq(modules["USART3"]["register_groups"]["USART3"]["offset"], "0x40004800")
+    assert_eq(_registers(modules, "USART1") is _registers(modules, "SPI1"), False)
+
+    clone = pickle.loads(pickle.dumps(modules))
+    assert_eq(_registers(clone, "USART3") is _registers(clone, "USART1"), True)
+    assert_eq(_registers(clone, "USART3"), usart1)
+
+def test_shared_register_table_is_read_only():
+    table = _registers(_load("stm32f103c8", "stm32").modules, "USART1")
+    sr    = table["SR"]
+    for mutate in (lambda: operator.setitem(sr, "rw", "read-only"), lambda: sr["bitfields"].pop("TXE"),
+                   lambda: table.update(DR=sr)):
+        try:
+            mutate()
+        except TypeError:
+            continue
+        raise AssertionError("shared register table was modified")
+    copy = sr.to_dict()
+    copy["rw"] = "read-only"
+    assert_eq((type(copy), type(copy["bitfields"]["TXE"]), sr["rw"]), (dict, dict, "read-write"))
+
+def test_qualified_register_lookup_loads_one_module():
+    meta = _load("stm32f103c8", "stm32").to_dict()
+    assert_eq(resolve_register_address("RCC_CR", meta), 0x40021000)
+    assert_eq(meta["modules"].loaded, 1)
+
+def test_pickle_keeps_spans_only():
+    modules = _load("stm32f103c8", "stm32").modules
+    modules.materialize()
+    clone = pickle.loads(pickle.dumps(modules))
+    assert_eq((clone.loaded, len(clone)), (0, len(modules)))
+    assert_eq(clone["GPIOA"], modules["GPIOA"])
+
+
+# Span scanner
+_XML = (
+    b'<root><items>'
+    b'<item name="a"><regs><r/></regs></item>'
+    b'<item name="b"/>'
+    b'<x:item name="c"><regs/></x:item>'
+    b'</items></root>'
+)
+
+def test_scan_container_spans():
+    found = scan_spans(_XML.replace(b"x:", b""), ("root", "items", "item"))
+    data  = _XML.replace(b"x:", b"")
+    assert_eq([data[s:e] for _, (s, e) in found],
+              [b'<item name="a"><regs><r/></regs></item>', b'<item name="b"/>', b'<item name="c"><regs/></item>'])
+
+def test_scan_child_spans():
+    data  = _XML.replace(b"<x:item", b'<x:item xmlns:x="urn:x"')
+    found = scan_spans(data, ("root", "items", "item"), child="regs")
+    assert_eq([a["name"] for a, _ in found], ["a", "b", "c"])
+    assert_eq([data[sp[0]:sp[1]] if sp else None for _, sp in found],
+              [b'<regs><r/></regs>', None, b'<regs/>'])
+    assert_eq(b"regs" in cut_spans(data, [sp for _, sp in found]), False)
@@ -0,0 +1,103 @@
+"""
+METADATA CACHE TESTS FOR MCU-MDT
+
+Validates the on-disk cache ``load_mcu_metadata`` keeps of parsed ATDF/SVD
+metadata, using a throwaway cache directory and a copy of the device database.
+
+Coverage:
+1. A cached load returns exactly what a fresh parse returns (ATDF and SVD)
+2. The second load is served from the cache, not the XML
+3. Editing a source file rebuilds the entry
+4. A corrupt entry is discarded and rebuilt
+5. An empty MCU_MDT_CACHE_DIR disables caching
+
+Assumptions:
+1. The ATmega48 ATDF and the STM32F103 SVD/YAML in pc_tool/mcu_db are present.
+
+Goal:
+Ensure the cache only ever changes how fast metadata loads, never what it contains.
+"""
+
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+import pc_tool.loader as loader_mod
+from pc_tool.common import disk_cache
+from pc_tool.loader import load_mcu_metadata
+
+_ATMEGA48 = loader_mod._DB_ROOT / "avr" / "atmega" / "ATmega48.atdf"
+
+
+@contextmanager
+def _cache(db_root: Path | None = None):
+    """Point the cache (and optionally the database root) at temp locations."""
+    old_env, old_root = os.environ.get(disk_cache.CACHE_DIR_ENV), loader_mod._DB_ROOT
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[disk_cache.CACHE_DIR_ENV] = tmp
+        if db_root is not None:
+            loader_mod._DB_ROOT = db_root
+        try:
+            yield Path(tmp)
+        finally:
+            loader_mod._DB_ROOT = old_root
+            if old_env is None:
+                os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+            else:
+                os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+@contextmanager
+def _db_copy():
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copy(_ATMEGA48, tmp)
+        yield Path(tmp), Path(tmp) / _ATMEGA48.name
+
+def _entries(cache: Path) -> list[Path]:
+    return sorted(cache.glob("metadata-*.pickle"))
+
+
+@parametrize("mcu,platform", [("atmega48", "avr"), ("stm32f103c8", "stm32")])
+def test_cached_load_matches_parse(mcu, platform):
+    with _cache() as cache:
+        fresh  = load_mcu_metadata(mcu, platform)
+        cached = load_mcu_metadata(mcu, platform)
+        assert_eq(len(_entries(cache)), 1)
+    assert_eq(cached, fresh)
+
+def test_second_load_skips_the_parser():
+    with _db_copy() as (db, _), _cache(db):
+        load_mcu_metadata("atmega48", "avr")
+        parse = loader_mod._ATDFLoader.__dict__["_parse_xml"]
+        loader_mod._ATDFLoader._parse_xml = None
+        try:
+            meta = load_mcu_metadata("atmega48", "avr")
+        finally:
+            loader_mod._ATDFLoader._parse_xml = parse
+    assert_eq(meta["device"], "atmega48")
+
+def test_source_change_rebuilds():
+    with _db_copy() as (db, atdf), _cache(db) as cache:
+        before = load_mcu_metadata("atmega48", "avr")
+        atdf.write_text(atdf.read_text().replace('family="megaAVR"', 'family="patched"', 1))
+        after  = load_mcu_metadata("atmega48", "avr")
+        assert_eq(len(_entries(cache)), 2)
+    assert_eq((before["family"], after["family"]), ("megaAVR", "patched"))
+
+def test_corrupt_entry_is_rebuilt():
+    with _db_copy() as (db, _), _cache(db) as cache:
+        expected = load_mcu_metadata("atmega48", "avr")
+        _entries(cache)[0].write_bytes(b"not a pickle")
+        assert_eq(load_mcu_metadata("atmega48", "avr"), expected)
+        assert_eq(_entries(cache)[0].read_bytes()[:1], b"\x80")
+
+def test_empty_cache_dir_disables_cache():
+    with _cache() as cache:
+        os.environ[disk_cache.CACHE_DIR_ENV] = ""
+        load_mcu_metadata("atmega48", "avr")
+        assert_eq(disk_cache.cache_dir(), None)
+        assert_eq(_entries(cache), [])
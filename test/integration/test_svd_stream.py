@@ -0,0 +1,129 @@
+"""
+STREAMING SVD LOADER TESTS FOR MCU-MDT
+
+Validates the iterparse-based eager SVD loader against the span-indexed lazy
+loader, on the bundled STM32 SVDs and on small synthetic SVD files.
+
+Coverage:
+1. Streaming and indexed loads produce identical metadata
+2. derivedFrom resolves to a base declared later in the file
+3. Namespaced SVDs are read like plain ones
+4. Each peripheral's tree is dropped before the next one is read
+5. Malformed XML raises ValueError naming the file
+
+Assumptions:
+1. The STM32F103 and STM32F0x0 SVDs in pc_tool/mcu_db are present.
+
+Goal:
+Ensure streaming bounds memory without changing the metadata a load returns.
+"""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.loader import _SVDLoader, _DB_ROOT, MCUMetadata
+from pc_tool.metadata import LazyModules
+
+_SVD = _DB_ROOT / "stm32"
+
+_SYNTHETIC = """<?xml version="1.0"?>
+<device{ns}>
+  <name>TEST</name>
+  <cpu><name>CM3</name></cpu>
+  <peripherals>
+    <peripheral derivedFrom="UART0">
+      <name>UART1</name>
+      <baseAddress>0x40001400</baseAddress>
+      <interrupt><name>UART1</name><value>6</value></interrupt>
+    </peripheral>
+    <peripheral>
+      <name>UART0</name>
+      <description>Serial port</description>
+      <baseAddress>0x40001000</baseAddress>
+      <registers>
+        <register>
+          <name>DR</name><addressOffset>0x4</addressOffset><size>16</size>
+          <fields><field><name>DATA</name><bitOffset>0</bitOffset><bitWidth>9</bitWidth></field></fields>
+        </register>
+      </registers>
+    </peripheral>
+    <peripheral>
+      <name>EMPTY</name>
+      <baseAddress>0x40002000</baseAddress>
+    </peripheral>
+  </peripherals>
+  <interrupts><interrupt><name>NMI</name><value>-14</value></interrupt></interrupts>
+</device>
+"""
+
+
+@contextmanager
+def _svd_file(text: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "TEST.svd"
+        path.write_text(text)
+        yield str(path)
+
+def _metadata(path: str, lazy: bool) -> MCUMetadata:
+    """What ``_SVDLoader.load`` builds from *path*, minus the device lookup."""
+    loader = _SVDLoader()
+    device = loader._read_indexed(path) if lazy else loader._read_streaming(path)
+    meta   = MCUMetadata(device="test", architecture=device.architecture, family=device.family)
+    entries = loader._resolve_peripherals(device, meta)
+    if lazy:
+        modules = LazyModules(path, entries, _SVDLoader._module, parse=_SVDLoader._parse_registers)
+        meta.modules = modules.materialize()
+    else:
+        meta.modules = {n: _SVDLoader._module(n, info, t) for n, (t, info) in entries.items()}
+    return meta
+
+
+@parametrize("svd", [("cortex-m3/STM32F103.svd",), ("cortex-m0/STM32F0x0.svd",)])
+def test_streaming_matches_indexed(svd):
+    path = str(_SVD / svd)
+    assert_eq(_metadata(path, lazy=False), _metadata(path, lazy=True), svd=svd)
+
+@parametrize("ns", [("",), (' xmlns="urn:test:svd"',)])
+def test_derived_from_later_base(ns):
+    with _svd_file(_SYNTHETIC.format(ns=ns)) as path:
+        meta = _metadata(path, lazy=False)
+        assert_eq(meta, _metadata(path, lazy=True), ns=ns)
+
+    assert_eq((meta.architecture, meta.family), ("CM3", "TEST"))
+    uart1 = meta.modules["UART1"]["register_groups"]["UART1"]
+    assert_eq((uart1["offset"], uart1["caption"]), ("0x40001400", "Serial port"))
+    assert_eq(uart1["registers"]["DR"]["bitfields"]["DATA"].mask, 0x1FF)
+    assert_eq((uart1["registers"]["DR"]["offset"], uart1["registers"]["DR"]["size"]), ("0x4", "16"))
+    assert_eq(meta.modules["EMPTY"]["register_groups"]["EMPTY"]["registers"], {})
+    assert_eq(meta.interrupts["UART1"]["module_instance"], "UART1")
+    assert_eq(meta.interrupts["NMI"]["module_instance"], None)
+
+def test_peripherals_are_released_while_streaming():
+    seen, live = [], []
+    original   = _SVDLoader.__dict__["_peripheral"]
+
+    def spy(elem, registers):
+        live.append(sum(len(e) for e in seen))
+        seen.append(elem)
+        return original.__func__(elem, registers)
+
+    _SVDLoader._peripheral = staticmethod(spy)
+    try:
+        _SVDLoader()._read_streaming(str(_SVD / "cortex-m3/STM32F103.svd"))
+    finally:
+        _SVDLoader._peripheral = original
+    assert_eq(len(seen) > 40, True)
+    assert_eq(set(live), {0})
+
+def test_malformed_svd_raises_value_error():
+    with _svd_file(_SYNTHETIC.format(ns="")[:-40]) as path:
+        try:
+            _SVDLoader()._read_streaming(path)
+        except ValueError as exc:
+            assert_eq("TEST.svd" in str(exc), True)
+        else:
+            raise AssertionError("truncated SVD was accepted")
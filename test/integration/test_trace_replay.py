@@ -0,0 +1,133 @@
+"""
+TRACE RECORD / REPLAY TESTS FOR MCU-MDT
+
+Validates recording a session with ``MCUSerialLink.trace`` and replaying it
+offline with ``ReplayLink`` / ``replay_trace``.
+
+Coverage:
+1. A live session over socket:// records every frame sent and received
+2. replay_trace routes the recorded replies and events like the live session did
+3. The same commands re-run through Commander against ReplayLink reproduce the wire traffic
+4. A different command sequence is reported as mismatched frames
+5. The mcu-mdt-trace CLI dumps and replays a trace
+
+Assumptions:
+1. pyserial is installed (socket:// URL handler).
+2. FakeMCUServer answers like the firmware (see test/common/mdtfixtures.py).
+
+Goal:
+Ensure a recorded trace is enough to reproduce a session without the board.
+"""
+
+import io
+import tempfile
+import threading
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+
+from pc_tool.commander import Commander
+from pc_tool.event import EventHandler
+from pc_tool.replay import ReplayLink, main as trace_main, replay_trace
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.enums import MDT_PACKET_SIZE, CommandId, EventType, MDTFlags, MDTOffset, MemType
+from pc_tool.common.protocol import calculate_crc16
+from pc_tool.common.trace import TraceDirection, TraceReader, TraceWriter
+from pc_tool.common.uart_io import MCUSerialLink
+from test.common.mdtfixtures import FakeMCUServer
+
+_DATA = bytes(range(16))
+
+
+def _write():
+    return Command(name="WRITE_MEM", id=CommandId.WRITE_MEM, mem=MemType.RAM,
+                   address=0x20000000, data=_DATA, length=len(_DATA))
+
+def _read():
+    return Command(name="READ_MEM", id=CommandId.READ_MEM, mem=MemType.RAM,
+                   address=0x20000000, data=None, length=len(_DATA))
+
+def _event(slot=1) -> bytes:
+    pkt = bytearray(MDT_PACKET_SIZE)
+    pkt[MDTOffset.START]  = 0xAA
+    pkt[MDTOffset.FLAGS]  = MDTFlags.EVENT_PACKET
+    pkt[MDTOffset.SEQ]    = slot
+    pkt[MDTOffset.MEM_ID] = EventType.INTERNAL_MDT_EVENT_BREAKPOINT_HIT
+    pkt[MDTOffset.CRC:MDTOffset.CRC + 2] = calculate_crc16(bytes(pkt[1:15])).to_bytes(2, "little")
+    pkt[MDTOffset.END]    = 0x55
+    return bytes(pkt)
+
+
+@contextmanager
+def _recorded_session():
+    """Write 16 bytes, take a breakpoint event, read them back; yield (trace path, data read)."""
+    server = FakeMCUServer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.mdtrace"
+        link = MCUSerialLink(server.url, reset_delay=0)
+        link.open()
+        link.trace = TraceWriter(path)
+        worker = threading.Thread(target=EventHandler(link).rx_worker, daemon=True)
+        worker.start()
+        try:
+            commander = Commander(link, window=1)
+            commander.execute(_write())
+            server.emit(_event())
+            assert_eq(link.get_event_packet(timeout=2.0) is not None, True)
+            data = commander.read(_read())
+        finally:
+            link.close()            # closes the trace too
+            worker.join(timeout=2.0)
+            server.close()
+        yield path, data
+
+
+def test_session_is_recorded():
+    with _recorded_session() as (path, data):
+        records = list(TraceReader(path).records())
+    assert_eq(data, bytearray(_DATA))
+    directions = [r.direction for r in records]
+    # 4 write chunks + 4 read chunks, each ACKed, plus the event
+    assert_eq((directions.count(TraceDirection.TX), directions.count(TraceDirection.RX)), (8, 9))
+    assert_eq(records[0].frame[MDTOffset.CMD_ID], CommandId.WRITE_MEM)
+
+def test_replay_routes_like_live_session():
+    with _recorded_session() as (path, _):
+        report = replay_trace(str(path))
+    assert_eq((report.frames_tx, report.frames_rx, report.responses, report.nacks,
+               report.events, report.invalid, report.mismatches), (8, 9, 8, 0, 1, 0, 0))
+
+def test_commander_reproduces_session():
+    with _recorded_session() as (path, data):
+        link = ReplayLink(list(TraceReader(path).records()))
+    worker = threading.Thread(target=EventHandler(link).rx_worker, daemon=True)
+    worker.start()
+    try:
+        commander = Commander(link, window=1)
+        commander.execute(_write())
+        replayed = commander.read(_read())
+        assert_eq(link.wait_delivered(timeout=2.0), True)
+    finally:
+        link.close()
+        worker.join(timeout=2.0)
+    assert_eq((replayed, link.mismatches, link.drained), (data, 0, True))
+
+def test_different_commands_are_mismatches():
+    with _recorded_session() as (path, _):
+        link = ReplayLink(list(TraceReader(path).records()))
+    for _ in range(2):
+        link.send_packet(bytes(MDT_PACKET_SIZE))
+    assert_eq((link.sent, link.mismatches), (2, 2))
+
+def test_cli_dump_and_replay():
+    with _recorded_session() as (path, _):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            dump_rc   = trace_main(["dump", str(path)])
+            replay_rc = trace_main(["replay", str(path)])
+    lines = out.getvalue().splitlines()
+    assert_eq((dump_rc, replay_rc), (0, 0))
+    assert_eq(sum("WRITE_MEM" in line and " TX " in line for line in lines), 4)
+    assert_eq(sum("BREAKPOINT_HIT" in line for line in lines), 1)
+    assert_eq(any(line.startswith("Frames:    8 sent, 9 received") for line in lines), True)
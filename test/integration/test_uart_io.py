@@ -0,0 +1,150 @@
+"""
+SERIAL LINK TESTS FOR MCU-MDT
+
+Validates the receive path of ``MCUSerialLink`` over a real ``socket://`` URL,
+with a local TCP server standing in for the MCU.
+
+Coverage:
+1. Idle reads sleep until the timeout instead of spinning
+2. A frame split across several TCP segments is reassembled
+3. Garbage before the START byte is skipped (resync)
+4. Back-to-back frames in one segment come out one at a time
+5. The reset delay is skipped when the MCU answers the startup ping at once
+
+Assumptions:
+1. pyserial is installed (socket:// URL handler).
+2. The loopback interface is available.
+
+Goal:
+Ensure the event-driven receive path delivers the same frames as the old
+polling loop without burning CPU while the link is idle.
+"""
+
+import socket
+import threading
+import time
+
+from test.common.asserts import assert_eq
+from pc_tool.common.enums import MDT_PACKET_SIZE
+from pc_tool.common.uart_io import MCUSerialLink
+
+_FRAME_A = b'\xAA' + bytes(range(1, 17)) + b'\x55'
+_FRAME_B = b'\xAA' + bytes(range(17, 33)) + b'\x55'
+
+
+class _FakeMCU:
+    """TCP server that plays back ``(delay, bytes)`` steps to the first client."""
+
+    def __init__(self, steps):
+        self._srv = socket.socket()
+        self._srv.bind(("127.0.0.1", 0))
+        self._srv.listen(1)
+        self.url    = f"socket://127.0.0.1:{self._srv.getsockname()[1]}"
+        self._steps = steps
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self._srv.accept()
+        with conn:
+            for delay, data in self._steps:
+                time.sleep(delay)
+                conn.sendall(data)
+            time.sleep(2.0)
+        self._srv.close()
+
+
+class _EchoMCU:
+    """TCP server that echoes whole frames, ignoring anything sent during a simulated boot."""
+
+    def __init__(self, boot: float = 0.0):
+        self._srv = socket.socket()
+        self._srv.bind(("127.0.0.1", 0))
+        self._srv.listen(1)
+        self.url   = f"socket://127.0.0.1:{self._srv.getsockname()[1]}"
+        self._boot = boot
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        conn, _ = self._srv.accept()
+        ready   = time.monotonic() + self._boot
+        conn.settimeout(3.0)
+        with conn:
+            try:
+                while True:
+                    data = conn.recv(MDT_PACKET_SIZE)
+                    if not data:
+                        break
+                    if time.monotonic() >= ready:
+                        conn.sendall(data)
+            except OSError:
+                pass
+        self._srv.close()
+
+
+def _open(steps) -> MCUSerialLink:
+    link = MCUSerialLink(port=_FakeMCU(steps).url, reset_delay=0)
+    link.open()
+    return link
+
+
+def test_idle_read_does_not_spin():
+    """A 0.5 s read with nothing on the wire should use almost no CPU."""
+    link = _open([])
+    try:
+        cpu0, wall0 = time.process_time(), time.monotonic()
+        assert_eq(link.read_packet(timeout=0.5), None)
+        cpu, wall = time.process_time() - cpu0, time.monotonic() - wall0
+        assert_eq(wall >= 0.45, True, wall=wall)
+        assert_eq(cpu < 0.1, True, cpu=cpu)
+    finally:
+        link.close()
+
+def test_split_frame_is_reassembled():
+    """Bytes trickling in across segments still form one frame."""
+    link = _open([(0.05, _FRAME_A[:5]), (0.05, _FRAME_A[5:12]), (0.05, _FRAME_A[12:])])
+    try:
+        assert_eq(link.read_packet(timeout=1.0), _FRAME_A)
+    finally:
+        link.close()
+
+def test_garbage_before_start_is_skipped():
+    """Leading noise is dropped up to the first START byte."""
+    link = _open([(0.05, b'\x00\x13\x37' + _FRAME_A)])
+    try:
+        assert_eq(link.read_packet(timeout=1.0), _FRAME_A)
+    finally:
+        link.close()
+
+def test_back_to_back_frames():
+    """Two frames in one segment are returned by two reads."""
+    link = _open([(0.05, _FRAME_A + _FRAME_B)])
+    try:
+        first  = link.read_packet(timeout=1.0)
+        second = link.read_packet(timeout=1.0)
+        assert_eq(first,  _FRAME_A)
+        assert_eq(second, _FRAME_B)
+        assert_eq(len(second), MDT_PACKET_SIZE)
+    finally:
+        link.close()
+
+def test_running_mcu_skips_reset_delay():
+    """An immediate echo means the board did not reset: no 2 s sleep."""
+    link = MCUSerialLink(port=_EchoMCU().url, reset_delay=2.0, startup_ping=_FRAME_A)
+    try:
+        t0 = time.monotonic()
+        link.open()
+        assert_eq(time.monotonic() - t0 < 1.0, True)
+    finally:
+        link.close()
+
+def test_resetting_mcu_waits_then_syncs():
+    """Silence during the probe means a reset: wait it out, then sync."""
+    link = MCUSerialLink(port=_EchoMCU(boot=0.4).url, reset_delay=0.6, startup_ping=_FRAME_A)
+    try:
+        t0 = time.monotonic()
+        link.open()
+        elapsed = time.monotonic() - t0
+        assert_eq(0.55 <= elapsed < 1.5, True, elapsed=elapsed)
+        assert_eq(link._synch_with_mcu(timeout=0.5, quiet=True), True)
+    finally:
+        link.close()
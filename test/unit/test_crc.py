@@ -10,6 +10,9 @@ Coverage:
 2. Empty input
 3. Randomly generated data of varying lengths (0 to 256 bytes)
 4. Stress test with 1000 random inputs
+5. Every pluggable backend (binascii, table, reference) against the reference
+6. Backend selection and override
+7. Batch verification of many frames
 
 Goal:
 Ensure that the CRC16 implementation in the protocol matches the reference impleemntation.
@@ -18,7 +21,11 @@ Ensure that the CRC16 implementation in the protocol matches the reference imple
 import random
 import binascii
 from test.common.asserts import assert_eq
-from pc_tool.common.protocol import calculate_crc16
+from test.pymdtest import parametrize
+from pc_tool.common import protocol
+from pc_tool.common.protocol import calculate_crc16, verify_crc16_batch, serialize_command_packet
+from pc_tool.common.dataclasses import Command
+from pc_tool.common.enums import MDTOffset
 
 def reference_crc16(data: bytes) -> int:
     # CRC-CCITT (0x1021) with initial value 0xFFFF
@@ -78,4 +85,61 @@ def test_crc_is_deterministic():
 def test_crc_different_data_different_result():
     a = calculate_crc16(b'\xAA\xBB\xCC\xDD')
     b = calculate_crc16(b'\xAA\xBB\xCC\xDE')   # last byte differs by 1
-    assert_eq(a == b, False)
\ No newline at end of file
+    assert_eq(a == b, False)
+
+
+# Backends
+@parametrize("name", [("binascii",), ("table",), ("reference",)])
+def test_crc_backend_matches_reference(name):
+    """Each backend must agree with binascii.crc_hqx on random data."""
+    fn = protocol.CRC16_BACKENDS[name]
+    assert_eq(fn(b"123456789"), 0x29B1)
+    for _ in range(200):
+        data = bytes(random.getrandbits(8) for _ in range(random.randint(0, 64)))
+        assert_eq(fn(data), reference_crc16(data), data=data, backend=name)
+
+def test_crc_backend_accepts_memoryview():
+    """Packets are sliced as memoryviews on the hot path."""
+    data = memoryview(bytes(range(32)))[3:17]
+    for name, fn in protocol.CRC16_BACKENDS.items():
+        assert_eq(fn(data), reference_crc16(bytes(data)), backend=name)
+
+def test_crc_fastest_backend_selected():
+    """binascii is always available in CPython and wins the selection."""
+    assert_eq(protocol._select_crc_backend(), "binascii")
+
+def test_crc_set_backend_switches_and_restores():
+    """set_crc_backend changes what calculate_crc16 runs."""
+    prev = protocol.CRC16_BACKEND
+    try:
+        protocol.set_crc_backend("table")
+        assert_eq(protocol.CRC16_BACKEND, "table")
+        assert_eq(calculate_crc16(b"123456789"), 0x29B1)
+    finally:
+        protocol.set_crc_backend(prev)
+
+def test_crc_set_backend_rejects_unknown():
+    try:
+        protocol.set_crc_backend("crc32")
+    except ValueError:
+        return
+    raise AssertionError("unknown backend accepted")
+
+
+# Batch verification
+def _frames(n):
+    cmd = Command(name="READ_MEM", id=0x01, mem=0, address=0x20000000, length=4)
+    return [serialize_command_packet(cmd, seq=i, multi=True, last=i == n - 1) for i in range(n)]
+
+def test_crc_batch_contiguous_buffer():
+    """A contiguous buffer of good frames verifies as all True."""
+    assert_eq(verify_crc16_batch(b"".join(_frames(16))), [True] * 16)
+
+def test_crc_batch_flags_corrupted_frame():
+    """Only the corrupted frame is reported."""
+    frames = [bytearray(f) for f in _frames(5)]
+    frames[3][MDTOffset.DATA] ^= 0x01
+    assert_eq(verify_crc16_batch(frames), [True, True, True, False, True])
+
+def test_crc_batch_rejects_short_frame():
+    assert_eq(verify_crc16_batch([_frames(1)[0][:-1]]), [False])
@@ -0,0 +1,99 @@
+"""
+DEVICE INDEX TESTS FOR MCU-MDT
+
+Validates ``DeviceIndex``, the part number -> database file map that replaces
+directory walks and the hand-written STM32 SVD table.
+
+Coverage:
+1. The shipped index.json matches a fresh scan of pc_tool/mcu_db
+2. Resolution: exact part, ordering code, missing stm32 prefix, density class,
+   unlisted part of a known family
+3. search() by substring and glob; list_devices() by platform
+4. A part missing from a stale index is found after a rescan
+5. The mcu-mdt-db command line
+
+Assumptions:
+1. pc_tool/mcu_db holds the ATmega ATDFs and the STM32F0x0/F103 SVDs with their YAMLs.
+
+Goal:
+Ensure the index resolves every part the old loaders found, to the same file.
+"""
+
+import contextlib
+import io
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.device_index import (
+    DeviceIndex, device_index, find_device_file, main, INDEX_FILE, _DB_ROOT,
+)
+
+
+def test_shipped_index_is_current():
+    """Regenerate with `mcu-mdt-db index` after changing pc_tool/mcu_db."""
+    shipped = json.loads((_DB_ROOT / INDEX_FILE).read_text())
+    with tempfile.TemporaryDirectory() as tmp:
+        fresh = json.loads(DeviceIndex.build(_DB_ROOT).save(Path(tmp) / INDEX_FILE).read_text())
+    assert_eq(shipped, fresh)
+
+@parametrize("name,platform,part,path", [
+    ("atmega328p",    "avr",   "atmega328p",  "avr/atmega/ATmega328P.atdf"),
+    ("ATmega328P-AU", None,    "atmega328p",  "avr/atmega/ATmega328P.atdf"),
+    ("STM32F103C8",   "stm32", "stm32f103x8", "stm32/cortex-m3/STM32F103.svd"),
+    ("f103c8",        "stm32", "stm32f103x8", "stm32/cortex-m3/STM32F103.svd"),
+    ("stm32f030x6",   None,    "stm32f030x6", "stm32/cortex-m0/STM32F0x0.svd"),
+    ("stm32f103zz",   "stm32", "stm32f103zz", "stm32/cortex-m3/STM32F103.svd"),
+])
+def test_resolve(name, platform, part, path):
+    entry = device_index().resolve(name, platform)
+    assert_eq((entry.part, entry.path), (part, path))
+
+@parametrize("name,platform", [("atmega328p", "stm32"), ("stm32f407vg", None), ("nosuchpart", None)])
+def test_resolve_unknown(name, platform):
+    assert_eq(device_index().resolve(name, platform), None)
+
+def test_unlisted_part_has_no_memory_sizes():
+    entry = device_index().resolve("stm32f103zz")
+    assert_eq((entry.variant, entry.flash), (None, None))
+
+def test_search():
+    index = device_index()
+    assert_eq([e.part for e in index.search("atmega328*")], ["atmega328", "atmega328p", "atmega328pb"])
+    assert_eq([e.part for e in index.search("atmega328?")], ["atmega328p"])
+    assert_eq({e.platform for e in index.search("103")}, {"stm32"})
+    assert_eq([e.part for e in index.search("ATmega328P-MU")], ["atmega328p"])
+
+def test_list_devices_by_platform():
+    index = device_index()
+    avr   = index.list_devices("avr")
+    assert_eq(len(avr) + len(index.list_devices("stm32")), len(index))
+    assert_eq(all(e.path.endswith(".atdf") for e in avr), True)
+
+def test_stale_index_is_rescanned():
+    """A file added after index.json was written is still found."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        shutil.copy(_DB_ROOT / "avr" / "atmega" / "ATmega48.atdf", root)
+        DeviceIndex.build(root).save()
+        shutil.copy(_DB_ROOT / "avr" / "atmega" / "ATmega88.atdf", root)
+        path = find_device_file("atmega88", "avr", root)
+    assert_eq(Path(path).name, "ATmega88.atdf")
+
+def test_unknown_part_raises():
+    try:
+        find_device_file("atmega9999", "avr", _DB_ROOT)
+    except FileNotFoundError:
+        return
+    raise AssertionError("an unknown part resolved to a file")
+
+def test_cli_names():
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = main(["search", "stm32f030*", "--names"])
+    assert_eq(code, 0)
+    assert_eq(out.getvalue().split()[:2], ["stm32f030x4", "stm32f030x6"])
@@ -0,0 +1,115 @@
+"""
+FIRMWARE IMAGE TESTS FOR MCU-MDT
+
+Validates ``FirmwareImage`` and ``load_firmware_image``, which answer
+READ_MEM FLASH inside the firmware range from the ELF instead of the UART.
+
+Coverage:
+1. PT_LOAD segments are placed at their load (physical) address
+2. Reads are served only when fully inside the image and the firmware range
+3. Touching segments merge; gaps are never served
+4. Verification samples are spread over the image
+5. Missing or unusable ELF files yield no image
+6. Symbols and image loaded through one ELFSource parse the file once
+
+Assumptions:
+1. pyelftools is installed.
+2. ELF files are written by test.common.mdtfixtures.write_elf32.
+
+Goal:
+Ensure a byte served from the image is the byte the ELF put at that flash address.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+from test.common.asserts import assert_eq
+from test.common.mdtfixtures import write_elf32
+from test.pymdtest import parametrize
+
+from pc_tool.common import disk_cache, elf_symbols
+from pc_tool.common.elf_image import FirmwareImage, load_firmware_image
+from pc_tool.common.elf_symbols import ELFSource, load_elf_symbols
+
+_FLASH = 0x08000000
+_TEXT  = bytes(range(256)) * 4          # 1 KB of .text
+_DATA  = b'\xD0\xD1\xD2\xD3\xD4\xD5\xD6\xD7'
+
+
+def _image(end=_FLASH + 0x408):
+    return FirmwareImage([(_FLASH, _TEXT), (_FLASH + 0x400, _DATA)], _FLASH, end)
+
+def _load(segments, start=_FLASH, end=_FLASH + 0x408, platform="stm32"):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fw.elf")
+        write_elf32(path, segments)
+        return load_firmware_image(path, platform, start, end)
+
+
+@parametrize("address,length,expected", [
+    (_FLASH,          4, _TEXT[:4]),
+    (_FLASH + 0x3FE,  4, _TEXT[-2:] + _DATA[:2]),    # spans merged segments
+    (_FLASH + 0x404,  4, _DATA[4:]),
+    (_FLASH + 0x406,  4, None),                      # runs past firmware end
+    (_FLASH - 4,      4, None),
+])
+def test_read(address, length, expected):
+    assert_eq(_image().read(address, length), expected)
+
+def test_gap_is_not_served():
+    image = FirmwareImage([(_FLASH, b'\x01' * 8), (_FLASH + 16, b'\x02' * 8)], _FLASH, _FLASH + 24)
+    assert_eq(image.covers(_FLASH + 4, 8), False)
+    assert_eq(image.read(_FLASH + 16, 4), b'\x02' * 4)
+
+def test_samples_spread_over_image():
+    samples = _image().samples(3)
+    assert_eq(samples, [_FLASH, _FLASH + 0x200, _FLASH + 0x404])
+    assert_eq(_image().samples(0), [])
+
+def test_load_uses_physical_address():
+    """.data is linked for RAM but stored in flash after .text."""
+    image = _load([(_FLASH, _FLASH, _TEXT), (0x20000000, _FLASH + 0x400, _DATA)])
+    assert_eq(image.read(_FLASH + 0x400, 8), _DATA)
+    assert_eq(image.size, len(_TEXT) + len(_DATA))
+
+def test_avr_data_space_is_skipped():
+    image = _load([(0, 0, _TEXT), (0x800100, 0x800100, _DATA)], start=0, end=0x400, platform="avr")
+    assert_eq(image.size, len(_TEXT))
+
+def test_no_image_without_bytes_at_firmware_start():
+    assert_eq(_load([(_FLASH + 0x1000, _FLASH + 0x1000, _TEXT)]), None)
+
+def test_missing_elf():
+    assert_eq(load_firmware_image("/nonexistent/fw.elf", "stm32", _FLASH, _FLASH + 4), None)
+
+
+@contextmanager
+def _counting_parses():
+    """Count ELFFile constructions, with the symbol disk cache off."""
+    parses, old_class = [], elf_symbols.elffile_class
+    old_env = os.environ.get(disk_cache.CACHE_DIR_ENV)
+
+    def counting_class():
+        elf_file = old_class()
+        return lambda f: parses.append(f) or elf_file(f)
+
+    os.environ[disk_cache.CACHE_DIR_ENV] = ""
+    elf_symbols.elffile_class = counting_class
+    try:
+        yield parses
+    finally:
+        elf_symbols.elffile_class = old_class
+        if old_env is None:
+            os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+        else:
+            os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+def test_shared_source_parses_once():
+    with tempfile.TemporaryDirectory() as tmp, _counting_parses() as parses:
+        path = os.path.join(tmp, "fw.elf")
+        write_elf32(path, [(_FLASH, _FLASH, _TEXT)])
+        with ELFSource(path) as source:
+            load_elf_symbols(path, "stm32", source)
+            image = load_firmware_image(path, "stm32", _FLASH, _FLASH + 0x400, source)
+    assert_eq((len(parses), image.size), (1, len(_TEXT)))
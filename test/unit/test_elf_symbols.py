@@ -0,0 +1,114 @@
+"""
+ELF SYMBOL TABLE TESTS FOR MCU-MDT
+
+Validates ``SymbolTable`` and the on-disk cache behind ``load_elf_symbols``.
+
+Coverage:
+1. Reverse lookup: start, interior and past-the-end addresses, zero-size symbols
+2. describe() renders name / name+0xN
+3. Local-static lookup through the prefix index matches the plain-dict scan
+4. The table still reads like the name -> SymbolInfo dict it replaced
+5. A second load of the same ELF comes from the cache; editing the ELF re-reads it
+
+Assumptions:
+1. _read_symbols is the only place the ELF is parsed.
+
+Goal:
+Ensure indexed symbol lookups agree with the former scans and an unchanged ELF is read once.
+"""
+
+import os
+import pickle
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+import pc_tool.common.elf_symbols as elf_symbols
+from pc_tool.common import disk_cache
+from pc_tool.common.elf_symbols import SymbolInfo, SymbolTable, find_local_statics, load_elf_symbols
+
+_SYMBOLS = [
+    SymbolInfo("buffer",      0x20000000, 16, 0xFFFFFFFF),
+    SymbolInfo("counter",     0x20000010, 2,  0x0000FFFF),
+    SymbolInfo("counter.0",   0x20000014, 4,  0xFFFFFFFF),
+    SymbolInfo("counter.1",   0x20000018, 1,  0x000000FF),
+    SymbolInfo("tick.part.3", 0x2000001C, 4,  0xFFFFFFFF),
+    SymbolInfo("marker",      0x20000030, 0,  0xFFFFFFFF),
+]
+
+
+@parametrize("addr,expected", [
+    (0x20000000, "buffer"),
+    (0x2000000F, "buffer+0xF"),
+    (0x20000011, "counter+0x1"),
+    (0x20000012, None),             # gap after a 2-byte symbol
+    (0x20000019, None),
+    (0x20000030, "marker"),         # zero-size symbol covers its own address
+    (0x20000031, None),
+    (0x1FFFFFFF, None),
+])
+def test_describe(addr, expected):
+    assert_eq(SymbolTable(_SYMBOLS).describe(addr), expected, addr=hex(addr))
+
+def test_at_returns_symbol_and_offset():
+    sym, offset = SymbolTable(_SYMBOLS).at(0x20000016)
+    assert_eq((sym.name, offset), ("counter.0", 2))
+
+@parametrize("name", [("counter",), ("tick",), ("tick.part",), ("buffer",), ("count",), ("nope",)])
+def test_statics_match_dict_scan(name):
+    table = SymbolTable(_SYMBOLS)
+    plain = {s.name: s for s in _SYMBOLS}
+
+    def names(syms):
+        return sorted(s.name for s in syms)
+
+    assert_eq(names(find_local_statics(name, table)), names(find_local_statics(name, plain)), name=name)
+
+def test_reads_like_a_dict():
+    table = SymbolTable(_SYMBOLS)
+    assert_eq((len(table), "counter" in table, table.get("nope")), (6, True, None))
+    assert_eq(table["counter"].address, 0x20000010)
+    assert_eq(dict(pickle.loads(pickle.dumps(table))), dict(table))
+
+
+@contextmanager
+def _elf_and_cache():
+    old_env, old_read = os.environ.get(disk_cache.CACHE_DIR_ENV), elf_symbols._read_symbols
+    calls = []
+
+    def fake_read(path, plat, source=None):
+        calls.append(path)
+        return list(_SYMBOLS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ[disk_cache.CACHE_DIR_ENV] = tmp
+        elf_symbols._read_symbols = fake_read
+        elf = Path(tmp) / "fw.elf"
+        elf.write_bytes(b"\x7fELF v1")
+        try:
+            yield elf, calls
+        finally:
+            elf_symbols._read_symbols = old_read
+            if old_env is None:
+                os.environ.pop(disk_cache.CACHE_DIR_ENV, None)
+            else:
+                os.environ[disk_cache.CACHE_DIR_ENV] = old_env
+
+def test_cache_skips_reparse_until_elf_changes():
+    with _elf_and_cache() as (elf, calls):
+        first  = load_elf_symbols(str(elf), "stm32")
+        second = load_elf_symbols(str(elf), "stm32")
+        assert_eq((len(calls), second.describe(0x20000011)), (1, "counter+0x1"))
+        assert_eq(dict(second), dict(first))
+
+        elf.write_bytes(b"\x7fELF v2")
+        load_elf_symbols(str(elf), "stm32")
+        assert_eq(len(calls), 2)
+
+def test_missing_elf_is_empty():
+    with _elf_and_cache() as (elf, calls):
+        table = load_elf_symbols(str(elf.with_name("gone.elf")), "stm32")
+    assert_eq((len(table), calls), (0, []))
@@ -0,0 +1,82 @@
+"""
+EVENT BUFFER TESTS FOR MCU-MDT
+
+Validates the bounded, coalescing ``EventBuffer`` behind
+``MCUSerialLink.event_queue``.
+
+Coverage:
+1. Repeats of a pending (type, slot) fold into one entry: count, first/last packet, times
+2. Different types or slots stay separate and come out in arrival order
+3. A full buffer drops new keys, still folds known ones, and counts both
+4. coalesce=False keeps packets separate
+5. get()/drain() time out on an empty buffer and wake up on put() from another thread
+
+Goal:
+Ensure an event storm costs a bounded number of entries and every event is accounted for.
+"""
+
+import threading
+import time
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.common.enums import MDT_PACKET_SIZE, MDTOffset
+from pc_tool.common.event_buffer import EventBuffer
+
+
+def _pkt(event_type=2, slot=0, data=0) -> bytes:
+    pkt = bytearray(MDT_PACKET_SIZE)
+    pkt[MDTOffset.SEQ]    = slot
+    pkt[MDTOffset.MEM_ID] = event_type
+    pkt[MDTOffset.DATA:MDTOffset.DATA + 4] = data.to_bytes(4, "little")
+    return bytes(pkt)
+
+
+def test_repeats_are_coalesced():
+    buf = EventBuffer(4)
+    for i in range(1000):
+        buf.put(_pkt(data=i))
+    entry = buf.get(timeout=0)
+    assert_eq((entry.count, entry.first, entry.last), (1000, _pkt(data=0), _pkt(data=999)))
+    assert_eq(entry.last_time >= entry.first_time, True)
+    assert_eq(buf.stats(), {"received": 1000, "coalesced": 999, "dropped": 0, "pending": 0})
+
+def test_keys_keep_arrival_order():
+    buf = EventBuffer(8)
+    for event_type, slot in [(2, 0), (1, 0), (2, 1), (2, 0), (1, 0)]:
+        buf.put(_pkt(event_type, slot))
+    assert_eq([(e.key, e.count) for e in buf.drain(timeout=0)],
+              [((2, 0), 2), ((1, 0), 2), ((2, 1), 1)])
+    assert_eq(len(buf), 0)
+
+def test_full_buffer_drops_new_keys():
+    buf = EventBuffer(2)
+    results = [buf.put(_pkt(slot=s)) for s in (0, 1, 2, 3, 0)]
+    assert_eq(results, [True, True, False, False, True])
+    assert_eq((buf.dropped, buf.coalesced, len(buf)), (2, 1, 2))
+
+def test_uncoalesced_packets_stay_separate():
+    buf = EventBuffer(4)
+    buf.put(_pkt(), coalesce=False)
+    buf.put(_pkt(), coalesce=False)
+    assert_eq([e.count for e in buf.drain(timeout=0)], [1, 1])
+
+@parametrize("method", [("get",), ("drain",)])
+def test_empty_buffer_times_out(method):
+    t0 = time.monotonic()
+    result = getattr(EventBuffer(), method)(timeout=0.05)
+    assert_eq((bool(result), time.monotonic() - t0 >= 0.04), (False, True))
+
+def test_put_wakes_waiting_reader():
+    buf = EventBuffer()
+    threading.Timer(0.05, buf.put, args=(_pkt(slot=3),)).start()
+    entries = buf.drain(timeout=2.0)
+    assert_eq([e.key for e in entries], [(2, 3)])
+
+def test_capacity_must_be_positive():
+    try:
+        EventBuffer(0)
+    except ValueError:
+        return
+    raise AssertionError("EventBuffer(0) did not raise")
@@ -0,0 +1,71 @@
+"""
+METADATA RECORD TESTS FOR MCU-MDT
+
+Validates the slotted Register / Bitfield / RegisterGroup / MemorySegment
+records and the dict view they keep for older callers.
+
+Coverage:
+1. Numeric fields are ints; the mapping view renders them as int(x, 0) strings
+2. to_dict() returns plain nested dicts
+3. Records compare equal to each other and to the equivalent dicts
+4. Records are read-only through the mapping view and survive pickling
+5. SVD bit ranges become masks
+
+Assumptions:
+1. Callers only read metadata through [] / get() / items() or the record attributes.
+
+Goal:
+Ensure the compact records behave like the dicts they replaced wherever those were read.
+"""
+
+import pickle
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.metadata import Bitfield, MemorySegment, Register, RegisterGroup
+
+
+def _register():
+    txe = Bitfield("Transmit empty", 0x80, {"EMPTY": {"caption": None, "value": "1"}})
+    return Register("Status", 0xC0, 1, 0xFF, "RW", {"TXE": txe})
+
+
+def test_view_renders_legacy_strings():
+    reg = _register()
+    assert_eq((reg.offset, reg.size, reg.mask), (0xC0, 1, 0xFF))
+    assert_eq((reg["offset"], reg["size"], reg["mask"], reg.get("rw")), ("0xC0", "1", "0xFF", "RW"))
+    assert_eq(int(reg["offset"], 0), reg.offset)
+    assert_eq(reg["bitfields"]["TXE"]["mask"], "0x80")
+    assert_eq((reg.get("missing"), "caption" in reg, len(reg)), (None, True, 6))
+
+def test_to_dict_is_plain():
+    group = RegisterGroup("USART0", None, None, {"UCSR0A": _register()})
+    plain = group.to_dict()
+    assert_eq(type(plain["registers"]["UCSR0A"]["bitfields"]["TXE"]), dict)
+    assert_eq(plain["offset"], None)
+    assert_eq(plain["registers"]["UCSR0A"]["bitfields"]["TXE"]["values"], {"EMPTY": {"caption": None, "value": "1"}})
+
+def test_equality():
+    assert_eq(_register() == _register(), True)
+    assert_eq(_register() == _register().to_dict(), True)
+    assert_eq(_register().to_dict() == _register(), True)
+    assert_eq(_register() == Register("Status", 0xC1, 1, 0xFF, "RW", {}), False)
+
+def test_read_only_and_picklable():
+    reg = _register()
+    try:
+        reg["rw"] = "R"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("record accepted item assignment")
+    assert_eq(pickle.loads(pickle.dumps(reg)), reg)
+
+def test_memory_segment_view():
+    seg = MemorySegment("FLASH", 0x08000000, 0x10000, "flash", "1024")
+    assert_eq(dict(seg), {"start": 0x08000000, "size": 0x10000, "type": "flash", "pagesize": "1024"})
+
+@parametrize("msb,lsb,mask", [(0, 0, 0x1), (8, 0, 0x1FF), (15, 12, 0xF000), (31, 0, 0xFFFFFFFF)])
+def test_bit_range_mask(msb, lsb, mask):
+    assert_eq(Bitfield.from_range(None, msb, lsb, {}).mask, mask, msb=msb, lsb=lsb)
@@ -0,0 +1,110 @@
+"""
+EVENT POLL SCHEDULER TESTS FOR MCU-MDT
+
+Validates ``PollScheduler``, which paces the UART-idle event poll.
+
+Coverage:
+1. The interval doubles from the floor up to the ceiling while no event arrives
+2. An event snaps it back to the floor and pulls the next poll in
+3. No poll is due while a transfer is in flight; the first one follows a full floor after it
+4. wait() gives up after max_block so the worker can re-check its link
+5. Bounds are validated
+
+Goal:
+Ensure polls are frequent right after events, sparse on an idle target and absent during transfers.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+import pc_tool.common.poll_scheduler as poll_mod
+from pc_tool.common.poll_scheduler import PollScheduler
+
+
+class _Clock:
+    """Stands in for the ``time`` module inside poll_scheduler."""
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@contextmanager
+def _fake_clock():
+    clock, real = _Clock(), poll_mod.time
+    poll_mod.time = clock
+    try:
+        yield clock
+    finally:
+        poll_mod.time = real
+
+
+def test_interval_backs_off_to_ceiling():
+    poll, seen = PollScheduler(floor=0.01, ceiling=0.08), []
+    for _ in range(6):
+        poll.wait(max_block=0.5)
+        seen.append(poll.interval)
+    assert_eq(seen, [0.02, 0.04, 0.08, 0.08, 0.08, 0.08])
+
+def test_event_resets_to_floor():
+    poll = PollScheduler(floor=0.05, ceiling=5.0)
+    for _ in range(3):
+        poll.wait()
+    assert_eq(poll.interval, 0.4)
+    threading.Timer(0.02, poll.on_event).start()
+    t0 = time.monotonic()
+    assert_eq(poll.wait(max_block=2.0), True)     # due in 0.2 s, pulled in to ~0.07 s by the event
+    assert_eq(time.monotonic() - t0 < 0.15, True)
+    assert_eq(poll.interval, 0.1)
+
+def test_transfer_holds_polls():
+    poll = PollScheduler(floor=0.01, ceiling=0.02)
+    with poll.transfer():
+        with poll.transfer():
+            assert_eq((poll.busy, poll.wait(max_block=0.05)), (True, False))
+        assert_eq(poll.wait(max_block=0.05), False)
+    t0 = time.monotonic()
+    assert_eq((poll.busy, poll.wait(max_block=1.0)), (False, True))
+    assert_eq(time.monotonic() - t0 < 0.05, True)
+
+def test_transfer_end_waits_full_floor_on_idle_target():
+    with _fake_clock() as clock:
+        poll = PollScheduler(floor=0.1, ceiling=1.0)
+        clock.now += 10.0                             # idle: the poll deadline is long past
+        with poll.transfer():
+            pass
+        due = []
+        for step in (0.0, 0.09, 0.02):
+            clock.now += step
+            due.append(poll.wait(max_block=0))
+    assert_eq(due, [False, False, True])
+
+def test_transfer_end_wakes_waiting_worker():
+    poll = PollScheduler(floor=0.01, ceiling=0.02)
+    done = threading.Event()
+
+    def transfer():
+        with poll.transfer():
+            started.set()
+            done.wait(1.0)
+
+    started = threading.Event()
+    threading.Thread(target=transfer, daemon=True).start()
+    started.wait(1.0)
+    threading.Timer(0.05, done.set).start()
+    t0 = time.monotonic()
+    assert_eq(poll.wait(max_block=2.0), True)
+    assert_eq(0.04 < time.monotonic() - t0 < 0.5, True)
+
+@parametrize("floor,ceiling", [(0, 0.5), (0.5, 0.1), (-1, 1)])
+def test_bounds_are_validated(floor, ceiling):
+    try:
+        PollScheduler(floor=floor, ceiling=ceiling)
+    except ValueError:
+        return
+    raise AssertionError(f"PollScheduler({floor}, {ceiling}) did not raise")
@@ -15,6 +15,8 @@ Coverage:
 8. Edge cases for CRC and packet validation
 9. Deserialization of invalid packets (empty, oversized)
 10. Address encoding/decoding
+11. PacketView single-pass decoding agrees with the function-based API
+12. serialize_transfer produces the same frames as per-chunk serialization
 
 Assumptions:
 1. Command dataclass and enums are defined as per protocol.
@@ -38,6 +40,9 @@ from pc_tool.common.protocol import (
     validate_command_packet,
     is_nack_packet,
     calculate_crc16,
+    PacketView,
+    serialize_transfer,
+    verify_crc16_batch,
 )
 
 
@@ -256,4 +261,122 @@ def test_deserialize_rejects_one_extra_byte():
         deserialize_command_packet(pkt)
     except ValueError:
         raised = True
-    assert_eq(raised, True)
\ No newline at end of file
+    assert_eq(raised, True)
+
+
+# PacketView
+@parametrize("cmd", [
+    (_ping(),),
+    (_read(address=0x08001234, length=2),),
+    (_write(address=0x2000FFFC, data=b'\xDE\xAD\xBE\xEF'),),
+])
+def test_packet_view_matches_deserialize(cmd):
+    """PacketView decodes the same fields deserialize_command_packet does."""
+    pkt = _serialize(cmd, seq=7, multi=True, last=True)
+    assert_eq(PacketView(pkt).to_command_packet(), deserialize_command_packet(pkt))
+
+def test_packet_view_fields_read_in_place():
+    """Fields come straight from the buffer; data is a zero-copy view."""
+    pkt  = _serialize(_write(address=0x20000010, data=b'\x01\x02\x03\x04'), seq=3)
+    view = PacketView(pkt)
+    assert_eq(view.valid, True)
+    assert_eq((view.seq, view.address, view.length), (3, 0x20000010, 4))
+    assert_eq(isinstance(view.data, memoryview), True)
+    assert_eq(view.data_word, 0x04030201)
+    assert_eq(view.raw is pkt, True)
+
+@parametrize("offset", [(MDTOffset.START,), (MDTOffset.ADDRESS,), (MDTOffset.CRC,), (MDTOffset.END,)])
+def test_packet_view_flags_corruption(offset):
+    """Any corrupted byte makes the view invalid, with the same verdict as validate_command_packet."""
+    corrupt = bytearray(_serialize(_read()))
+    corrupt[offset] ^= 0xFF
+    view = PacketView(bytes(corrupt))
+    assert_eq(view.valid, False)
+    assert_eq(view.ok, validate_command_packet(bytes(corrupt)))
+
+def test_packet_view_wrong_length():
+    """Short frames are reported invalid rather than raising."""
+    view = PacketView(b'')
+    assert_eq(view.valid, False)
+    assert_eq("length" in repr(view), True)
+
+def test_packet_view_status_error_not_ok():
+    """A sound frame with STATUS_ERROR is valid but not ok."""
+    pkt = bytearray(_serialize(_read()))
+    pkt[MDTOffset.FLAGS] |= MDTFlags.ACK_NACK | MDTFlags.STATUS_ERROR
+    view = PacketView(bytes(_fix_crc(pkt)))
+    assert_eq((view.valid, view.ok), (True, False))
+
+@parametrize("cmd_id,flags", [
+    (0x00, MDTFlags.ACK_NACK | MDTFlags.STATUS_ERROR),
+    (0x00, MDTFlags.ACK_NACK),
+    (0x00, MDTFlags.STATUS_ERROR),
+    (0x00, MDTFlags.EVENT_PACKET),
+    (CommandId.READ_MEM, MDTFlags.ACK_NACK | MDTFlags.STATUS_ERROR),
+])
+def test_packet_view_classification(cmd_id, flags):
+    """is_nack / is_event agree with the byte-level checks."""
+    pkt = bytearray(MDT_PACKET_SIZE)
+    pkt[MDTOffset.START]  = 0xAA
+    pkt[MDTOffset.CMD_ID] = cmd_id
+    pkt[MDTOffset.FLAGS]  = flags
+    pkt[MDTOffset.END]    = 0x55
+    pkt  = bytes(_fix_crc(pkt))
+    view = PacketView(pkt)
+    assert_eq(view.is_nack, is_nack_packet(pkt))
+    assert_eq(view.is_event, cmd_id == 0 and bool(flags & MDTFlags.EVENT_PACKET))
+
+
+# Batch serializer
+def _per_chunk(cmd):
+    """Reference: one serialize_command_packet call per word-sized chunk."""
+    length = cmd.length if cmd.length is not None else UtilEnum.WORD_SIZE
+    frames = []
+    for index, offset in enumerate(range(0, length, UtilEnum.WORD_SIZE)):
+        n     = min(UtilEnum.WORD_SIZE, length - offset)
+        chunk = None
+        if cmd.data is not None:
+            chunk = cmd.data[offset : offset + n].ljust(UtilEnum.WORD_SIZE, b'\x00')
+        sub = Command(name=cmd.name, id=cmd.id, mem=cmd.mem,
+                      address=cmd.address + offset, length=n, data=chunk)
+        frames.append(_serialize(sub, seq=index % 0xFF,
+                                 multi=length > UtilEnum.WORD_SIZE,
+                                 last=offset + UtilEnum.WORD_SIZE >= length))
+    return frames
+
+@parametrize("cmd", [
+    (_read(length=1),),
+    (_read(length=4),),
+    (_read(length=7, mem=MemType.FLASH),),
+    (_write(data=bytes(range(10))),),
+    (_write(data=bytes(range(64))),),
+    (Command(name="READ_REG", id=CommandId.READ_REG, address=0x40013800),),
+])
+def test_serialize_transfer_matches_per_chunk(cmd):
+    """The batch serializer is byte-for-byte identical to the per-chunk path."""
+    assert_eq([bytes(f) for f in serialize_transfer(cmd)], _per_chunk(cmd))
+
+def test_serialize_transfer_seq_wraps():
+    """More than 0xFF chunks wrap SEQ the same way the firmware counter does."""
+    frames = serialize_transfer(_read(length=300 * UtilEnum.WORD_SIZE))
+    assert_eq([f[MDTOffset.SEQ] for f in frames[253:257]], [253, 254, 0, 1])
+    assert_eq(verify_crc16_batch(frames), [True] * 300)
+
+def test_serialize_transfer_returns_views_of_one_buffer():
+    """Frames are read-only slices of a single contiguous buffer."""
+    frames = serialize_transfer(_write(data=bytes(range(12))))
+    assert_eq(all(isinstance(f, memoryview) and f.readonly for f in frames), True)
+    assert_eq(frames[0].obj is frames[2].obj, True)
+
+def test_serialize_transfer_empty():
+    """A zero-length transfer has no frames."""
+    assert_eq(serialize_transfer(_read(length=0)), [])
+
+def test_serialize_transfer_rejects_address_overflow():
+    """A transfer running past 0xFFFFFFFF is refused up front."""
+    raised = False
+    try:
+        serialize_transfer(_read(address=0xFFFFFFFC, length=8))
+    except ValueError:
+        raised = True
+    assert_eq(raised, True)
@@ -0,0 +1,83 @@
+"""
+REGISTER INDEX TESTS FOR MCU-MDT
+
+Validates the address/name index that backs ``validator._find_register`` and
+``parser.resolve_register_address``.
+
+Coverage:
+1. Address lookup at register boundaries, in gaps and outside every module
+2. Overlapping registers resolve to the first one in module order
+3. Qualified, bare and case-folded name lookup, with the bare fallback
+4. ATDF-style (instance offset) and SVD-style (group offset) bases
+5. The index is built once per metadata dict and rebuilt when modules change
+
+Assumptions:
+1. Metadata follows the loader's modules -> register_groups -> registers layout.
+
+Goal:
+Ensure indexed lookups return exactly what the former linear scans returned.
+"""
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.metadata import RegisterIndex, register_index
+
+
+def _module(base, registers, atdf=False):
+    group = {"offset": "0" if atdf else hex(base), "registers": {
+        name: {"offset": hex(off), "size": str(bits), "rw": "read-write"}
+        for name, off, bits in registers
+    }}
+    instances = [{"name": "I", "register_group": "G", "offset": hex(base)}] if atdf else []
+    return {"instances": instances, "register_groups": {"G": group}}
+
+_MODULES = {
+    "USART1": _module(0x40013800, [("SR", 0x0, 32), ("DR", 0x4, 32), ("CR1", 0xC, 32)]),
+    "USART2": _module(0x40004400, [("SR", 0x0, 32), ("DR", 0x4, 32)]),
+    # AVR-style 16-bit register followed by its two byte halves
+    "ADC":    _module(0x78, [("ADC", 0x0, 16), ("ADCL", 0x0, 8), ("ADCH", 0x1, 8)], atdf=True),
+    "TWI":    _module(0xB8, [("TWBR", 0x0, 8), ("TW_AMR", 0x5, 8)], atdf=True),
+}
+
+
+@parametrize("addr,expected", [
+    (0x40013800, ("USART1", "SR", 0x40013800, 0x40013804)),
+    (0x40013803, ("USART1", "SR", 0x40013800, 0x40013804)),
+    (0x40013808, None),                                     # gap between DR and CR1
+    (0x4001380F, ("USART1", "CR1", 0x4001380C, 0x40013810)),
+    (0x40013810, None),
+    (0x40004404, ("USART2", "DR", 0x40004404, 0x40004408)),
+    (0x79,       ("ADC", "ADC", 0x78, 0x7A)),               # ADC listed before ADCH
+    (0xBD,       ("TWI", "TW_AMR", 0xBD, 0xBE)),
+    (0x0,        None),
+])
+def test_find(addr, expected):
+    hit = RegisterIndex(_MODULES).find(addr)
+    assert_eq(hit and (hit.module, hit.name, hit.start, hit.end), expected, addr=hex(addr))
+
+def test_overlap_goes_to_first_listed_register():
+    modules = {"ADC": _module(0x78, [("ADCH", 0x1, 8), ("ADC", 0x0, 16)], atdf=True)}
+    index   = RegisterIndex(modules)
+    assert_eq([index.find(a).name for a in (0x78, 0x79)], ["ADC", "ADCH"])
+
+@parametrize("name,expected", [
+    ("USART2_SR",  0x40004400),
+    ("usart2_dr",  0x40004404),
+    ("SR",         0x40013800),     # first module wins for a bare name
+    ("Adch",       0x79),
+    ("TWI_TW_AMR", 0xBD),           # register name containing '_'
+    ("TW_AMR",     0xBD),           # no TW module: falls back to bare
+    ("USART1_ADC", None),
+    ("NOPE",       None),
+])
+def test_address_of(name, expected):
+    assert_eq(RegisterIndex(_MODULES).address_of(name), expected, name=name)
+
+def test_index_is_cached_per_metadata():
+    meta  = {"modules": dict(_MODULES)}
+    index = register_index(meta)
+    assert_eq(register_index(meta) is index, True)
+    meta["modules"] = {"TWI": _MODULES["TWI"]}
+    assert_eq(register_index(meta) is index, False)
+    assert_eq(register_index(meta).address_of("SR"), None)
@@ -0,0 +1,115 @@
+"""
+RX RING BUFFER TESTS
+
+
+Validates the cursor-based receive buffer used by MCUSerialLink.
+
+Coverage:
+1. fill() via a readinto callable and write() both append in order
+2. find() / consume() resync on the START byte
+3. frame() returns a zero-copy view of the next bytes
+4. Unread bytes survive compaction when the write cursor hits the end
+5. Overflow behaviour of write(): only the oldest unread bytes that do not fit are dropped
+
+Goal:
+Ensure frames come out of the ring buffer byte-for-byte identical to what
+went in, across any number of wrap-arounds.
+"""
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+from pc_tool.common.ring_buffer import RxRingBuffer
+
+
+def _reader(data: bytes):
+    """Return a readinto callable that serves *data* in as few calls as the view allows."""
+    pos = [0]
+
+    def readinto(view):
+        n = min(len(view), len(data) - pos[0])
+        view[:n] = data[pos[0] : pos[0] + n]
+        pos[0] += n
+        return n
+
+    return readinto
+
+
+def test_fill_and_frame():
+    """Bytes read through fill() come back out of frame()."""
+    rx = RxRingBuffer(64)
+    assert_eq(rx.fill(_reader(b'\xAA\x01\x02\x03')), 4)
+    assert_eq(bytes(rx.frame(4)), b'\xAA\x01\x02\x03')
+    assert_eq(len(rx), 4)
+
+def test_frame_is_a_view():
+    """frame() must not copy."""
+    rx = RxRingBuffer(64)
+    rx.write(b'\xAA\x01')
+    assert_eq(isinstance(rx.frame(2), memoryview), True)
+
+def test_find_and_consume_resync():
+    """Garbage before the START byte is skipped with consume()."""
+    rx = RxRingBuffer(64)
+    rx.write(b'\x00\x11\xAA\x22')
+    idx = rx.find(0xAA)
+    assert_eq(idx, 2)
+    rx.consume(idx)
+    assert_eq(bytes(rx.frame(len(rx))), b'\xAA\x22')
+
+def test_find_missing_byte():
+    rx = RxRingBuffer(16)
+    rx.write(b'\x01\x02')
+    assert_eq(rx.find(0xAA), -1)
+
+def test_consume_all_resets_cursors():
+    """An empty buffer starts again at offset 0."""
+    rx = RxRingBuffer(16)
+    rx.write(b'\x01\x02\x03')
+    rx.consume(3)
+    assert_eq((rx.head, rx.tail), (0, 0))
+
+@parametrize("capacity,chunk", [(32, 7), (32, 18), (64, 5), (40, 13)])
+def test_stream_survives_compaction(capacity, chunk):
+    """A long stream pushed through a small buffer comes out intact."""
+    stream = bytes(i & 0xFF for i in range(1000))
+    rx     = RxRingBuffer(capacity)
+    out    = bytearray()
+    pos    = 0
+    while pos < len(stream) or len(rx):
+        if pos < len(stream):
+            pos += rx.fill(_reader(stream[pos : pos + chunk]))
+        take = min(len(rx), 5)
+        out += rx.frame(take)
+        rx.consume(take)
+    assert_eq(bytes(out), stream)
+
+def test_write_overflow_keeps_newest():
+    """write() larger than the capacity keeps only the newest bytes."""
+    rx = RxRingBuffer(8)
+    rx.write(bytes(range(12)))
+    assert_eq(bytes(rx.frame(len(rx))), bytes(range(4, 12)))
+
+@parametrize("filled,consumed,extra,kept", [
+    (8, 0, 3, bytes(range(3, 8))),     # full: the 3 oldest go
+    (8, 3, 2, bytes(range(3, 8))),     # room after compaction: nothing goes
+    (6, 4, 4, bytes(range(4, 6))),     # fits, but not after head: compacted, nothing goes
+    (6, 1, 5, bytes(range(3, 6))),     # two bytes over
+])
+def test_write_overflow_drops_only_oldest(filled, consumed, extra, kept):
+    """An overflowing write() drops just enough of the oldest unread bytes; the rest stay in order."""
+    rx = RxRingBuffer(8)
+    rx.write(bytes(range(filled)))
+    rx.consume(consumed)
+    rx.write(bytes(range(0xA0, 0xA0 + extra)))
+    assert_eq(bytes(rx.frame(len(rx))), kept + bytes(range(0xA0, 0xA0 + extra)),
+              filled=filled, consumed=consumed, extra=extra)
+
+def test_fill_on_full_buffer_raises():
+    """fill() refuses to run when there is no free space at all."""
+    rx = RxRingBuffer(4)
+    rx.write(b'\x01\x02\x03\x04')
+    try:
+        rx.fill(_reader(b'\x05'))
+    except BufferError:
+        return
+    raise AssertionError("fill() accepted data into a full buffer")
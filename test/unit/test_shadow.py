@@ -0,0 +1,142 @@
+"""
+SHADOW MEMORY TESTS FOR MCU-MDT
+
+Validates ``ShadowMemory``, the PC-side block cache that sits in front of
+``Commander`` for READ_MEM.
+
+Coverage:
+1. Lookup hits only when every byte of the range is cached and fresh
+2. missing() coalesces absent/stale blocks and clips them to the region
+3. Staleness bound per memory type (fake clock)
+4. LRU eviction above max_blocks
+5. Write-through update and invalidation (all, per type, per range)
+6. Configuration from build_info's ``shadow:`` section
+
+Assumptions:
+1. Memory segment metadata follows the loader's {"memories": {...}} layout.
+
+Goal:
+Ensure the shadow never serves bytes it did not read, or bytes older than
+the configured bound.
+"""
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.common.enums import MemType
+from pc_tool.shadow import ShadowMemory
+
+_RAM = 0x20000000
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _shadow(max_age=1.0, block_size=16, max_blocks=8, clock=None):
+    return ShadowMemory(
+        regions    = {MemType.RAM: [(_RAM, _RAM + 0x100)]},
+        max_age    = {MemType.RAM: max_age},
+        block_size = block_size,
+        max_blocks = max_blocks,
+        clock      = clock or _Clock(),
+    )
+
+def _fill(shadow, address, length):
+    for start, n in shadow.missing(MemType.RAM, address, length):
+        shadow.store(MemType.RAM, start, bytes((start + i) & 0xFF for i in range(n)))
+
+
+def test_lookup_misses_until_stored():
+    shadow = _shadow()
+    assert_eq(shadow.lookup(MemType.RAM, _RAM, 4), None)
+    _fill(shadow, _RAM, 4)
+    assert_eq(bytes(shadow.lookup(MemType.RAM, _RAM + 1, 4)), bytes([1, 2, 3, 4]))
+    assert_eq((shadow.hits, shadow.misses), (1, 1))
+
+@parametrize("address,length,expected", [
+    (_RAM + 4,  8,  [(_RAM, 16)]),
+    (_RAM + 12, 8,  [(_RAM, 32)]),
+    (_RAM + 0xF8, 8, [(_RAM + 0xF0, 16)]),
+])
+def test_missing_is_block_aligned(address, length, expected):
+    assert_eq(_shadow().missing(MemType.RAM, address, length), expected)
+
+def test_missing_skips_fresh_blocks():
+    shadow = _shadow()
+    _fill(shadow, _RAM + 16, 16)
+    assert_eq(shadow.missing(MemType.RAM, _RAM, 48), [(_RAM, 16), (_RAM + 32, 16)])
+
+def test_missing_is_clipped_to_region():
+    shadow = ShadowMemory({MemType.RAM: [(_RAM + 8, _RAM + 40)]}, {MemType.RAM: 1.0}, block_size=16)
+    assert_eq(shadow.missing(MemType.RAM, _RAM + 8, 32), [(_RAM + 8, 32)])
+
+def test_stale_blocks_are_not_served():
+    clock  = _Clock()
+    shadow = _shadow(max_age=0.5, clock=clock)
+    _fill(shadow, _RAM, 16)
+    clock.now = 0.4
+    assert_eq(shadow.lookup(MemType.RAM, _RAM, 16) is not None, True)
+    clock.now = 0.6
+    assert_eq(shadow.lookup(MemType.RAM, _RAM, 16), None)
+    assert_eq(shadow.missing(MemType.RAM, _RAM, 16), [(_RAM, 16)])
+
+def test_lru_eviction():
+    shadow = _shadow(max_blocks=2)
+    _fill(shadow, _RAM, 16)
+    _fill(shadow, _RAM + 16, 16)
+    shadow.lookup(MemType.RAM, _RAM, 16)            # block 0 becomes most recent
+    _fill(shadow, _RAM + 32, 16)
+    assert_eq(len(shadow), 2)
+    assert_eq(shadow.lookup(MemType.RAM, _RAM + 16, 16), None)
+    assert_eq(shadow.lookup(MemType.RAM, _RAM, 16) is not None, True)
+
+def test_update_patches_cached_bytes_only():
+    shadow = _shadow()
+    _fill(shadow, _RAM, 16)
+    shadow.update(MemType.RAM, _RAM + 14, b'\xAA\xBB\xCC\xDD')
+    assert_eq(bytes(shadow.lookup(MemType.RAM, _RAM + 12, 4)), bytes([12, 13, 0xAA, 0xBB]))
+    assert_eq(shadow.lookup(MemType.RAM, _RAM + 16, 2), None)
+
+@parametrize("args,left", [
+    ((),                            0),
+    ((MemType.RAM,),                0),
+    ((MemType.EEPROM,),             2),
+    ((MemType.RAM, _RAM + 20, 4),   1),
+])
+def test_invalidate(args, left):
+    shadow = _shadow()
+    _fill(shadow, _RAM, 32)
+    shadow.invalidate(*args)
+    assert_eq(len(shadow), left)
+
+@parametrize("mem,address,length,expected", [
+    (MemType.RAM,   _RAM,        16,  True),
+    (MemType.RAM,   _RAM + 0xF8, 16,  False),   # runs off the region
+    (MemType.FLASH, 0x08000000,  16,  False),   # type not cached
+    (MemType.RAM,   _RAM,        0x100, False), # larger than max_blocks
+])
+def test_cacheable(mem, address, length, expected):
+    assert_eq(_shadow().cacheable(mem, address, length), expected)
+
+def test_block_size_must_be_power_of_two():
+    try:
+        _shadow(block_size=24)
+    except ValueError:
+        return
+    raise AssertionError("a block size of 24 was accepted")
+
+def test_from_config():
+    metadata = {"memories": {
+        "RAM":   {"type": "ram",   "start": "0x20000000", "size": "0x5000"},
+        "FLASH": {"type": "flash", "start": "0x08000000", "size": "0x20000"},
+    }}
+    shadow = ShadowMemory.from_config(metadata, {"block_size": 32, "max_age": {"ram": 0.1}})
+    assert_eq(shadow.block_size, 32)
+    assert_eq(shadow.max_age, {MemType.RAM: 0.1})
+    assert_eq(shadow.regions, {MemType.RAM: [(0x20000000, 0x20005000)]})
+    assert_eq(ShadowMemory.from_config(metadata, None), None)
@@ -0,0 +1,105 @@
+"""
+SESSION TRACE TESTS FOR MCU-MDT
+
+Validates the binary trace written by ``TraceWriter`` and read by ``TraceReader``.
+
+Coverage:
+1. Frames, directions and timestamp order survive a round trip through many blocks
+2. A closed trace is read through its INDX chain; an interrupted one by scanning blocks
+3. A torn last block is dropped, everything before it is kept
+4. Time-window reads only return frames inside the window
+5. Files that are not traces are rejected
+
+Goal:
+Ensure a trace records exactly what crossed the link, even when the session died mid-write.
+"""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from test.common.asserts import assert_eq
+from test.pymdtest import parametrize
+
+from pc_tool.common.enums import MDT_PACKET_SIZE
+from pc_tool.common.trace import TraceDirection, TraceReader, TraceWriter
+
+
+def _frame(i: int) -> bytes:
+    return bytes([0xAA]) + i.to_bytes(4, "little") + bytes(MDT_PACKET_SIZE - 6) + b"\x55"
+
+
+@contextmanager
+def _trace(n: int, close: bool = True, **writer_kwargs):
+    """A trace of *n* frames alternating TX/RX, written in blocks of 4, indexed every 3."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path   = Path(tmp) / "session.mdtrace"
+        writer = TraceWriter(path, block_records=4, index_every=3, **writer_kwargs)
+        for i in range(n):
+            writer.record(TraceDirection(i % 2), _frame(i))
+        if close:
+            writer.close()
+        else:
+            writer._write_pending()       # what the background thread would have flushed
+        try:
+            yield path
+        finally:
+            if not close:
+                writer._file.close()
+
+
+@parametrize("n", [(0,), (1,), (4,), (37,)])
+def test_round_trip(n):
+    with _trace(n) as path:
+        reader  = TraceReader(path)
+        records = list(reader.records())
+        assert_eq((reader.complete, len(reader), len(reader.blocks())), (True, n, (n + 3) // 4))
+    assert_eq([(r.direction, r.frame) for r in records],
+              [(TraceDirection(i % 2), _frame(i)) for i in range(n)])
+    times = [r.time_ns for r in records]
+    assert_eq(times, sorted(times))
+
+def test_interrupted_trace_is_scanned():
+    with _trace(37, close=False) as path:
+        reader = TraceReader(path)
+        frames = [r.frame for r in reader.records()]
+        blocks = len(reader.blocks())
+        assert_eq((reader.complete, blocks), (False, 10))
+    assert_eq(frames, [_frame(i) for i in range(37)])
+
+def test_torn_block_is_dropped():
+    with _trace(10, close=False) as path:
+        data = path.read_bytes()
+        # Blocks of 4, 4 and 2 records, then the INDX for all three (32 + 3 * 32 bytes):
+        # drop the index and cut into the last DATA block
+        path.write_bytes(data[:-128 - 40])
+        frames = [r.frame for r in TraceReader(path).records()]
+    assert_eq(frames, [_frame(i) for i in range(8)])
+
+def test_time_window():
+    with _trace(37) as path:
+        reader = TraceReader(path)
+        every  = list(reader.records())
+        lo, hi = every[10].time_ns, every[20].time_ns
+        window = list(reader.records(start_ns=lo, end_ns=hi))
+    assert_eq(window, [r for r in every if lo <= r.time_ns <= hi])
+
+def test_close_is_idempotent_and_stops_recording():
+    with _trace(3) as path:
+        writer = TraceWriter(path)
+        writer.record(TraceDirection.TX, _frame(0))
+        writer.close()
+        writer.close()
+        writer.record(TraceDirection.TX, _frame(1))
+        assert_eq(len(TraceReader(path)), 1)
+
+@parametrize("content", [(b"",), (b"not a trace at all, just some text....",)])
+def test_rejects_other_files(content):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "x.mdtrace"
+        path.write_bytes(content)
+        try:
+            TraceReader(path)
+        except ValueError:
+            return
+    raise AssertionError("TraceReader accepted a non-trace file")